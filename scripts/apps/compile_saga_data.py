@@ -3,8 +3,8 @@
 
 """
 Script Name: compile_saga_data.py
-Version: 1.2.0
-Date: 2025-05-26
+Version: 1.10.2
+Date: 2026-10-18
 
 Purpose:
 This script dynamically discovers and compiles all .json files within a specified 
@@ -73,7 +73,77 @@ Instructions for Use:
             `cd path/to/your/SagaIndex-XXXXXXXX/scripts/`
     * Execute the script using the command: `python compile_saga_data.py`
 
-6.  Verify Output:
+6.  Incremental Mode (Optional):
+    * Run with `--incremental` to only re-parse the .json files that changed 
+        since the previous run. A manifest (`compiled_saga_index.manifest.json`)
+        is written next to the compiled output and records each source file's 
+        mtime, size and SHA-256 hash. Unchanged files are spliced in from the 
+        previous compiled output instead of being parsed again.
+    * If nothing changed, the compiled output is left untouched.
+    * Add `--watch_interval SECONDS` to keep the script running and recompile 
+        incrementally whenever a source file changes. Parsed subtrees are kept 
+        in memory between passes, so a one-file edit only costs that one file.
+    * Delete the manifest (or run without `--incremental`) to force a full rebuild.
+
+7.  Parallel Parsing (Optional):
+    * Run with `--workers N` to parse the source files in a pool of N workers
+        (`--executor process` by default, or `--executor thread`). The largest
+        files are dispatched first; the compiled output is still assembled in
+        directory walk order, so it is identical to a serial run.
+    * Add `--timing_report` to print per-file parse times and the overall wall time.
+
+8.  Streaming Mode (Optional):
+    * Run with `--streaming` to write each file's subtree to the output as soon as
+        it is parsed and then release it, so peak memory stays roughly at the size
+        of the largest single file rather than the whole corpus. The output is
+        byte-identical to a normal run. It is written to a `.tmp` file first and
+        moved into place when complete.
+    * Streaming does not keep the compiled tree in memory, so it cannot be
+        combined with `--incremental`. With `--workers`, parsed files may be held
+        briefly until every file before them in walk order has been written.
+
+9.  Binary Artifact (Optional):
+    * Run with `--binary` to also write `compiled_saga_index.sagabin` next to the
+        JSON output. It holds the same nested data in a compact binary form that
+        loads much faster; read it with `saga_index_loader.load_compiled_index()`.
+    * Compare both formats with:
+        `python saga_index_loader.py compiled_output/compiled_saga_index.json --benchmark`
+
+10. Output Profiles (Optional):
+    * Add `--profile minified`, `--profile gzip` and/or `--profile zstd` (repeatable)
+        to write `compiled_saga_index.min.json`, `.json.gz` or `.json.zst` next to
+        the JSON output. `--profile binary` is the same as `--binary`.
+    * The zstd profile needs `pip install zstandard`; the others are stdlib only.
+    * `saga_index_loader.load_compiled_index()` reads any of them, picking the
+        format from the file extension.
+
+11. Sharded Output (Optional):
+    * Run with `--shards` to also write every source file's subtree as its own file
+        under `compiled_saga_index_shards/` (mirroring the data directory), plus a
+        table of contents `compiled_saga_index.toc.json`. `--shard_profile` picks the
+        shard format (default `minified`; also `pretty`, `gzip`, `zstd`, `binary`).
+    * Consumers that only need a few categories can then load them on demand:
+        from saga_index_loader import LazySagaIndex
+        index = LazySagaIndex("compiled_output/compiled_saga_index.toc.json")
+        feats = index["character_elements.feats"] # only this shard is read
+    * Works with `--streaming` and `--incremental`: each table of contents entry
+        records the SHA-256 of the shard's source file, and only shards whose source
+        hash differs from that (or whose file is missing) are rewritten. Shards of
+        deleted source files are removed.
+
+12. Record Store (Optional):
+    * Run with `--record_store` to also refresh the memory-mapped record store for
+        the large list files (talents, starships, species, droid chassis, feats) in
+        `compiled_saga_index_records/`. Single records can then be read by id, name
+        or name + source_book without parsing the whole file; see `saga_record_store.py`.
+
+13. Prerequisite Graph (Optional):
+    * Run with `--prerequisite_graph` to also write `compiled_saga_index.prereq_graph.json`,
+        which links every `prerequisites_structured` entry of feats, talents, prestige
+        classes, ... to the record it names, with reverse "unlocks" edges. See
+        `saga_prerequisite_graph.py` for the resolution rules and query API.
+
+14. Verify Output:
     * The script will print messages indicating its progress, including which 
         files are processed and if any errors occur.
     * After successful execution, you will find the `compiled_saga_index.json` 
@@ -92,12 +162,332 @@ Version Notes:
 * 1.2.0 (2025-05-26):
     * Embedded detailed instructions and versioning directly into the script's docstring.
     * Added shebang and encoding declaration.
+* 1.3.0 (2026-10-18):
+    * Added incremental compile mode with a per-file mtime/size/hash manifest.
+    * Added `--watch_interval` polling loop and command-line arguments.
+* 1.4.0 (2026-10-18):
+    * Added `--workers`/`--executor` to parse files in a process or thread pool.
+      Output is still assembled in directory walk order.
+    * Added `--timing_report` per-file parse timings.
+* 1.5.0 (2026-10-18):
+    * Added `--streaming` mode that writes each file's subtree as soon as it is
+      parsed instead of holding the whole compiled tree in memory.
+* 1.6.0 (2026-10-18):
+    * Added `--binary` to also emit a compact `.sagabin` artifact that
+      `saga_index_loader.py` loads back into the same nested structure.
+* 1.7.0 (2026-10-18):
+    * Added `--profile` to write minified, gzip or zstd variants of the
+      compiled output next to the JSON.
+* 1.8.0 (2026-10-18):
+    * Added `--shards`/`--shard_profile` to write one shard per source file plus a
+      table of contents for lazy per-category loading (`LazySagaIndex`).
+* 1.9.0 (2026-10-18):
+    * Added `--record_store` to refresh the memory-mapped record store of the
+      large list files (`saga_record_store.py`).
+* 1.10.0 (2026-10-18):
+    * Added `--prerequisite_graph` to write the prerequisite cross-reference
+      graph (`saga_prerequisite_graph.py`).
+* 1.10.1 (2026-10-18):
+    * Shards are rewritten when their source hash (now kept in the table of
+      contents) differs, not only when this run saw the source change, so a
+      change compiled without `--shards` no longer leaves a stale shard.
+* 1.10.2 (2026-10-18):
+    * The manifest records which compiled content each artifact (`--profile`,
+      `--binary`) was written from; an incremental run with no source changes
+      regenerates artifacts that are stale, not only missing ones.
 """
 
+import argparse
+import concurrent.futures
+import hashlib
 import json
 import os
+import time
+
+from saga_index_loader import ARTIFACT_PROFILES, PROFILE_EXTENSIONS, TOC_FORMAT_VERSION, encode_profile, get_artifact_path, get_shard_dir, get_shard_path, get_toc_path, write_artifact, write_data_file
+from saga_prerequisite_graph import get_graph_path, write_prerequisite_graph
+from saga_record_store import build_record_store, get_record_store_dir
+
+MANIFEST_FORMAT_VERSION = 1
+
+# In-memory state for incremental runs, keyed by absolute output file path.
+# Lets a long-running watch loop skip re-reading the previous compiled output.
+_INCREMENTAL_CACHE = {}
+
+def get_manifest_path(output_file):
+    """Returns the manifest path that sits next to the compiled output file."""
+    base, _ = os.path.splitext(output_file)
+    return f"{base}.manifest.json"
+
+def discover_json_files(base_data_dir):
+    """
+    Walks the base data directory (skipping 'backup' folders) and returns a list of
+    (file_path, relative_key, path_parts) tuples in directory walk order.
+    """
+    discovered = []
+    for root, dirs, files in os.walk(base_data_dir):
+        # Exclude 'backup' directories from being traversed further
+        # by modifying dirs in-place.
+        dirs[:] = [d for d in dirs if d.lower() != 'backup']
+
+        for filename in files:
+            if filename.endswith(".json"):
+                file_path = os.path.join(root, filename)
+
+                # Create a key path that mimics the directory structure
+                # relative to the base_data_dir
+                relative_path = os.path.relpath(file_path, base_data_dir)
+                # Normalize path separators for consistency (use '/')
+                # and remove .json extension
+                relative_key = relative_path.replace('\\', '/')
+                path_parts = relative_key.replace('.json', '').split('/')
+                discovered.append((file_path, relative_key, path_parts))
+    return discovered
+
+def insert_subtree(compiled_data, path_parts, content):
+    """Navigates/creates the nested dictionary structure and stores content at the leaf."""
+    current_level = compiled_data
+    for i, part in enumerate(path_parts):
+        if i == len(path_parts) - 1: # Last part is the filename (key)
+            current_level[part] = content
+        else: # Directory part
+            current_level = current_level.setdefault(part, {})
+
+def get_subtree(compiled_data, path_parts):
+    """Returns the subtree stored at path_parts, or None if it is not present."""
+    current_level = compiled_data
+    for part in path_parts:
+        if not isinstance(current_level, dict) or part not in current_level:
+            return None
+        current_level = current_level[part]
+    return current_level
+
+def _file_stat_signature(file_path):
+    stat_result = os.stat(file_path)
+    return {"mtime_ns": stat_result.st_mtime_ns, "size": stat_result.st_size}
 
-def compile_json_data(base_data_dir, output_file):
+def _load_previous_state(output_file):
+    """
+    Returns (manifest_files, previous_compiled_data, artifact_digests) for an incremental run.
+    Falls back to empty state if the manifest or previous output is missing or unreadable.
+    """
+    cache_key = os.path.abspath(output_file)
+    if cache_key in _INCREMENTAL_CACHE:
+        cached = _INCREMENTAL_CACHE[cache_key]
+        return cached["files"], cached["compiled_data"], cached["artifacts"]
+
+    manifest_path = get_manifest_path(output_file)
+    if not os.path.exists(manifest_path) or not os.path.exists(output_file):
+        print("No previous manifest/output found. Performing a full compile.")
+        return {}, {}, {}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("format_version") != MANIFEST_FORMAT_VERSION:
+            print("Manifest format changed. Performing a full compile.")
+            return {}, {}, {}
+        with open(output_file, 'r', encoding='utf-8') as f:
+            previous_compiled_data = json.load(f)
+        return manifest.get("files", {}), previous_compiled_data, manifest.get("artifacts", {})
+    except (IOError, json.JSONDecodeError) as e:
+        print(f"Could not read previous manifest/output ({e}). Performing a full compile.")
+        return {}, {}, {}
+
+def _compiled_digest(manifest_files):
+    """Identifies the compiled content: a hash over the source files' paths and SHA-256 hashes."""
+    return hashlib.sha256(json.dumps(sorted((key, entry.get("sha256")) for key, entry in manifest_files.items())).encode('utf-8')).hexdigest()
+
+def _write_manifest(output_file, manifest_files, artifact_digests=None):
+    manifest_path = get_manifest_path(output_file)
+    manifest = {"format_version": MANIFEST_FORMAT_VERSION, "files": manifest_files, "artifacts": artifact_digests or {}}
+    try:
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+    except IOError as e:
+        print(f"Warning: Could not write manifest {manifest_path}: {e}")
+
+def load_json_source(file_path, known_sha256=None):
+    """
+    Reads, hashes and parses a single source file. Module-level so it can be
+    dispatched to a process pool. If known_sha256 matches the file's hash the
+    parse is skipped and 'content_unchanged' is set instead.
+
+    Returns:
+        dict: {"sha256", "content", "content_unchanged", "size", "elapsed", "error"}
+    """
+    start = time.perf_counter()
+    result = {"sha256": None, "content": None, "content_unchanged": False, "size": 0, "elapsed": 0.0, "error": None}
+    try:
+        with open(file_path, 'rb') as f:
+            raw_bytes = f.read()
+        result["size"] = len(raw_bytes)
+        result["sha256"] = hashlib.sha256(raw_bytes).hexdigest()
+        if known_sha256 and known_sha256 == result["sha256"]:
+            result["content_unchanged"] = True
+        else:
+            result["content"] = json.loads(raw_bytes.decode('utf-8'))
+    except Exception as e:
+        result["error"] = e
+    result["elapsed"] = time.perf_counter() - start
+    return result
+
+def _known_hash(entry):
+    if entry["previous_subtree"] is None: return None
+    return entry["previous_entry"].get("sha256")
+
+def _iter_load_results(plan, workers=None, executor_type="process"):
+    """
+    Yields (entry, result) for every planned entry in plan (walk) order. Entries that
+    can be reused by stat alone get a result of None. Serial mode loads one file at a
+    time as it is consumed; pool mode submits everything up front and yields each
+    result as soon as it (and everything before it in walk order) is ready.
+    """
+    to_load = [entry for entry in plan if not entry["reuse"]]
+    if not workers or workers <= 1 or len(to_load) <= 1:
+        for entry in plan:
+            yield entry, (None if entry["reuse"] else load_json_source(entry["file_path"], _known_hash(entry)))
+        return
+
+    # Largest files first so the biggest parse starts immediately and bounds the wall time.
+    ordered_entries = sorted(to_load, key=lambda e: (e["signature"] or {}).get("size", 0), reverse=True)
+    executor_class = concurrent.futures.ThreadPoolExecutor if executor_type == "thread" else concurrent.futures.ProcessPoolExecutor
+    print(f"Parsing {len(to_load)} file(s) with {workers} {executor_type} worker(s)...")
+    with executor_class(max_workers=workers) as executor:
+        futures = {entry["relative_key"]: executor.submit(load_json_source, entry["file_path"], _known_hash(entry)) for entry in ordered_entries}
+        for entry in plan:
+            if entry["reuse"]:
+                yield entry, None
+                continue
+            future = futures.pop(entry["relative_key"])
+            try:
+                result = future.result()
+            except Exception as e: # e.g., worker process died
+                result = {"error": e}
+            yield entry, result
+
+class StreamingTreeWriter:
+    """
+    Writes a nested JSON object one leaf subtree at a time, producing the same layout
+    as json.dump(..., indent=2, ensure_ascii=False). Leaves must arrive in directory
+    walk order. Output goes to '<output_file>.tmp' and replaces output_file on close().
+    """
+    def __init__(self, output_file, indent=2):
+        self.output_file = output_file
+        self.temp_file = f"{output_file}.tmp"
+        self.indent = indent
+        self._handle = None
+        self._open_parts = [] # Directory keys currently open below the root object
+        self._has_items = [] # Per open object (root first): whether an item was written yet
+
+    def _write_key(self, key):
+        depth = len(self._open_parts) + 1
+        if self._has_items[-1]: self._handle.write(",")
+        self._handle.write("\n" + " " * (self.indent * depth) + json.dumps(key, ensure_ascii=False) + ": ")
+        self._has_items[-1] = True
+
+    def _close_level(self):
+        depth = len(self._open_parts)
+        self._handle.write("\n" + " " * (self.indent * depth) + "}")
+        self._open_parts.pop(); self._has_items.pop()
+
+    def write(self, path_parts, content):
+        if self._handle is None:
+            self._handle = open(self.temp_file, 'w', encoding='utf-8')
+            self._handle.write("{")
+            self._has_items = [False]
+        dir_parts = path_parts[:-1]
+        common = 0
+        while common < len(self._open_parts) and common < len(dir_parts) and self._open_parts[common] == dir_parts[common]:
+            common += 1
+        while len(self._open_parts) > common: self._close_level()
+        for part in dir_parts[common:]:
+            self._write_key(part)
+            self._handle.write("{")
+            self._open_parts.append(part); self._has_items.append(False)
+        self._write_key(path_parts[-1])
+        depth = len(self._open_parts) + 1
+        # JSON strings cannot contain raw newlines, so re-indenting line breaks is safe.
+        self._handle.write(json.dumps(content, indent=self.indent, ensure_ascii=False).replace("\n", "\n" + " " * (self.indent * depth)))
+
+    def close(self):
+        """Closes all open objects and moves the finished file into place."""
+        if self._handle is None:
+            self._handle = open(self.temp_file, 'w', encoding='utf-8')
+            self._handle.write("{")
+            self._has_items = [False]
+        while self._open_parts: self._close_level()
+        self._handle.write("\n}" if self._has_items[0] else "}")
+        self._handle.close()
+        os.replace(self.temp_file, self.output_file)
+
+    def abort(self):
+        """Discards the partially written temporary file."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        if os.path.exists(self.temp_file): os.remove(self.temp_file)
+
+def print_timing_report(file_timings, wall_seconds, workers=None):
+    """Prints per-file parse timings (slowest first) and the overall wall time."""
+    print("\n--- Compile Timing Report ---")
+    if file_timings:
+        name_width = max(len(key) for key, _, _ in file_timings)
+        for relative_key, size_bytes, elapsed in sorted(file_timings, key=lambda t: t[2], reverse=True):
+            print(f"  {relative_key:<{name_width}}  {size_bytes / 1024:>9.1f} KB  {elapsed * 1000:>9.1f} ms")
+        summed = sum(t[2] for t in file_timings)
+        print(f"  Sum of per-file parse times: {summed * 1000:.1f} ms")
+    else:
+        print("  No files were parsed.")
+    print(f"  Discovery + parse wall time (workers: {workers or 1}): {wall_seconds * 1000:.1f} ms")
+
+def _load_shard_source_hashes(output_file):
+    """Returns {shard path (as in the TOC): source file SHA-256} from the current table of contents."""
+    try:
+        with open(get_toc_path(output_file), 'r', encoding='utf-8') as f:
+            toc = json.load(f)
+        return {entry["path"]: entry.get("source_sha256") for entry in toc.get("shards", [])}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return {}
+
+def _write_shard(shard_dir, relative_key, path_parts, subtree, profile, source_sha256, previous_source_hashes):
+    """
+    Writes one source file's subtree as its own shard (skipped if the table of contents says
+    the shard on disk was written from the same source hash) and returns its table-of-contents
+    entry, or None if the write failed.
+    """
+    shard_path = os.path.abspath(get_shard_path(shard_dir, path_parts, profile))
+    toc_relative_path = os.path.relpath(shard_path, os.path.dirname(os.path.abspath(shard_dir))).replace('\\', '/')
+    if source_sha256 is None or previous_source_hashes.get(toc_relative_path) != source_sha256 or not os.path.exists(shard_path):
+        os.makedirs(os.path.dirname(shard_path), exist_ok=True)
+        if not write_data_file(subtree, shard_path, profile): return None
+    return {"key_path": ".".join(path_parts), "path": toc_relative_path, "profile": profile, "source_file": relative_key, "source_sha256": source_sha256}
+
+def _finalize_shards(output_file, shard_entries):
+    """Writes the shard table of contents (only if it changed) and removes stale shard files."""
+    shard_dir = get_shard_dir(output_file)
+    toc_path = get_toc_path(output_file)
+    payload = encode_profile({"format_version": TOC_FORMAT_VERSION, "shards": shard_entries}, "pretty")
+    try:
+        with open(toc_path, 'rb') as f:
+            toc_unchanged = f.read() == payload
+    except OSError:
+        toc_unchanged = False
+    if not toc_unchanged and write_data_file(json.loads(payload), toc_path, "pretty"):
+        print(f"Shard table of contents saved to: {toc_path} ({len(shard_entries)} shard(s))")
+
+    # Remove shards of deleted/failed source files (or of a previous shard profile).
+    toc_dir = os.path.dirname(os.path.abspath(toc_path))
+    live_paths = {os.path.normpath(os.path.join(toc_dir, *entry["path"].split('/'))) for entry in shard_entries}
+    for root, dirs, files in os.walk(shard_dir, topdown=False):
+        for filename in files:
+            shard_path = os.path.normpath(os.path.abspath(os.path.join(root, filename)))
+            if shard_path not in live_paths:
+                try: os.remove(shard_path)
+                except OSError as e: print(f"Warning: Could not remove stale shard {shard_path}: {e}")
+        if root != shard_dir and not os.listdir(root):
+            os.rmdir(root)
+
+def compile_json_data(base_data_dir, output_file, incremental=False, workers=None, executor_type="process", report_timings=False, streaming=False, binary_output=False, artifact_profiles=None, shard_profile=None, record_store=False, prerequisite_graph=False):
     """
     Compiles all .json files from a base directory and its subdirectories
     into a single JSON file, preserving the directory structure.
@@ -105,9 +495,35 @@ def compile_json_data(base_data_dir, output_file):
     Args:
         base_data_dir (str): The path to the base 'data' directory.
         output_file (str): The path where the compiled JSON file will be saved.
+        incremental (bool): If True, only files whose content changed since the
+            previous run (per the manifest) are parsed; the rest are reused from
+            the previous compiled output.
+        workers (int): Number of pool workers used to parse files. None/1 parses serially.
+        executor_type (str): "process" (default) or "thread" pool for the parse step.
+        report_timings (bool): If True, prints a per-file timing report.
+        streaming (bool): If True, each file's subtree is written to the output as soon
+            as it is parsed and then released, instead of building the whole tree in
+            memory. Not combined with incremental mode.
+        binary_output (bool): If True, also writes a compact .sagabin artifact next to
+            the JSON output (see saga_index_loader.py). Same as adding "binary" to
+            artifact_profiles.
+        artifact_profiles (list): Extra artifacts to write next to the JSON output, any of
+            "minified", "gzip", "zstd" and "binary". Not available in streaming mode.
+        shard_profile (str): If set ("pretty" or any artifact profile), also writes each
+            source file's subtree as its own shard plus a table of contents next to the
+            output, for LazySagaIndex. Works with streaming and incremental modes.
+        record_store (bool): If True, also refreshes the memory-mapped record store of the
+            large list files next to the output (see saga_record_store.py).
+        prerequisite_graph (bool): If True, also writes the prerequisite cross-reference
+            graph next to the output (see saga_prerequisite_graph.py).
+
+    Returns:
+        bool: True if the compiled output was (re)written, False otherwise.
     """
+    compile_start = time.perf_counter()
     compiled_data = {}
     processed_files = 0
+    reused_files = 0
     failed_files = 0
 
     print(f"Starting compilation from base directory: {base_data_dir}")
@@ -115,82 +531,213 @@ def compile_json_data(base_data_dir, output_file):
     if not os.path.isdir(base_data_dir):
         print(f"Error: Base directory '{base_data_dir}' not found or is not a directory.")
         print("Please check the 'base_data_directory' path in the script.")
-        return
+        return False
 
-    for root, dirs, files in os.walk(base_data_dir):
-        # Exclude 'backup' directories from being traversed further
-        # by modifying dirs in-place.
-        dirs[:] = [d for d in dirs if d.lower() != 'backup']
-        
-        for filename in files:
-            if filename.endswith(".json"):
-                file_path = os.path.join(root, filename)
-                
-                # Create a key path that mimics the directory structure
-                # relative to the base_data_dir
-                relative_path = os.path.relpath(file_path, base_data_dir)
-                # Normalize path separators for consistency (use '/')
-                # and remove .json extension
-                path_parts = relative_path.replace('\\', '/').replace('.json', '').split('/')
-                
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = json.load(f)
-                    
-                    # Navigate/create the nested dictionary structure
-                    current_level = compiled_data
-                    for i, part in enumerate(path_parts):
-                        if i == len(path_parts) - 1: # Last part is the filename (key)
-                            current_level[part] = content
-                        else: # Directory part
-                            current_level = current_level.setdefault(part, {})
-                    
-                    print(f"Successfully processed and added: {file_path}")
-                    processed_files += 1
-                except json.JSONDecodeError:
+    if streaming and incremental:
+        print("Note: Streaming mode does not keep the compiled tree in memory; incremental mode is ignored.")
+        incremental = False
+    artifact_profiles = list(artifact_profiles or [])
+    if binary_output and "binary" not in artifact_profiles: artifact_profiles.append("binary")
+    if streaming and artifact_profiles:
+        print(f"Note: Streaming mode does not keep the compiled tree in memory; artifacts {artifact_profiles} are skipped.")
+        artifact_profiles = []
+
+    previous_files, previous_compiled_data, artifact_digests = {}, {}, {}
+    if incremental:
+        previous_files, previous_compiled_data, artifact_digests = _load_previous_state(output_file)
+        artifact_digests = dict(artifact_digests) # {profile: _compiled_digest() of the content the artifact was written from}
+    manifest_files = {}
+
+    # Plan: decide per file (in walk order) whether the previous subtree can be reused
+    # by stat alone, or whether the file must be read (and possibly parsed).
+    plan = []
+    for file_path, relative_key, path_parts in discover_json_files(base_data_dir):
+        entry = {"file_path": file_path, "relative_key": relative_key, "path_parts": path_parts, "signature": None, "previous_entry": None, "previous_subtree": None, "reuse": False}
+        try:
+            entry["signature"] = _file_stat_signature(file_path)
+        except OSError:
+            pass # Reported as a read error by the loader below.
+        previous_entry = previous_files.get(relative_key)
+        if previous_entry:
+            entry["previous_entry"] = previous_entry
+            entry["previous_subtree"] = get_subtree(previous_compiled_data, path_parts)
+        # Fast path: stat unchanged, reuse the previous subtree without reading the file.
+        if entry["previous_subtree"] is not None and entry["signature"] and \
+           previous_entry.get("mtime_ns") == entry["signature"]["mtime_ns"] and previous_entry.get("size") == entry["signature"]["size"]:
+            entry["reuse"] = True
+        plan.append(entry)
+
+    # Assemble in walk order so the output layout is deterministic regardless of worker scheduling.
+    # In streaming mode each subtree is written out (and released) as soon as it is available.
+    writer = StreamingTreeWriter(output_file) if streaming else None
+    if writer and not _ensure_output_dir(output_file): return False
+
+    shard_dir = get_shard_dir(output_file) if shard_profile else None
+    shard_entries = []
+    previous_shard_hashes = _load_shard_source_hashes(output_file) if shard_dir else {}
+
+    def emit(path_parts, subtree, relative_key, source_sha256):
+        if writer: writer.write(path_parts, subtree)
+        else: insert_subtree(compiled_data, path_parts, subtree)
+        if shard_dir:
+            shard_entry = _write_shard(shard_dir, relative_key, path_parts, subtree, shard_profile, source_sha256, previous_shard_hashes)
+            if shard_entry: shard_entries.append(shard_entry)
+
+    file_timings = []
+    try:
+        for entry, result in _iter_load_results(plan, workers=workers, executor_type=executor_type):
+            file_path, relative_key, path_parts = entry["file_path"], entry["relative_key"], entry["path_parts"]
+            if entry["reuse"]:
+                emit(path_parts, entry["previous_subtree"], relative_key, entry["previous_entry"].get("sha256"))
+                manifest_files[relative_key] = entry["previous_entry"]
+                reused_files += 1
+                continue
+
+            error = result.get("error")
+            if error is not None:
+                if isinstance(error, json.JSONDecodeError):
                     print(f"Error decoding JSON from file: {file_path}. Skipping.")
-                    failed_files += 1
-                except IOError:
+                elif isinstance(error, (IOError, UnicodeDecodeError)):
                     print(f"Error reading file: {file_path}. Skipping.")
-                    failed_files += 1
-                except Exception as e:
-                    print(f"An unexpected error occurred with file {file_path}: {e}. Skipping.")
-                    failed_files += 1
+                else:
+                    print(f"An unexpected error occurred with file {file_path}: {error}. Skipping.")
+                failed_files += 1
+                continue
+
+            signature = dict(entry["signature"] or {}, sha256=result["sha256"])
+            manifest_files[relative_key] = signature
+            if result["content_unchanged"]:
+                # Touched but identical content (e.g., re-saved file): still reuse.
+                emit(path_parts, entry["previous_subtree"], relative_key, result["sha256"])
+                reused_files += 1
+                continue
 
-    if processed_files == 0 and failed_files == 0:
+            emit(path_parts, result["content"], relative_key, result["sha256"])
+            file_timings.append((relative_key, result["size"], result["elapsed"]))
+            print(f"Successfully processed and added: {file_path}")
+            processed_files += 1
+    except (IOError, OSError) as e:
+        if writer: writer.abort()
+        print(f"Error writing to output file {output_file}: {e}")
+        print("Please check permissions or disk space.")
+        return False
+
+    if report_timings:
+        print_timing_report(file_timings, time.perf_counter() - compile_start, workers)
+
+    if processed_files == 0 and reused_files == 0 and failed_files == 0:
+        if writer: writer.abort()
         print(f"No .json files found in '{base_data_dir}' (excluding 'backup' directories).")
-        return
-    elif processed_files == 0 and failed_files > 0:
+        return False
+    elif processed_files == 0 and reused_files == 0 and failed_files > 0:
+        if writer: writer.abort()
         print(f"No .json files were successfully processed. Failed to process {failed_files} file(s).")
-        return
+        return False
 
+    if shard_dir:
+        _finalize_shards(output_file, shard_entries)
+    if record_store:
+        # Rebuilds only collections whose source file changed.
+        build_record_store(base_data_dir, get_record_store_dir(output_file))
+    if prerequisite_graph:
+        # Skipped if feats/talents/skills/classes/... are unchanged since the last build.
+        write_prerequisite_graph(base_data_dir, get_graph_path(output_file))
 
-    # Ensure the output directory exists
-    output_dir = os.path.dirname(output_file)
-    if output_dir and not os.path.exists(output_dir): # Check if output_dir is not empty
-        try:
-            os.makedirs(output_dir)
-            print(f"Created output directory: {output_dir}")
-        except OSError as e:
-            print(f"Error creating output directory {output_dir}: {e}")
-            print("Please check permissions or choose a different output directory.")
-            return
+    compiled_digest = _compiled_digest(manifest_files) if incremental else None
+    if incremental:
+        _INCREMENTAL_CACHE[os.path.abspath(output_file)] = {"files": manifest_files, "compiled_data": compiled_data, "artifacts": artifact_digests}
+        if processed_files == 0 and set(manifest_files) == set(previous_files) and os.path.exists(output_file):
+            print(f"\nNo changes detected in {reused_files} JSON file(s). Output left unchanged: {output_file}")
+            stale_profiles = [profile for profile in artifact_profiles if artifact_digests.get(profile) != compiled_digest or not os.path.exists(get_artifact_path(output_file, profile))]
+            for profile in stale_profiles:
+                if write_artifact(compiled_data, output_file, profile): artifact_digests[profile] = compiled_digest
+            if stale_profiles: _write_manifest(output_file, manifest_files, artifact_digests)
+            return False
+        print(f"\nIncremental compile: {processed_files} file(s) re-parsed, {reused_files} reused from previous output.")
+
+    if not writer and not _ensure_output_dir(output_file): return False
 
     # Write the compiled data to the output file
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(compiled_data, f, indent=2, ensure_ascii=False)
-        print(f"\nSuccessfully compiled {processed_files} JSON file(s).")
+        if writer:
+            writer.close()
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(compiled_data, f, indent=2, ensure_ascii=False)
+        print(f"\nSuccessfully compiled {processed_files + reused_files} JSON file(s).")
         if failed_files > 0:
             print(f"Failed to process {failed_files} file(s). Please check logs above for details.")
         print(f"Output saved to: {output_file}")
     except IOError as e:
+        if writer: writer.abort()
         print(f"Error writing to output file {output_file}: {e}")
         print("Please check permissions or disk space.")
+        return False
     except Exception as e:
+        if writer: writer.abort()
         print(f"An unexpected error occurred while writing output: {e}")
+        return False
+
+    failed_artifacts = [profile for profile in artifact_profiles if not write_artifact(compiled_data, output_file, profile)]
+    if failed_artifacts:
+        print(f"Warning: Could not write artifact profile(s): {', '.join(failed_artifacts)}.")
+    if incremental:
+        # Artifacts not written in this run keep the digest of the content they were written from (so they count as stale later)
+        artifact_digests.update((profile, compiled_digest) for profile in artifact_profiles if profile not in failed_artifacts)
+        _write_manifest(output_file, manifest_files, artifact_digests)
+    return True
+
+def _ensure_output_dir(output_file):
+    """Creates the output file's directory if needed. Returns False on failure."""
+    output_dir = os.path.dirname(output_file)
+    if output_dir and not os.path.exists(output_dir): # Check if output_dir is not empty
+        try:
+            os.makedirs(output_dir)
+            print(f"Created output directory: {output_dir}")
+        except OSError as e:
+            print(f"Error creating output directory {output_dir}: {e}")
+            print("Please check permissions or choose a different output directory.")
+            return False
+    return True
+
+def watch_and_compile(base_data_dir, output_file, interval_seconds, **compile_kwargs):
+    """
+    Polls the data directory and recompiles incrementally whenever a source file
+    changes. Runs until interrupted (Ctrl+C).
+    """
+    print(f"Watching '{base_data_dir}' for changes every {interval_seconds}s. Press Ctrl+C to stop.")
+    last_signatures = None
+    try:
+        while True:
+            current_signatures = {}
+            for file_path, relative_key, _ in discover_json_files(base_data_dir):
+                try: current_signatures[relative_key] = _file_stat_signature(file_path)
+                except OSError: continue
+            if current_signatures != last_signatures:
+                compile_json_data(base_data_dir, output_file, incremental=True, **compile_kwargs)
+                last_signatures = current_signatures
+            time.sleep(interval_seconds)
+    except KeyboardInterrupt:
+        print("\nWatch mode stopped.")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile all SAGA Index .json data files into a single nested JSON file. See script header for detailed instructions.", formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--data_dir", default=None, help="Path to the 'data' directory. Overrides 'base_data_directory' configured in the script.")
+    parser.add_argument("--output", default=None, help="Path of the compiled output file. Defaults to 'compiled_output/compiled_saga_index.json' next to this script.")
+    parser.add_argument("--incremental", action="store_true", help="Only re-parse files that changed since the last run (uses a manifest next to the output).")
+    parser.add_argument("--watch_interval", type=float, default=None, help="Keep running and recompile incrementally every N seconds when files change.")
+    parser.add_argument("--workers", type=int, default=None, help="Parse files in a pool of N workers (default: serial).")
+    parser.add_argument("--executor", choices=["process", "thread"], default="process", help="Pool type used with --workers (default: process).")
+    parser.add_argument("--timing_report", action="store_true", help="Print a per-file parse timing report.")
+    parser.add_argument("--streaming", action="store_true", help="Write each file's subtree as soon as it is parsed to keep peak memory flat.")
+    parser.add_argument("--binary", action="store_true", help="Also write a compact .sagabin artifact next to the JSON output (see saga_index_loader.py).")
+    parser.add_argument("--profile", action="append", choices=list(ARTIFACT_PROFILES), default=[], help="Extra artifact to write next to the JSON output (repeatable):\nminified (.min.json), gzip (.json.gz), zstd (.json.zst, needs 'zstandard'), binary (.sagabin).")
+    parser.add_argument("--shards", action="store_true", help="Also write one shard per source file plus a table of contents for lazy loading (see saga_index_loader.LazySagaIndex).")
+    parser.add_argument("--shard_profile", choices=list(PROFILE_EXTENSIONS), default="minified", help="File format of the shards written with --shards (default: minified).")
+    parser.add_argument("--record_store", action="store_true", help="Also refresh the memory-mapped record store of the large list files (see saga_record_store.py).")
+    parser.add_argument("--prerequisite_graph", action="store_true", help="Also write the prerequisite cross-reference graph (see saga_prerequisite_graph.py).")
+    args = parser.parse_args()
+
     # --- IMPORTANT: SET THIS PATH ---
     # Set this to the absolute or relative path of your 'SagaIndex-XYZ/data' directory.
     # See instruction step 3 in the docstring at the top of this script for examples.
@@ -207,6 +754,8 @@ if __name__ == "__main__":
     script_dir = os.path.dirname(__file__) if "__file__" in locals() else os.getcwd()
     full_output_dir_path = os.path.join(script_dir, compiled_output_directory)
     full_output_file_path = os.path.join(full_output_dir_path, compiled_output_filename)
+    if args.output: full_output_file_path = args.output
+    if args.data_dir: base_data_directory = args.data_dir
 
 
     # Initial check if the placeholder path has been replaced
@@ -231,4 +780,8 @@ if __name__ == "__main__":
             print("****************************************************************************")
             exit(1) # Exit if path is not configured and default fails
 
-    compile_json_data(base_data_directory, full_output_file_path)
+    compile_options = {"workers": args.workers, "executor_type": args.executor, "report_timings": args.timing_report, "streaming": args.streaming, "binary_output": args.binary, "artifact_profiles": args.profile, "shard_profile": args.shard_profile if args.shards else None, "record_store": args.record_store, "prerequisite_graph": args.prerequisite_graph}
+    if args.watch_interval:
+        watch_and_compile(base_data_directory, full_output_file_path, args.watch_interval, **compile_options)
+    else:
+        compile_json_data(base_data_directory, full_output_file_path, incremental=args.incremental, **compile_options)
@@ -1,13 +1,23 @@
+import concurrent.futures
+import contextlib
+import copy
+import io
 import json
 import os
 import re 
 import argparse
+import bisect
 import shutil
+import tempfile
 from datetime import datetime
 
+from saga_backup_store import get_history_dir, record_file_version
+from saga_edit_journal import EditJournal, compute_edit_ids
+from saga_json_patch import JsonPatchError, apply_patch, top_level_keys
+
 # --- SCRIPT VERSION INFO ---
-SCRIPT_VERSION = "2.4.15" 
-SCRIPT_LAST_UPDATED = "2025-06-07"
+SCRIPT_VERSION = "2.15.0" 
+SCRIPT_LAST_UPDATED = "2026-10-18"
 
 # --- SCRIPT INSTRUCTIONS & SETUP ---
 """
@@ -45,6 +55,8 @@ DEFAULT_CONFIG_OBJECT_TOP_KEYS = ["file_description", "source_book_reference", "
 DEFAULT_DYNAMIC_KEY_OBJECT_TOP_KEYS = ["last_modified"] 
 
 INITIAL_TARGET_FILES_CONFIG = {} 
+DISCOVERY_REGISTRY_FORMAT_VERSION = 1 # Bump when the structure inference in _infer_target_file_config changes
+DEFAULT_DISCOVERY_REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "compiled_output", "json_updater_registry.json")
 
 # --- HELPER FUNCTIONS ---
 def populate_initial_config(npc_profile_path_override=None):
@@ -67,12 +79,92 @@ def populate_initial_config(npc_profile_path_override=None):
         }
     print(f"Initialized static config for '{base_npc_filename}' collections using path: {actual_npc_profile_path}")
 
-def generate_dynamic_target_files_config(root_path, existing_config):
+def _infer_target_file_config(target_file_key, full_file_path):
+    filename_with_ext = os.path.basename(full_file_path); base_filename = target_file_key
+    is_single_obj_content_inferred = False 
+    preferred_keys_for_list_records = DEFAULT_SAGA_INDEX_TOP_KEYS.copy()
+    preferred_keys_for_single_object_content = [] 
+    preferred_keys_root_default = ["last_modified", f"{target_file_key}_data"] 
+    id_field_inferred = "name" 
+    secondary_id_inferred = "source_book"
+    sort_key_inferred = "name" 
+    data_key_conv = f"{target_file_key}_data" 
+    list_key_conv = f"{target_file_key}_list" 
+    
+    json_content_peek = load_json_file(full_file_path)
+    if not json_content_peek: 
+        print(f"    Warning: Could not load/parse {filename_with_ext}. Assuming new SAGA Index List structure for config.")
+        is_single_obj_content_inferred = False
+    elif isinstance(json_content_peek, dict):
+        if data_key_conv in json_content_peek and isinstance(json_content_peek.get(data_key_conv), dict):
+            wrapped_content = json_content_peek[data_key_conv]
+            if list_key_conv in wrapped_content and isinstance(wrapped_content.get(list_key_conv), list):
+                is_single_obj_content_inferred = False 
+                preferred_keys_for_single_object_content = [] 
+                print(f"    Inferred '{target_file_key}' as SAGA Index List structure (wrapped).")
+            else: 
+                is_single_obj_content_inferred = True
+                list_key_conv = None 
+                id_field_inferred = None 
+                secondary_id_inferred = None
+                sort_key_inferred = None
+                preferred_keys_for_list_records = [] 
+                preferred_keys_for_single_object_content = DEFAULT_CONFIG_OBJECT_TOP_KEYS.copy() 
+                if base_filename not in ["class_rules", "combat_rules", "skill_rules", "eras_overview", "force_traditions_lore"]:
+                    id_field_inferred = "id" 
+                    preferred_keys_for_single_object_content = DEFAULT_DYNAMIC_KEY_OBJECT_TOP_KEYS.copy()
+                print(f"    Inferred '{target_file_key}' as Single Object Content (within wrapper '{data_key_conv}'). ID field for dynamic keys: '{id_field_inferred}'.")
+        else: 
+            print(f"    File '{filename_with_ext}' does not have expected wrapper '{data_key_conv}'. Assuming SAGA Index List structure config (will create wrapper).")
+            is_single_obj_content_inferred = False 
+            preferred_keys_for_single_object_content = [] 
+    else: 
+        print(f"    Warning: File {filename_with_ext} is not a JSON object at root. Assuming SAGA Index List structure config.")
+        is_single_obj_content_inferred = False
+        preferred_keys_for_single_object_content = [] 
+
+    return {"full_path": full_file_path, "data_wrapper_key": data_key_conv, "collection_key": list_key_conv,
+        "id_field": id_field_inferred, "secondary_id_field": secondary_id_inferred,
+        "is_list_of_objects": not is_single_obj_content_inferred, 
+        "is_single_object_content": is_single_obj_content_inferred, 
+        "is_object_map": False, "sort_key": sort_key_inferred, 
+        "preferred_top_keys": preferred_keys_for_list_records, 
+        "preferred_object_keys": preferred_keys_for_single_object_content, 
+        "preferred_root_keys": preferred_keys_root_default
+        }
+
+def _load_discovery_registry(registry_path):
+    if not registry_path or not os.path.exists(registry_path): return {}
+    try:
+        with open(registry_path, 'r', encoding='utf-8') as f: registry = json.load(f)
+    except (IOError, OSError, json.JSONDecodeError) as e: print(f"  Warning: Could not read discovery registry {registry_path}: {e}. Rebuilding it."); return {}
+    if not isinstance(registry, dict) or registry.get("format_version") != DISCOVERY_REGISTRY_FORMAT_VERSION: return {}
+    return registry.get("files", {})
+
+def _save_discovery_registry(registry_path, registry_files):
+    registry_files = {path: entry for path, entry in registry_files.items() if os.path.exists(path)} # Forget removed files
+    try:
+        registry_dir = os.path.dirname(registry_path)
+        if registry_dir: os.makedirs(registry_dir, exist_ok=True)
+        temp_path = registry_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f: json.dump({"format_version": DISCOVERY_REGISTRY_FORMAT_VERSION, "files": registry_files}, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, registry_path)
+    except (IOError, OSError) as e: print(f"  Warning: Could not write discovery registry {registry_path}: {e}")
+
+def generate_dynamic_target_files_config(root_path, existing_config, target_file_keys=None, registry_path=None):
+    """
+    Adds a config entry for each JSON file under root_path/data (except meta_info) to existing_config.
+    target_file_keys: if given, only these files are configured (their structure is the only thing
+        that needs inferring for an edit batch); all other files are not opened.
+    registry_path: if given, inferred configs are cached there keyed by file path, mtime and size,
+        so an unchanged file is not parsed again on the next run.
+    """
     config = existing_config 
     data_base_path = os.path.join(root_path, 'data')
     print("Dynamically scanning for other JSON files...")
     if not os.path.isdir(data_base_path):
         print(f"Warning: Base data directory not found: {data_base_path}"); return config
+    registry_files = _load_discovery_registry(registry_path); registry_changed = False
     for category_dir_name in os.listdir(data_base_path):
         category_dir_path = os.path.join(data_base_path, category_dir_name)
         if os.path.isdir(category_dir_path) and category_dir_name != 'meta_info':
@@ -84,60 +176,20 @@ def generate_dynamic_target_files_config(root_path, existing_config):
                     if target_file_key in config or any(k.startswith(target_file_key + "#") for k in config) or \
                        filename_with_ext == os.path.basename(NPC_PROFILE_FILE_PATH):
                         continue 
+                    if target_file_keys is not None and target_file_key not in target_file_keys: continue
                     full_file_path = os.path.join(category_dir_path, filename_with_ext)
-                    
-                    is_single_obj_content_inferred = False 
-                    preferred_keys_for_list_records = DEFAULT_SAGA_INDEX_TOP_KEYS.copy()
-                    preferred_keys_for_single_object_content = [] 
-                    preferred_keys_root_default = ["last_modified", f"{target_file_key}_data"] 
-                    id_field_inferred = "name" 
-                    secondary_id_inferred = "source_book"
-                    sort_key_inferred = "name" 
-                    data_key_conv = f"{target_file_key}_data" 
-                    list_key_conv = f"{target_file_key}_list" 
-                    
-                    json_content_peek = load_json_file(full_file_path)
-                    if not json_content_peek: 
-                        print(f"    Warning: Could not load/parse {filename_with_ext}. Assuming new SAGA Index List structure for config.")
-                        is_single_obj_content_inferred = False
-                    elif isinstance(json_content_peek, dict):
-                        if data_key_conv in json_content_peek and isinstance(json_content_peek.get(data_key_conv), dict):
-                            wrapped_content = json_content_peek[data_key_conv]
-                            if list_key_conv in wrapped_content and isinstance(wrapped_content.get(list_key_conv), list):
-                                is_single_obj_content_inferred = False 
-                                preferred_keys_for_single_object_content = [] 
-                                print(f"    Inferred '{target_file_key}' as SAGA Index List structure (wrapped).")
-                            else: 
-                                is_single_obj_content_inferred = True
-                                list_key_conv = None 
-                                id_field_inferred = None 
-                                secondary_id_inferred = None
-                                sort_key_inferred = None
-                                preferred_keys_for_list_records = [] 
-                                preferred_keys_for_single_object_content = DEFAULT_CONFIG_OBJECT_TOP_KEYS.copy() 
-                                if base_filename not in ["class_rules", "combat_rules", "skill_rules", "eras_overview", "force_traditions_lore"]:
-                                    id_field_inferred = "id" 
-                                    preferred_keys_for_single_object_content = DEFAULT_DYNAMIC_KEY_OBJECT_TOP_KEYS.copy()
-                                print(f"    Inferred '{target_file_key}' as Single Object Content (within wrapper '{data_key_conv}'). ID field for dynamic keys: '{id_field_inferred}'.")
-                        else: 
-                            print(f"    File '{filename_with_ext}' does not have expected wrapper '{data_key_conv}'. Assuming SAGA Index List structure config (will create wrapper).")
-                            is_single_obj_content_inferred = False 
-                            preferred_keys_for_single_object_content = [] 
-                    else: 
-                        print(f"    Warning: File {filename_with_ext} is not a JSON object at root. Assuming SAGA Index List structure config.")
-                        is_single_obj_content_inferred = False
-                        preferred_keys_for_single_object_content = [] 
-
-                    config[target_file_key] = {"full_path": full_file_path, "data_wrapper_key": data_key_conv, "collection_key": list_key_conv,
-                        "id_field": id_field_inferred, "secondary_id_field": secondary_id_inferred,
-                        "is_list_of_objects": not is_single_obj_content_inferred, 
-                        "is_single_object_content": is_single_obj_content_inferred, 
-                        "is_object_map": False, "sort_key": sort_key_inferred, 
-                        "preferred_top_keys": preferred_keys_for_list_records, 
-                        "preferred_object_keys": preferred_keys_for_single_object_content, 
-                        "preferred_root_keys": preferred_keys_root_default
-                        }
-                    print(f"    Discovered and configured: '{target_file_key}' -> {full_file_path} (Config: is_single_object_content: {is_single_obj_content_inferred})")
+
+                    registry_key = os.path.abspath(full_file_path); cached_entry = registry_files.get(registry_key)
+                    try: stat_result = os.stat(full_file_path); file_signature = [stat_result.st_mtime_ns, stat_result.st_size]
+                    except OSError: file_signature = None
+                    if registry_path and file_signature and cached_entry and cached_entry.get("signature") == file_signature:
+                        config[target_file_key] = dict(cached_entry["config"], full_path=full_file_path)
+                        print(f"    Using cached config for '{target_file_key}' (file unchanged).")
+                    else:
+                        config[target_file_key] = _infer_target_file_config(target_file_key, full_file_path)
+                        if registry_path and file_signature: registry_files[registry_key] = {"signature": file_signature, "config": config[target_file_key]}; registry_changed = True
+                    print(f"    Discovered and configured: '{target_file_key}' -> {full_file_path} (Config: is_single_object_content: {config[target_file_key]['is_single_object_content']})")
+    if registry_path and registry_changed: _save_discovery_registry(registry_path, registry_files)
     return config
 
 def reorder_record_keys(record_dict, preferred_keys):
@@ -158,7 +210,84 @@ def load_json_file(file_path):
     except json.JSONDecodeError as e: print(f"Error: Could not decode JSON from {file_path}. {e}"); return None
     except Exception as e: print(f"An unexpected error occurred while loading {file_path}: {e}"); return None
 
-def save_updated_json_file(full_data_obj, output_path, config_entry, is_single_object_content_from_edit_flag=False): 
+def write_json_file_atomically(data, output_path, indent=2):
+    """
+    Writes data as JSON to a temp file in the same directory, fsyncs it and os.replace()s it over
+    output_path, so a crash leaves either the old or the new file, never a partial one.
+    """
+    output_dir = os.path.dirname(output_path) or "."
+    temp_fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(output_path)}.", suffix=".tmp", dir=output_dir)
+    try:
+        with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+            f.flush(); os.fsync(f.fileno())
+        if os.path.exists(output_path): shutil.copymode(output_path, temp_path) # mkstemp creates 0600
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path): os.remove(temp_path)
+        raise
+    if hasattr(os, "O_DIRECTORY"): # Persist the rename itself (POSIX only)
+        try:
+            dir_fd = os.open(output_dir, os.O_RDONLY | os.O_DIRECTORY)
+            try: os.fsync(dir_fd)
+            finally: os.close(dir_fd)
+        except OSError: pass
+
+def create_backup_file(file_path):
+    """
+    Backs up file_path into backup/<name>.backup_<timestamp><ext> next to it and returns the backup path.
+    Always a full copy: a hardlink would share the inode with the data file, and the converters and
+    editors that rewrite data files in place would then overwrite the backup too.
+    """
+    file_dir, fname_ext = os.path.split(file_path)
+    fname_base, ext = os.path.splitext(fname_ext)
+    backup_dir = os.path.join(file_dir, "backup") 
+    if not os.path.exists(backup_dir): os.makedirs(backup_dir)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_file_path = os.path.join(backup_dir, f"{fname_base}.backup_{timestamp}{ext}")
+    shutil.copy2(file_path, backup_file_path)
+    return backup_file_path
+
+def _reorder_changed_records(collection, preferred_keys, sort_key, unchanged_record_ids):
+    # Returns None if the unchanged records are not already in saved order (then everything is rebuilt).
+    key_layout_in_order = {}; kept_records = []; kept_positions = []; changed_records = []
+    for position, record in enumerate(collection):
+        if id(record) in unchanged_record_ids and isinstance(record, dict):
+            key_layout = tuple(record) # Records share a handful of layouts, so each is checked once
+            in_order = key_layout_in_order.get(key_layout)
+            if in_order is None: in_order = key_layout_in_order[key_layout] = tuple(reorder_record_keys(record, preferred_keys)) == key_layout
+            if not in_order: return None
+            kept_records.append(record); kept_positions.append(position)
+        else: changed_records.append((position, record))
+    if not sort_key:
+        reordered_collection = list(collection)
+        for position, record in changed_records: reordered_collection[position] = reorder_record_keys(record, preferred_keys)
+        return reordered_collection
+    kept_values = [str(record.get(sort_key, "")) for record in kept_records]
+    if any(kept_values[i] > kept_values[i + 1] for i in range(len(kept_values) - 1)): return None
+    for position, record in changed_records:
+        # Equal sort values keep list order, exactly like the stable sorted() of the full rebuild.
+        value = str(record.get(sort_key, ""))
+        first_equal = bisect.bisect_left(kept_values, value); after_equal = bisect.bisect_right(kept_values, value, first_equal)
+        insert_at = first_equal + bisect.bisect_left(kept_positions[first_equal:after_equal], position)
+        kept_records.insert(insert_at, reorder_record_keys(record, preferred_keys)); kept_values.insert(insert_at, value); kept_positions.insert(insert_at, position)
+    return kept_records
+
+def reorder_and_sort_records(collection, preferred_keys, sort_key, unchanged_record_ids=None):
+    """
+    Returns the collection as it is saved: every record's keys reordered, sorted by sort_key (stable).
+    unchanged_record_ids: id()s of records known to be untouched since the file was loaded. If those
+    are already in saved order, only the other (modified/added) records are reordered and bisect-inserted,
+    instead of rebuilding every record and re-sorting the whole list.
+    """
+    if unchanged_record_ids is not None:
+        reordered_collection = _reorder_changed_records(collection, preferred_keys, sort_key, unchanged_record_ids)
+        if reordered_collection is not None: return reordered_collection
+    reordered_collection = [reorder_record_keys(record, preferred_keys) for record in collection]
+    return sorted(reordered_collection, key=lambda x: str(x.get(sort_key, ""))) if sort_key else reordered_collection
+
+def prepare_data_for_save(full_data_obj, output_path, config_entry, is_single_object_content_from_edit_flag=False, unchanged_record_ids=None):
+    """Stamps last_modified and reorders/sorts the data as it is saved. Returns the object to write (None on error)."""
     is_single_object_content_file_type = is_single_object_content_from_edit_flag or config_entry.get("is_single_object_content", False)
     
     data_wrapper_key = config_entry.get("data_wrapper_key")
@@ -180,9 +309,7 @@ def save_updated_json_file(full_data_obj, output_path, config_entry, is_single_o
 
             if is_list:
                 if isinstance(actual_collection, list):
-                    reordered_collection = [reorder_record_keys(record, record_preferred_keys) for record in actual_collection]
-                    if sort_key: data_to_process[collection_key] = sorted(reordered_collection, key=lambda x: str(x.get(sort_key, "")))
-                    else: data_to_process[collection_key] = reordered_collection
+                    data_to_process[collection_key] = reorder_and_sort_records(actual_collection, record_preferred_keys, sort_key, unchanged_record_ids)
                 else: print(f"Warning: Expected list for '{collection_key}', found {type(actual_collection)}. Skip sort/reorder.")
             else: 
                 if isinstance(actual_collection, dict):
@@ -200,9 +327,7 @@ def save_updated_json_file(full_data_obj, output_path, config_entry, is_single_o
         
         if is_list:
             if isinstance(actual_collection, list):
-                reordered_collection = [reorder_record_keys(record, record_preferred_keys) for record in actual_collection]
-                if sort_key: full_data_obj[collection_key] = sorted(reordered_collection, key=lambda x: str(x.get(sort_key, "")))
-                else: full_data_obj[collection_key] = reordered_collection
+                full_data_obj[collection_key] = reorder_and_sort_records(actual_collection, record_preferred_keys, sort_key, unchanged_record_ids)
             else: print(f"Warning: Expected list for top-level '{collection_key}', found {type(actual_collection)}. Skip sort/reorder.")
         elif is_object_map:
             if isinstance(actual_collection, dict):
@@ -241,29 +366,146 @@ def save_updated_json_file(full_data_obj, output_path, config_entry, is_single_o
         for key in root_preferred_keys:
             if key in temp_full_obj: full_data_obj[key] = temp_full_obj.pop(key)
         for key in sorted(temp_full_obj.keys()): full_data_obj[key] = temp_full_obj[key]
-            
+    return full_data_obj
+
+def save_updated_json_file(full_data_obj, output_path, config_entry, is_single_object_content_from_edit_flag=False, unchanged_record_ids=None): 
+    full_data_obj = prepare_data_for_save(full_data_obj, output_path, config_entry, is_single_object_content_from_edit_flag=is_single_object_content_from_edit_flag, unchanged_record_ids=unchanged_record_ids)
+    if full_data_obj is None: return
     try:
         output_dir = os.path.dirname(output_path)
         if output_dir and not os.path.exists(output_dir): os.makedirs(output_dir)
-        with open(output_path, 'w', encoding='utf-8') as f: json.dump(full_data_obj, f, indent=2, ensure_ascii=False)
+        write_json_file_atomically(full_data_obj, output_path)
         print(f"Successfully updated and saved {config_entry.get('target_file_key', os.path.basename(output_path))} JSON to: {output_path}")
+        return full_data_obj
     except Exception as e: print(f"Error writing {os.path.basename(output_path)} JSON to file {output_path}: {e}")
 
 
-def _decode_json_pointer_segment(segment):
-    return segment.replace("~1", "/").replace("~0", "~")
-
-def find_record_index_or_key(data_collection, identifier, config_details, is_single_object_content_override=False):
+def _record_matches_identifier(record, configured_id_field, identifier_primary_value, secondary_id_field, identifier_secondary_value, identifier_page_value):
+    if record.get(configured_id_field) != identifier_primary_value: return False
+    if secondary_id_field and identifier_secondary_value is not None: 
+        if record.get(secondary_id_field) != identifier_secondary_value: return False
+    elif secondary_id_field and identifier_secondary_value is None: 
+        if not (record.get(secondary_id_field) is None or record.get(secondary_id_field) == ""): return False
+    if identifier_page_value is not None: 
+        return "page" in record and str(record.get("page")) == str(identifier_page_value)
+    return True
+
+def _shallow_clone(value):
+    if isinstance(value, dict): return dict(value)
+    if isinstance(value, list): return list(value)
+    return value
+
+class CopyOnWriteBatch:
+    """
+    Copy-on-write bookkeeping for one file's edit batch. main() shallow-clones only the
+    containers on the path to the collection (root, wrapper, record list/map); apply_edit()
+    then calls writable() before mutating a record, so only the records an edit touches are
+    deep-copied and the loaded original is never modified (dropping the working copy is the
+    rollback).
+    """
+    def __init__(self):
+        self._owned = {} # id(obj) -> obj for objects already private to the working copy
+
+    def writable(self, container, key):
+        value = container[key]
+        if isinstance(value, (dict, list)) and id(value) not in self._owned:
+            value = container[key] = copy.deepcopy(value)
+            self._owned[id(value)] = value
+        return value
+
+class RecordLookupIndex:
+    """
+    Hash index over one list collection, built once per file so that each edit's record
+    lookup is O(1) instead of a scan of the whole list. Buckets on 'id' and on
+    (id_field, secondary_id_field); the bucket is then filtered with the same rules as the
+    linear scan (including 'page'), so lookups return exactly what the scan would.
+    apply_edit() keeps it in sync through record_added/record_deleted/record_updated.
+    """
+    def __init__(self, data_collection, config_details):
+        self.data_collection = data_collection
+        self.id_field = config_details.get("id_field")
+        self.secondary_id_field = config_details.get("secondary_id_field")
+        self._by_id = {}; self._by_primary = {}
+        self._entries = {} # id(record) -> (record, keys); holds a reference so ids are not reused
+        self._positions = {}; self._positions_valid_up_to = 0
+        for record in data_collection: self._add_keys(record)
+
+    def _keys_for(self, record):
+        if not isinstance(record, dict): return []
+        keys = []
+        if record.get("id"): keys.append((self._by_id, record.get("id")))
+        if self.id_field: 
+            secondary_value = record.get(self.secondary_id_field) if self.secondary_id_field else None
+            keys.append((self._by_primary, (record.get(self.id_field), None if secondary_value == "" else secondary_value)))
+        return keys
+
+    def _add_keys(self, record):
+        keys = []
+        for bucket_map, key in self._keys_for(record):
+            try: bucket_map.setdefault(key, []).append(record); keys.append((bucket_map, key))
+            except TypeError: pass # Unhashable value (e.g. a list); found by the fallback scan.
+        self._entries[id(record)] = (record, keys)
+
+    def _remove_keys(self, record):
+        _, keys = self._entries.pop(id(record), (None, []))
+        for bucket_map, key in keys:
+            bucket = bucket_map.get(key, [])
+            bucket[:] = [candidate for candidate in bucket if candidate is not record]
+            if not bucket: bucket_map.pop(key, None)
+
+    def position_of(self, record):
+        # Positions are (re)computed lazily from the first position a delete invalidated.
+        if self._positions_valid_up_to < len(self.data_collection):
+            for position in range(self._positions_valid_up_to, len(self.data_collection)):
+                self._positions[id(self.data_collection[position])] = position
+            self._positions_valid_up_to = len(self.data_collection)
+        return self._positions.get(id(record), -1)
+
+    def record_added(self, record):
+        self._add_keys(record)
+
+    def record_deleted(self, position, record):
+        self._remove_keys(record)
+        self._positions.pop(id(record), None)
+        self._positions_valid_up_to = min(self._positions_valid_up_to, position)
+
+    def record_updated(self, position, previous_record):
+        self._remove_keys(previous_record)
+        if previous_record is not self.data_collection[position]: # Copy-on-write replaced the record in place: move its position entry
+            self._positions.pop(id(previous_record), None); self._positions[id(self.data_collection[position])] = position
+        self._add_keys(self.data_collection[position])
+
+    def _first_position(self, candidates):
+        positions = [self.position_of(record) for record in candidates]
+        positions = [position for position in positions if position != -1]
+        return min(positions) if positions else -1
+
+    def find_by_id(self, identifier_id_val):
+        try: return self._first_position(self._by_id.get(identifier_id_val, []))
+        except TypeError: return None # Unhashable: caller falls back to the scan
+
+    def find_by_fields(self, identifier_primary_value, identifier_secondary_value, identifier_page_value):
+        if not self.id_field: return None
+        try: 
+            if identifier_secondary_value is None: candidates = self._by_primary.get((identifier_primary_value, None), [])
+            else: candidates = self._by_primary.get((identifier_primary_value, None if identifier_secondary_value == "" else identifier_secondary_value), [])
+        except TypeError: return None
+        return self._first_position([record for record in candidates if _record_matches_identifier(record, self.id_field, identifier_primary_value, self.secondary_id_field, identifier_secondary_value, identifier_page_value)])
+
+def find_record_index_or_key(data_collection, identifier, config_details, is_single_object_content_override=False, lookup_index=None):
     if is_single_object_content_override: return True 
     
     is_list = config_details.get("is_list_of_objects", True) 
+    if lookup_index is not None and lookup_index.data_collection is not data_collection: lookup_index = None
     
     identifier_id_val = identifier.get("id") 
     if identifier_id_val: 
         if is_list:
             if not isinstance(data_collection, list): return -1
-            for index, record in enumerate(data_collection):
-                if record.get("id") == identifier_id_val: return index
+            index = lookup_index.find_by_id(identifier_id_val) if lookup_index else None
+            if index is None: 
+                index = next((index for index, record in enumerate(data_collection) if record.get("id") == identifier_id_val), -1)
+            if index != -1: return index
             print(f"  Info: Record with 'id': \"{identifier_id_val}\" not found by dedicated ID lookup.") 
             return -1 
         else: 
@@ -285,28 +527,17 @@ def find_record_index_or_key(data_collection, identifier, config_details, is_sin
 
     if is_list:
         if not isinstance(data_collection, list): return -1
+        index = lookup_index.find_by_fields(identifier_primary_value, identifier_secondary_value, identifier_page_value) if lookup_index else None
+        if index is not None: return index
         for index, record in enumerate(data_collection):
-            if record.get(configured_id_field) == identifier_primary_value:
-                match_secondary = True 
-                if secondary_id_field and identifier_secondary_value is not None: 
-                    match_secondary = (record.get(secondary_id_field) == identifier_secondary_value)
-                elif secondary_id_field and identifier_secondary_value is None: 
-                    match_secondary = (record.get(secondary_id_field) is None or record.get(secondary_id_field) == "")
-                if match_secondary:
-                    match_page = True 
-                    if identifier_page_value is not None: 
-                        if "page" in record:
-                            match_page = (str(record.get("page")) == str(identifier_page_value))
-                        else: 
-                            match_page = False
-                    if match_page: return index
+            if _record_matches_identifier(record, configured_id_field, identifier_primary_value, secondary_id_field, identifier_secondary_value, identifier_page_value): return index
         return -1 
     else: 
         if not isinstance(data_collection, dict): return None
         return identifier_primary_value if identifier_primary_value in data_collection else None
 
 
-def apply_edit(data_to_edit_or_list, edit_request, dry_run=False, config_details=None, is_single_object_content_override=False): 
+def apply_edit(data_to_edit_or_list, edit_request, dry_run=False, config_details=None, is_single_object_content_override=False, lookup_index=None, copy_on_write=None): 
     action = edit_request.get("action"); identifier = edit_request.get("identifier"); payload = edit_request.get("payload")
     if not config_details: print(f"Error: apply_edit missing config_details. Edit: {edit_request}"); return False
     id_field = config_details.get("id_field"); is_list_collection = config_details.get("is_list_of_objects", False) 
@@ -320,34 +551,10 @@ def apply_edit(data_to_edit_or_list, edit_request, dry_run=False, config_details
                 if dry_run: print(f"  DRY RUN: Would apply patch operations to single object content:\n{json.dumps(payload, indent=4)}")
                 else: 
                     print(f"  Applying patch operations to single object content.")
-                    for op_item in payload:
-                        path_str = op_item.get("path", "").strip("/")
-                        op_type = op_item.get("op"); value = op_item.get("value")
-                        path_segments_encoded = [seg for seg in path_str.split("/") if seg] if path_str else []
-                        path_segments = [_decode_json_pointer_segment(seg) for seg in path_segments_encoded]
-                        current_target_obj = target_object_for_patch
-                        try:
-                            for i, segment in enumerate(path_segments[:-1]):
-                                current_target_obj = current_target_obj[int(segment) if segment.isdigit() and isinstance(current_target_obj, list) else segment]
-                            final_segment = path_segments[-1] if path_segments else None
-                            if op_type == "replace":
-                                if final_segment is None and not path_segments: print(f"    Warning: 'replace' root of single object content requires path to a key."); continue 
-                                elif final_segment is None: print(f"    Warning: Invalid 'replace' path: {path_str}"); continue
-                                else: current_target_obj[int(final_segment) if final_segment.isdigit() and isinstance(current_target_obj, list) else final_segment] = value
-                            elif op_type == "add":
-                                if isinstance(current_target_obj, list) and final_segment == '-': current_target_obj.append(value)
-                                elif isinstance(current_target_obj, list) and final_segment and final_segment.isdigit(): current_target_obj.insert(int(final_segment), value)
-                                elif isinstance(current_target_obj, dict): 
-                                    if final_segment is None: print(f"    Warning: 'add' to object root requires a key in path: {path_str}"); continue
-                                    current_target_obj[final_segment] = value
-                                else: print(f"    Warning: 'add' target is not list or object: {path_str}"); continue
-                            elif op_type == "remove":
-                                if final_segment is None: print(f"    Warning: 'remove' path cannot be empty."); continue
-                                if isinstance(current_target_obj, list) and final_segment.isdigit(): del current_target_obj[int(final_segment)]
-                                elif isinstance(current_target_obj, dict) and final_segment in current_target_obj : del current_target_obj[final_segment]
-                                else: print(f"    Warning: Path not found for 'remove': {path_str}"); continue
-                            operation_successful = True
-                        except (KeyError, IndexError, TypeError) as e: print(f"    Error applying patch operation {op_item}: {e}. Path: /{'/'.join(path_segments)}")
+                    if copy_on_write is not None: 
+                        for top_level_key in top_level_keys(payload) & target_object_for_patch.keys(): copy_on_write.writable(target_object_for_patch, top_level_key)
+                try: apply_patch(target_object_for_patch, payload, allow_root_replace=False, dry_run=dry_run); operation_successful = True
+                except JsonPatchError as e: print(f"    Error applying patch to single object content: {e}. No operations applied.")
             elif isinstance(payload, dict): 
                 if dry_run: print(f"  DRY RUN: Would update keys in object with payload:\n{json.dumps(payload, indent=4)}")
                 else: print(f"  Updating keys in object."); data_to_edit_or_list.update(payload)
@@ -391,45 +598,24 @@ def apply_edit(data_to_edit_or_list, edit_request, dry_run=False, config_details
         if not identifier or not payload: print(f"Warning: 'update' missing identifier/payload."); return False
         if not isinstance(payload, list): print(f"Warning: 'update' payload must be a list of patch operations."); return False
         if is_list_collection:
-            idx_or_key_for_update = find_record_index_or_key(data_to_edit_or_list, identifier, config_details)
+            idx_or_key_for_update = find_record_index_or_key(data_to_edit_or_list, identifier, config_details, lookup_index=lookup_index)
             if idx_or_key_for_update != -1: target_record_or_map_value = data_to_edit_or_list[idx_or_key_for_update]
         elif is_object_map_collection:
             idx_or_key_for_update = find_record_index_or_key(data_to_edit_or_list, identifier, config_details)
             if idx_or_key_for_update: target_record_or_map_value = data_to_edit_or_list[idx_or_key_for_update]
         if target_record_or_map_value:
+            previous_record = target_record_or_map_value
             if dry_run: print(f"  DRY RUN: Would apply patch operations to record identified by {identifier}:\n{json.dumps(payload, indent=4)}")
-            else: print(f"  Applying patch operations to record identified by {identifier}")
-            for op_item in payload: 
-                path_str = op_item.get("path", "").strip("/"); op_type = op_item.get("op"); value = op_item.get("value")
-                path_segments_encoded = [seg for seg in path_str.split("/") if seg] if path_str else []
-                path_segments = [_decode_json_pointer_segment(seg) for seg in path_segments_encoded]
-                current_target_in_record = target_record_or_map_value
-                try:
-                    for i, segment in enumerate(path_segments[:-1]):
-                        current_target_in_record = current_target_in_record[int(segment) if segment.isdigit() and isinstance(current_target_in_record, list) else segment]
-                    final_segment = path_segments[-1] if path_segments else None
-                    if op_type == "replace":
-                        if final_segment is None and not path_segments: 
-                            if is_list_collection: data_to_edit_or_list[idx_or_key_for_update] = value
-                            elif is_object_map_collection: data_to_edit_or_list[idx_or_key_for_update] = value
-                        elif final_segment is None: print(f"    Warning: Invalid 'replace' path for record item: {path_str}"); continue
-                        else: current_target_in_record[int(final_segment) if final_segment.isdigit() and isinstance(current_target_in_record, list) else final_segment] = value
-                    elif op_type == "add":
-                        if isinstance(current_target_in_record, list) and final_segment == '-': current_target_in_record.append(value)
-                        elif isinstance(current_target_in_record, list) and final_segment and final_segment.isdigit(): current_target_in_record.insert(int(final_segment), value)
-                        elif isinstance(current_target_in_record, dict): 
-                            if final_segment is None: print(f"    Warning: 'add' to object root requires a key in path. Path: {path_str}"); continue
-                            current_target_in_record[final_segment] = value
-                        else: print(f"    Warning: 'add' target is not list or object. Path: {path_str}"); continue
-                    elif op_type == "remove":
-                        if final_segment is None: print(f"    Warning: 'remove' path cannot be empty for record item."); continue
-                        if isinstance(current_target_in_record, list) and final_segment.isdigit(): del current_target_in_record[int(final_segment)]
-                        elif isinstance(current_target_in_record, dict) and final_segment in current_target_in_record : del current_target_in_record[final_segment]
-                        else: print(f"    Warning: Path not found for 'remove': {path_str}"); continue
-                    operation_successful = True 
-                except (KeyError, IndexError, TypeError) as e: print(f"    Error applying patch operation {op_item} to record {identifier}: {e}. Path: /{'/'.join(path_segments)}")
-            if not operation_successful and payload: print(f"  Warning: No patch operations successfully applied for update: {identifier}")
-            elif not payload: operation_successful = True 
+            else: 
+                print(f"  Applying patch operations to record identified by {identifier}")
+                if copy_on_write is not None: target_record_or_map_value = copy_on_write.writable(data_to_edit_or_list, idx_or_key_for_update)
+            try: 
+                patched_record = apply_patch(target_record_or_map_value, payload, dry_run=dry_run)
+                if patched_record is not target_record_or_map_value: data_to_edit_or_list[idx_or_key_for_update] = patched_record # Root replaced
+                operation_successful = True
+            except JsonPatchError as e: print(f"    Error applying patch to record {identifier}: {e}. No operations applied.")
+            if lookup_index is not None and is_list_collection and not dry_run: lookup_index.record_updated(idx_or_key_for_update, previous_record)
+            if not operation_successful: print(f"  Warning: No patch operations successfully applied for update: {identifier}")
         else: print(f"  Warning: Record not found for update: {identifier}")
     elif action == "add": 
         if not payload: print(f"Warning: 'add' missing payload. Edit: {edit_request}"); return False
@@ -438,11 +624,13 @@ def apply_edit(data_to_edit_or_list, edit_request, dry_run=False, config_details
             add_ident_for_check = {id_field if id_field else "id": add_id_val_check}
             if config_details.get("secondary_id_field"): add_ident_for_check[config_details["secondary_id_field"]] = payload.get(config_details["secondary_id_field"])
             if "page" in payload and payload.get("page") is not None: add_ident_for_check["page"] = payload.get("page")
-            if find_record_index_or_key(data_to_edit_or_list, add_ident_for_check, config_details) != -1:
+            if find_record_index_or_key(data_to_edit_or_list, add_ident_for_check, config_details, lookup_index=lookup_index) != -1:
                 print(f"  Warning: Record identified by {add_ident_for_check} already exists. Skipping add."); return False
             display_name_for_log = payload.get("name", add_id_val_check if add_id_val_check else "Unknown new record")
             if dry_run: print(f"  DRY RUN: Would add new record '{display_name_for_log}':\n{json.dumps(payload, indent=4)}")
-            else: print(f"  Adding new record: {display_name_for_log}"); data_to_edit_or_list.append(payload) 
+            else: 
+                print(f"  Adding new record: {display_name_for_log}"); data_to_edit_or_list.append(payload) 
+                if lookup_index is not None: lookup_index.record_added(payload)
             operation_successful = True
         elif is_object_map_collection: 
             add_key = identifier.get(id_field) 
@@ -454,11 +642,13 @@ def apply_edit(data_to_edit_or_list, edit_request, dry_run=False, config_details
     elif action == "delete": 
         if not identifier: print(f"Warning: 'delete' missing identifier. Edit: {edit_request}"); return False
         if is_list_collection:
-            idx = find_record_index_or_key(data_to_edit_or_list, identifier, config_details)
+            idx = find_record_index_or_key(data_to_edit_or_list, identifier, config_details, lookup_index=lookup_index)
             if idx != -1:
                 rec_data = data_to_edit_or_list[idx] if dry_run else {}
                 if dry_run: print(f"  DRY RUN: Would delete record identified by {identifier}:\n{json.dumps(rec_data, indent=4)}")
-                else: print(f"  Deleting record identified by {identifier}"); del data_to_edit_or_list[idx]
+                else: 
+                    print(f"  Deleting record identified by {identifier}"); deleted_record = data_to_edit_or_list.pop(idx)
+                    if lookup_index is not None: lookup_index.record_deleted(idx, deleted_record)
                 operation_successful = True
             else: print(f"  Warning: Record not found for delete: {identifier}")
         elif is_object_map_collection: 
@@ -472,112 +662,201 @@ def apply_edit(data_to_edit_or_list, edit_request, dry_run=False, config_details
     else: print(f"Warning: Unknown action '{action}'. Edit: {edit_request}")
     return operation_successful
 
+def create_empty_target_data(target_key, config_entry, is_single_object_content):
+    """Returns the initial content of a target file that does not exist yet (for 'add' edits)."""
+    if is_single_object_content: 
+        # A single root object starts empty if new; if it has a wrapper, create that first
+        return {config_entry["data_wrapper_key"]: {}} if config_entry.get("data_wrapper_key") else {}
+    empty_collection = [] if config_entry.get("is_list_of_objects", True) else {}
+    if config_entry.get("data_wrapper_key"): 
+        return {config_entry["data_wrapper_key"]: {"description": f"Compilation of {target_key.split('#')[0].replace('_', ' ').title()}", config_entry["collection_key"]: empty_collection}}
+    return {config_entry["collection_key"]: empty_collection}
+
+def locate_edit_target(target_data_obj_modified, config_entry, is_single_object_content, target_key):
+    """
+    Returns the object a target's edits operate on (its record collection, or the wrapper/root for
+    single object content), shallow-cloning each container on the way so the working copy does not
+    share them with the loaded original. Returns None (after printing why) if the file lacks it.
+    """
+    file_path = config_entry["full_path"]
+    if config_entry.get("data_wrapper_key"): 
+        if config_entry["data_wrapper_key"] not in target_data_obj_modified: print(f"Error: File {file_path} missing wrapper '{config_entry['data_wrapper_key']}'. Skip batch."); return None
+        parent_of_collection = target_data_obj_modified[config_entry["data_wrapper_key"]] = _shallow_clone(target_data_obj_modified[config_entry["data_wrapper_key"]])
+        if is_single_object_content: return parent_of_collection
+        if config_entry.get("collection_key") and config_entry["collection_key"] in parent_of_collection: 
+            collection = parent_of_collection[config_entry["collection_key"]] = _shallow_clone(parent_of_collection[config_entry["collection_key"]])
+            return collection
+        print(f"Error: File {file_path} missing collection '{config_entry['collection_key']}' in wrapper. Skip batch."); return None
+    if is_single_object_content: return target_data_obj_modified
+    if config_entry.get("collection_key") and config_entry["collection_key"] in target_data_obj_modified: 
+        collection = target_data_obj_modified[config_entry["collection_key"]] = _shallow_clone(target_data_obj_modified[config_entry["collection_key"]])
+        return collection
+    print(f"Error: File {file_path} missing collection '{config_entry.get('collection_key')}' at root. Skip batch."); return None
+
+def save_with_backup_and_journal(file_path, target_data_obj_original, save_function, backup_mode="store", backed_up_files_this_run=None, edit_journal=None, journal_label=None, applied_edit_ids=()):
+    """
+    Backs up file_path (see process_target_edits for backup_mode), then calls save_function(), which
+    writes the file and returns the saved object (None on failure), inside an edit journal transaction
+    for applied_edit_ids if edit_journal is given. Returns what save_function returned.
+    """
+    if backed_up_files_this_run is None: backed_up_files_this_run = set()
+    pre_save_version_in_store = False
+    if backup_mode == "store":
+        if os.path.exists(file_path): 
+            try: 
+                if record_file_version(file_path, target_data_obj_original): print(f"  Captured pre-save version of '{os.path.basename(file_path)}' in '{get_history_dir(file_path)}'")
+                pre_save_version_in_store = True
+            except Exception as e_backup: print(f"  Error capturing backup version for {file_path}: {e_backup}")
+    elif os.path.exists(file_path) and file_path not in backed_up_files_this_run: 
+        try:
+            backup_file_path = create_backup_file(file_path)
+            print(f"  Backup of '{os.path.basename(file_path)}' created at '{backup_file_path}'")
+            backed_up_files_this_run.add(file_path) 
+        except Exception as e_backup: print(f"  Error creating backup for {file_path}: {e_backup}")
+    journal_txn = edit_journal.begin(journal_label, applied_edit_ids) if edit_journal is not None and applied_edit_ids else None # Write-ahead: before the save
+    saved_data_obj = save_function()
+    if journal_txn is not None: 
+        if saved_data_obj is not None: edit_journal.commit(journal_txn)
+        else: edit_journal.abort(journal_txn)
+    if backup_mode == "store" and saved_data_obj is not None: 
+        # Capturing the saved content too makes `restore --at` return what the file held at that time.
+        try: record_file_version(file_path, saved_data_obj, previous_content=target_data_obj_original if pre_save_version_in_store else None)
+        except Exception as e_backup: print(f"  Error capturing saved version for {file_path}: {e_backup}")
+    return saved_data_obj
+
+def process_target_edits(target_key, edits_for_file, config_entry, dry_run=False, backed_up_files_this_run=None, backup_mode="store", edit_ids=None, chunk_size=0, is_single_object_batch=None):
+    """
+    Applies one target_file_key's edits to its file: load, apply, back up and save.
+    backup_mode 'store' captures the file before and after the save in its delta backup store
+    (saga_backup_store); 'copy' makes one copy per physical file per run, tracked in
+    backed_up_files_this_run.
+    edit_ids: IDs parallel to edits_for_file (saga_edit_journal.compute_edit_ids). When given, edits
+        already committed in the file's edit journal are skipped and the save is journaled.
+    chunk_size: If > 0, the edits are applied and saved (and journaled) in chunks of this size.
+
+    Returns:
+        int: Number of edits applied (or that would be applied in a dry run).
+    """
+    if backed_up_files_this_run is None: backed_up_files_this_run = set()
+    if is_single_object_batch is None: is_single_object_batch = edits_for_file[0].get("is_single_object", config_entry.get("is_single_object_content", False))
+    if chunk_size and len(edits_for_file) > chunk_size:
+        return sum(process_target_edits(target_key, edits_for_file[start:start + chunk_size], config_entry, dry_run=dry_run, backed_up_files_this_run=backed_up_files_this_run, backup_mode=backup_mode,
+                                        edit_ids=edit_ids[start:start + chunk_size] if edit_ids is not None else None, is_single_object_batch=is_single_object_batch)
+                   for start in range(0, len(edits_for_file), chunk_size))
+    file_path = config_entry["full_path"] 
+    
+    print(f"\nProcessing edits for: {target_key} (File: {file_path})")
+
+    edit_journal = None
+    if edit_ids is not None:
+        edit_journal = EditJournal.for_file(file_path, read_only=dry_run) # A dry run resolves interrupted saves in memory only
+        for txn, outcome in edit_journal.recovered: print(f"  Edit journal: recovered interrupted save {txn} as {outcome}.")
+        pending_edits = [(edit_id, edit) for edit_id, edit in zip(edit_ids, edits_for_file) if edit_id not in edit_journal.committed_ids]
+        if len(pending_edits) < len(edits_for_file): print(f"  Skipping {len(edits_for_file) - len(pending_edits)} edit(s) already applied according to the edit journal.")
+        if not pending_edits: return 0
+        edit_ids = [edit_id for edit_id, _ in pending_edits]; edits_for_file = [edit for _, edit in pending_edits]
+    
+    is_single_object_content_for_this_batch = is_single_object_batch
+
+    target_data_obj_original = None
+    if os.path.exists(file_path):
+        target_data_obj_original = load_json_file(file_path)
+        if not target_data_obj_original: print(f"Error: Could not load target file {file_path}. Skipping."); return 0
+    elif all(edit.get("action") == "add" for edit in edits_for_file):
+         print(f"Target file {file_path} not found. Will simulate/create new file for 'add' operations.")
+         target_data_obj_original = create_empty_target_data(target_key, config_entry, is_single_object_content_for_this_batch)
+    else: print(f"Error: Target file {file_path} not found and not all edits 'add'. Skipping."); return 0
+    
+    # Copy-on-write: only the containers down to the collection are cloned here (shallowly);
+    # apply_edit() deep-copies a record the first time an edit modifies it.
+    target_data_obj_modified = _shallow_clone(target_data_obj_original); copy_on_write = CopyOnWriteBatch()
+    actual_data_to_operate_on = locate_edit_target(target_data_obj_modified, config_entry, is_single_object_content_for_this_batch, target_key)
+    if actual_data_to_operate_on is None: return 0
+    
+    # Built once per file so each edit's record lookup is a hash lookup, not a scan.
+    lookup_index = RecordLookupIndex(actual_data_to_operate_on, config_entry) if isinstance(actual_data_to_operate_on, list) and not is_single_object_content_for_this_batch else None
+    # Copy-on-write keeps every untouched record the same object, so the save only has to reorder the rest.
+    unchanged_record_ids = {id(record) for record in actual_data_to_operate_on} if lookup_index is not None else None
+    file_would_be_modified = False; edits_applied_this_file_count = 0
+    applied_edit_ids = []
+    for position, edit_request in enumerate(edits_for_file):
+        if apply_edit(actual_data_to_operate_on, edit_request, dry_run=dry_run, config_details=config_entry, is_single_object_content_override=is_single_object_content_for_this_batch, lookup_index=lookup_index, copy_on_write=copy_on_write): 
+            file_would_be_modified = True; edits_applied_this_file_count +=1
+            if edit_ids is not None: applied_edit_ids.append(edit_ids[position])
+    
+    if file_would_be_modified:
+        if dry_run: print(f"  DRY RUN SUMMARY for {target_key}: {edits_applied_this_file_count} edit(s) would be processed.")
+        else:
+            save_with_backup_and_journal(file_path, target_data_obj_original, lambda: save_updated_json_file(target_data_obj_modified, file_path, config_entry, is_single_object_content_from_edit_flag=is_single_object_content_for_this_batch, unchanged_record_ids=unchanged_record_ids),
+                                         backup_mode=backup_mode, backed_up_files_this_run=backed_up_files_this_run, edit_journal=edit_journal, journal_label=target_key, applied_edit_ids=applied_edit_ids)
+    elif not dry_run: print(f"  No changes processed or would be processed for {target_key}.")
+    return edits_applied_this_file_count if file_would_be_modified else 0
+
+def _process_file_group(target_batches, dry_run, backup_mode="store", chunk_size=0):
+    # Worker for --jobs: runs the batches that share one physical file in order, capturing their output.
+    log_buffer = io.StringIO(); applied_counts = []; backed_up_files_this_run = set()
+    with contextlib.redirect_stdout(log_buffer):
+        for target_key, edits_for_file, config_entry, edit_ids in target_batches:
+            applied_counts.append((target_key, process_target_edits(target_key, edits_for_file, config_entry, dry_run=dry_run, backed_up_files_this_run=backed_up_files_this_run, backup_mode=backup_mode, edit_ids=edit_ids, chunk_size=chunk_size)))
+    return applied_counts, log_buffer.getvalue()
+
 # --- MAIN PROCESSING LOGIC ---
-def main(edits_file_path, root_path, dry_run=False):
+def main(edits_file_path, root_path, dry_run=False, discovery_registry_path=DEFAULT_DISCOVERY_REGISTRY_PATH, jobs=1, backup_mode="store", use_journal=True, chunk_size=0):
     print(f"--- JSON Updater Script v{SCRIPT_VERSION} ({SCRIPT_LAST_UPDATED}) ---") 
     if dry_run: print("*** DRY RUN MODE ENABLED: No files will be modified. ***\n")
     print(f"Starting JSON update process for edits in: {edits_file_path}")
     print(f"Using SAGA Index root path (for dynamic discovery): {root_path}")
 
-    TARGET_FILES_CONFIG = INITIAL_TARGET_FILES_CONFIG.copy() 
-    generate_dynamic_target_files_config(root_path, TARGET_FILES_CONFIG) 
-    
-    if not TARGET_FILES_CONFIG: print("Error: Failed to generate/load any target files configuration. Exiting."); return
-
     edit_requests = load_json_file(edits_file_path)
     if not edit_requests or not isinstance(edit_requests, list): 
         print("Error: Edits file is empty, not found, or not a JSON list. The root must be an array `[]`.")
         return
 
-    edits_by_target = {}; total_edits_processed_successfully = 0; backed_up_files_this_run = set()
-    for edit in edit_requests:
+    # Only the files this batch targets are configured (and parsed, unless cached in the registry).
+    TARGET_FILES_CONFIG = INITIAL_TARGET_FILES_CONFIG.copy() 
+    batch_target_keys = {edit.get("target_file_key") for edit in edit_requests if isinstance(edit, dict) and edit.get("target_file_key")}
+    generate_dynamic_target_files_config(root_path, TARGET_FILES_CONFIG, target_file_keys=batch_target_keys, registry_path=discovery_registry_path) 
+    
+    if not TARGET_FILES_CONFIG: print("Error: Failed to generate/load any target files configuration. Exiting."); return
+
+    edits_by_target = {}; edit_ids_by_target = {}; total_edits_processed_successfully = 0; backed_up_files_this_run = set()
+    for edit, edit_id in zip(edit_requests, compute_edit_ids(edit_requests, edits_file_path)):
         target_key = edit.get("target_file_key")
-        if target_key: edits_by_target.setdefault(target_key, []).append(edit)
+        if target_key: edits_by_target.setdefault(target_key, []).append(edit); edit_ids_by_target.setdefault(target_key, []).append(edit_id)
         else: print(f"Warning: Edit missing 'target_file_key': {edit}")
     
+    runnable_batches = []
     for target_key, edits_for_file in edits_by_target.items():
         if target_key not in TARGET_FILES_CONFIG:
             print(f"Warning: Unknown target_file_key '{target_key}'. Skipping {len(edits_for_file)} edits.")
             continue
+        runnable_batches.append((target_key, edits_for_file, TARGET_FILES_CONFIG[target_key], edit_ids_by_target[target_key] if use_journal else None))
 
-        config_entry = TARGET_FILES_CONFIG[target_key] 
-        file_path = config_entry["full_path"] 
-        
-        print(f"\nProcessing edits for: {target_key} (File: {file_path})")
-        
-        is_single_object_content_for_this_batch = edits_for_file[0].get("is_single_object", config_entry.get("is_single_object_content", False))
-
-        target_data_obj_original = None
-        if os.path.exists(file_path):
-            target_data_obj_original = load_json_file(file_path)
-            if not target_data_obj_original: print(f"Error: Could not load target file {file_path}. Skipping."); continue
-        elif all(edit.get("action") == "add" for edit in edits_for_file):
-             print(f"Target file {file_path} not found. Will simulate/create new file for 'add' operations.")
-             if is_single_object_content_for_this_batch: 
-                # A single root object starts empty if new
-                if config_entry.get("data_wrapper_key"): # But if it has a wrapper, create that first
-                    target_data_obj_original = {config_entry["data_wrapper_key"]:{}}
-                else:
-                    target_data_obj_original = {}
-             elif config_entry.get("data_wrapper_key"): 
-                 target_data_obj_original = {
-                     config_entry["data_wrapper_key"]: {
-                         "description": f"Compilation of {target_key.split('#')[0].replace('_', ' ').title()}", 
-                         config_entry["collection_key"]: [] if config_entry.get("is_list_of_objects", True) else {}
-                     }
-                 }
-             else: 
-                 target_data_obj_original = {
-                     config_entry["collection_key"]: [] if config_entry.get("is_list_of_objects", True) else {}
-                 }
-        else: print(f"Error: Target file {file_path} not found and not all edits 'add'. Skipping."); continue
-        
-        target_data_obj_modified = json.loads(json.dumps(target_data_obj_original)) 
-
-        actual_data_to_operate_on = None 
-        if config_entry.get("data_wrapper_key"): 
-            if config_entry["data_wrapper_key"] not in target_data_obj_modified: print(f"Error: File {file_path} missing wrapper '{config_entry['data_wrapper_key']}'. Skip batch."); continue
-            parent_of_collection = target_data_obj_modified[config_entry["data_wrapper_key"]]
-            if is_single_object_content_for_this_batch: 
-                actual_data_to_operate_on = parent_of_collection
-            elif config_entry.get("collection_key") and config_entry["collection_key"] in parent_of_collection: 
-                actual_data_to_operate_on = parent_of_collection[config_entry["collection_key"]]
-            elif not config_entry.get("collection_key") and is_single_object_content_for_this_batch: 
-                 actual_data_to_operate_on = parent_of_collection
-            else: print(f"Error: File {file_path} missing collection '{config_entry['collection_key']}' in wrapper. Skip batch."); continue
-        else: 
-            if is_single_object_content_for_this_batch: 
-                actual_data_to_operate_on = target_data_obj_modified
-            elif config_entry.get("collection_key") and config_entry["collection_key"] in target_data_obj_modified: 
-                actual_data_to_operate_on = target_data_obj_modified[config_entry["collection_key"]]
-            else: print(f"Error: File {file_path} missing collection '{config_entry['collection_key']}' at root. Skip batch."); continue
-
-        if actual_data_to_operate_on is None: print(f"Error: Could not determine data to operate on for {target_key}."); continue
-        
-        file_would_be_modified = False; edits_applied_this_file_count = 0
-        for edit_request in edits_for_file:
-            if apply_edit(actual_data_to_operate_on, edit_request, dry_run=dry_run, config_details=config_entry, is_single_object_content_override=is_single_object_content_for_this_batch): 
-                file_would_be_modified = True; edits_applied_this_file_count +=1
-        
-        if file_would_be_modified:
-            total_edits_processed_successfully += edits_applied_this_file_count
-            if dry_run: print(f"  DRY RUN SUMMARY for {target_key}: {edits_applied_this_file_count} edit(s) would be processed.")
-            else:
-                if os.path.exists(file_path) and file_path not in backed_up_files_this_run: 
-                    try:
-                        file_dir, fname_ext = os.path.split(file_path)
-                        fname_base, ext = os.path.splitext(fname_ext)
-                        backup_dir = os.path.join(file_dir, "backup") 
-                        if not os.path.exists(backup_dir): os.makedirs(backup_dir)
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        backup_filename = f"{fname_base}.backup_{timestamp}{ext}"
-                        backup_file_path = os.path.join(backup_dir, backup_filename)
-                        shutil.copy2(file_path, backup_file_path)
-                        print(f"  Backup of '{fname_ext}' created at '{backup_file_path}'")
-                        backed_up_files_this_run.add(file_path) 
-                    except Exception as e_backup: print(f"  Error creating backup for {file_path}: {e_backup}")
-                save_updated_json_file(target_data_obj_modified, file_path, config_entry, is_single_object_content_from_edit_flag=is_single_object_content_for_this_batch) 
-        elif not dry_run: print(f"  No changes processed or would be processed for {target_key}.")
+    if jobs <= 1:
+        for target_key, edits_for_file, config_entry, edit_ids in runnable_batches:
+            total_edits_processed_successfully += process_target_edits(target_key, edits_for_file, config_entry, dry_run=dry_run, backed_up_files_this_run=backed_up_files_this_run, backup_mode=backup_mode, edit_ids=edit_ids, chunk_size=chunk_size)
+    else:
+        # Target keys that share a physical file (e.g. the NPC profile collections) stay in one
+        # worker, in batch order, so their load/save cycles cannot overwrite each other.
+        file_groups = {}
+        for batch in runnable_batches: file_groups.setdefault(os.path.abspath(batch[2]["full_path"]), []).append(batch)
+        print(f"\nApplying edits to {len(file_groups)} file(s) with {min(jobs, len(file_groups))} worker(s)...")
+        per_target_results = {}
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(file_groups)) or 1) as executor:
+            futures = [(group_path, executor.submit(_process_file_group, group, dry_run, backup_mode, chunk_size)) for group_path, group in file_groups.items()]
+            for group_path, future in futures: # Logs are printed in batch order, whatever order the workers finish in.
+                try: applied_counts, group_log = future.result()
+                except Exception as e:
+                    print(f"\nError: Worker failed while processing {group_path}: {e}")
+                    for target_key, _, _, _ in file_groups[group_path]: per_target_results[target_key] = None
+                    continue
+                print(group_log, end="")
+                for target_key, applied_count in applied_counts: per_target_results[target_key] = applied_count
+        print("\nPer-file summary:")
+        for target_key, edits_for_file, _, _ in runnable_batches:
+            applied_count = per_target_results.get(target_key)
+            if applied_count is None: print(f"  {target_key}: FAILED ({len(edits_for_file)} edit(s) not applied)")
+            else: print(f"  {target_key}: {applied_count}/{len(edits_for_file)} edit(s) {'simulated' if dry_run else 'applied'}"); total_edits_processed_successfully += applied_count
 
     if dry_run: print(f"\nDRY RUN COMPLETE. {total_edits_processed_successfully} total edits simulated.")
     else: print(f"\nJSON update process complete. Total edits successfully applied: {total_edits_processed_successfully}")
@@ -590,6 +869,12 @@ if __name__ == '__main__':
     parser.add_argument("--root_path", default=DEFAULT_LOCAL_ROOT_PATH, help=f"Root path of the SagaIndex repository. Defaults to:\n'{DEFAULT_LOCAL_ROOT_PATH}'.")
     parser.add_argument("--npc_profile_file", default=None, help=f"Absolute path to the NPC Profile JSON file. If not provided, uses path from script config: '{NPC_PROFILE_FILE_PATH}'.")
     parser.add_argument("--dry_run", action="store_true", help="Simulate updates without writing to files.")
+    parser.add_argument("--discovery_registry", default=DEFAULT_DISCOVERY_REGISTRY_PATH, help=f"Cache of inferred file configs, keyed by file mtime/size. Defaults to:\n'{DEFAULT_DISCOVERY_REGISTRY_PATH}'.")
+    parser.add_argument("--jobs", type=int, default=1, help="Number of files to edit in parallel (worker processes). Each file's log is printed as one block,\nfollowed by a per-file summary. Default: 1 (sequential).")
+    parser.add_argument("--backup_mode", choices=["store", "copy"], default="store", help="'store' (default): capture each file before and after saving in its delta backup store,\nbackup/<name>.history (restore with saga_backup_store.py). 'copy': one copy per file per run\nin backup/<name>.backup_<timestamp>.json.")
+    parser.add_argument("--no_journal", action="store_true", help="Do not use the edit journal (backup/<name>.journal.jsonl): apply edits even if an earlier run of the same\nedits file (or an edit with the same 'edit_id') already committed them, and do not record this run.")
+    parser.add_argument("--chunk_size", type=int, default=0, help="Save (and journal) each file every N edits, so an interrupted run loses at most one chunk.\nDefault: 0 (one save per file).")
+    parser.add_argument("--no_discovery_cache", action="store_true", help="Infer every targeted file's structure from its contents; do not read or write the registry.")
     args = parser.parse_args()
     
     npc_profile_path_to_use = args.npc_profile_file if args.npc_profile_file else NPC_PROFILE_FILE_PATH
@@ -599,9 +884,98 @@ if __name__ == '__main__':
     
     populate_initial_config(npc_profile_path_to_use) 
     
-    main(args.edits_file, args.root_path, args.dry_run)
+    main(args.edits_file, args.root_path, args.dry_run, discovery_registry_path=None if args.no_discovery_cache else args.discovery_registry, jobs=args.jobs, backup_mode=args.backup_mode, use_journal=not args.no_journal, chunk_size=args.chunk_size)
 
 # --- SCRIPT VERSION LOG ---
+# Version 2.15.0 (2026-10-18):
+# - Edits without an `edit_id` are journaled under IDs derived from the edits file (its path,
+#   modification time and content, plus the edit's position and hash; see saga_edit_journal.py)
+#   instead of the run, so re-running an unchanged edits file skips its committed edits and an
+#   interrupted `--chunk_size` run resumes. The same edit in another edits file (or in the file
+#   written again) is still applied; use `edit_id` to deduplicate across files.
+# - The journal is compacted after a completed save, and only saves that contain journaled edits
+#   write journal entries. `--dry_run` opens the journal read-only.
+#
+# Version 2.14.3 (2026-10-18):
+# - `RecordLookupIndex.record_updated` moves the position entry of a record replaced by copy-on-write
+#   instead of invalidating the positions from there on, so lookups after an update stay O(1).
+# Version 2.14.2 (2026-10-18):
+# - `create_backup_file` (`--backup_mode copy`) copies again instead of hardlinking: the converters
+#   rewrite data files in place, which also rewrote a hardlinked backup.
+#
+# Version 2.14.1 (2026-10-18):
+# - The edit journal only skips edits with an explicit `edit_id` across runs. Edits without one get
+#   IDs scoped to this run, so applying an edit that an earlier run already applied (e.g. setting a
+#   value back) is no longer silently skipped. (Replaced by edits-file-scoped IDs in 2.15.0; in 2.14.1
+#   re-running an edits file without `edit_id`s was not idempotent.)
+#
+# Version 2.14.0 (2026-10-18):
+# - Split out of `process_target_edits`/`save_updated_json_file` so the updater daemon
+#   (saga_updater_daemon.py) can reuse them on files it keeps in memory: `create_empty_target_data`,
+#   `locate_edit_target`, `prepare_data_for_save` (reorder/sort without writing) and
+#   `save_with_backup_and_journal`. No behavior change for json_updater runs.
+#
+# Version 2.13.0 (2026-10-18):
+# - `save_updated_json_file` only reorders the records an edit batch modified or added
+#   (`reorder_and_sort_records`): untouched records (still the loaded objects, thanks to
+#   copy-on-write) are kept as they are if already in saved order, and changed records are
+#   bisect-inserted by sort_key. Falls back to the full rebuild + sort otherwise.
+#
+# Version 2.12.0 (2026-10-18):
+# - Write-ahead edit journal (saga_edit_journal.py, backup/<name>.journal.jsonl): each save records
+#   the IDs of the edits it contains before writing and commits them after. Edits already committed
+#   are skipped, so re-running the same edits file is idempotent and an interrupted run resumes where
+#   it stopped (edits are identified by `edit_id` if set, otherwise by the edits file and their
+#   position in it; 2.14.1 briefly limited this to `edit_id`s, 2.15.0 restored it).
+#   `--no_journal` disables it; `--chunk_size N` saves/commits every N edits per file.
+# - The post-save backup capture only uses the pre-save content as its delta base when that content
+#   is actually the store's latest version (not for newly created files).
+#
+# Version 2.11.0 (2026-10-18):
+# - Backups default to the delta backup store (`--backup_mode store`, see saga_backup_store.py):
+#   each saved file is captured before and after the save as a JSON diff against its previous
+#   version, with periodic snapshots, under backup/<name>.history. `--backup_mode copy` keeps the
+#   per-run backup/<name>.backup_<timestamp>.json hardlink/copy.
+# - `save_updated_json_file` returns the object it wrote (None on failure).
+#
+# Version 2.10.0 (2026-10-18):
+# - Saves are atomic: `write_json_file_atomically` writes a temp file in the same folder, fsyncs it
+#   and `os.replace`s it over the original (then fsyncs the folder on POSIX).
+# - Backups (`create_backup_file`) are hardlinks to the pre-save file instead of full copies; since
+#   saves replace the file instead of rewriting it, the linked inode is never modified. Falls back
+#   to `shutil.copy2` where hardlinks are unavailable.
+#
+# Version 2.9.0 (2026-10-18):
+# - 'update' patch lists are applied by `saga_json_patch.apply_patch` (shared by the list, object map
+#   and single-object branches): cached pointer parsing, `move`/`copy`/`test` ops, and atomic
+#   application - if any op fails, none are applied and the edit is reported as failed (previously
+#   the failing op was skipped and the rest applied).
+# - Dry runs now validate the patch against the data (applied then undone) instead of only printing it.
+#
+# Version 2.8.0 (2026-10-18):
+# - Added `--jobs N`: each physical file's edits run in a worker process (target keys sharing a
+#   file, like the NPC profile collections, stay in one worker). Each file's output is captured
+#   and printed as one block in batch order, followed by a per-file summary.
+# - The per-file load/apply/backup/save steps moved from `main` into `process_target_edits`.
+#
+# Version 2.7.0 (2026-10-18):
+# - Target-file discovery is now lazy: `main` loads the edits first and only configures the
+#   files the batch names (`target_file_keys`); other files under data/ are not opened.
+# - Inferred configs are cached in a registry (`--discovery_registry`, default
+#   compiled_output/json_updater_registry.json) keyed by path, mtime and size. Use
+#   `--no_discovery_cache` to bypass it. Inference moved to `_infer_target_file_config`.
+#
+# Version 2.6.0 (2026-10-18):
+# - Replaced the per-file `json.loads(json.dumps(...))` deep copy in `main` with copy-on-write:
+#   only the root/wrapper/collection containers are shallow-cloned, and `apply_edit` deep-copies
+#   a record (or top-level key of single-object content) via `CopyOnWriteBatch` the first time it
+#   is modified. The loaded original is never mutated; dry runs still modify nothing.
+#
+# Version 2.5.0 (2026-10-18):
+# - Added `RecordLookupIndex`: per-file hash index on 'id' and (id_field, secondary_id_field)
+#   used by `find_record_index_or_key`, so large edit batches no longer rescan the list for
+#   every edit. `apply_edit` keeps it in sync on add, delete and update (incl. id changes).
+#
 # Version 2.4.14 (2025-06-04):
 # - Corrected UnboundLocalError in `generate_dynamic_target_files_config` by ensuring
 #   `preferred_keys_for_list_records` is consistently named and used.
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: saga_backup_store.py
+Version: 1.0.0
+Date: 2026-10-18
+
+Purpose:
+Version history for the Star Wars Saga Edition data files, replacing the full
+`backup/<name>.backup_<timestamp>.json` copy that `json_updater.py` used to make
+on every run. Each version is stored as a JSON Patch (RFC 6902) against the
+previous version, with a full snapshot every few versions so a restore never
+has to replay a long chain. A one-record edit to talents.json costs a few
+hundred bytes instead of another 1.5 MB copy.
+
+Store Layout (`data/<category>/backup/<name>.history/`):
+    * `history.json`: format version, source file name, and the ordered list of
+        captured versions: timestamp, SHA-256 of the content, whether the
+        version's object is a snapshot or a delta, and its delta chain depth.
+    * `objects/<sha256>.json.gz`: one gzip'd object per distinct content,
+        named by the SHA-256 of its canonical (minified, key order kept) JSON:
+        * snapshot: {"kind": "snapshot", "content": <full file content>}
+        * delta: {"kind": "delta", "base": <sha256 of previous version>, "patch": [...]}
+    * A snapshot is written for the first version, after `SNAPSHOT_INTERVAL`
+        deltas in a row, or when a delta would be more than half the size of
+        a snapshot. A version whose content is already stored reuses its object.
+    * Deltas diff record lists by record (inserted/removed records are single
+        ops, not a shift of every later index). An object whose key order
+        changed is stored as a replace of that object, so a restore is
+        identical to the captured content, key order included.
+
+Instructions for Use:
+    * `json_updater.py` records the file before and after every save (see its
+        `--backup_mode`). To capture a file by hand:
+        `python saga_backup_store.py capture ../../data/character_elements/talents.json`
+    * List the captured versions of a file:
+        `python saga_backup_store.py list ../../data/character_elements/talents.json`
+    * Restore the file as it was at a point in time (the newest version captured
+        at or before it; a date alone means the end of that day). Restores are
+        written with json_updater's formatting (indent=2):
+        `python saga_backup_store.py restore ../../data/character_elements/talents.json --at 2026-10-18T10:41:39`
+        Add `--output other.json` to write the restored version elsewhere.
+    * Prune old versions (keeps every version newer than --keep_days plus the
+        last --keep_last versions; objects still needed by a kept version are kept):
+        `python saga_backup_store.py prune ../../data --keep_days 90 --keep_last 10`
+    * Move existing full-copy backups into the store (optionally deleting them):
+        `python saga_backup_store.py import_legacy ../../data --delete_legacy`
+
+Version Notes:
+* 1.0.0 (2026-10-18): Initial release. Delta/snapshot store, restore --at, retention and legacy import.
+"""
+
+import argparse
+import difflib
+import gzip
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timedelta
+
+from saga_json_patch import apply_patch, format_pointer
+
+BACKUP_STORE_FORMAT_VERSION = 1
+HISTORY_DIR_SUFFIX = ".history"
+MANIFEST_FILENAME = "history.json"
+SNAPSHOT_INTERVAL = 30 # Maximum deltas in a row, which bounds a restore to one snapshot plus this many patches
+SNAPSHOT_SIZE_RATIO = 0.5 # Store a snapshot instead when the delta is larger than this share of the content
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+LEGACY_BACKUP_PATTERN = re.compile(r"^(?P<base>.+)\.backup_(?P<stamp>\d{8}_\d{6})(?P<ext>\.json)$")
+
+class BackupStoreError(ValueError):
+    """Raised when a backup store is missing, corrupt, or has no version for the requested time."""
+
+def get_history_dir(file_path):
+    """Returns the history directory of a data file: backup/<name>.history next to it."""
+    file_dir, filename = os.path.split(os.path.abspath(file_path))
+    return os.path.join(file_dir, "backup", os.path.splitext(filename)[0] + HISTORY_DIR_SUFFIX)
+
+def canonical_json(content):
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"))
+
+def content_sha256(content):
+    return hashlib.sha256(canonical_json(content).encode("utf-8")).hexdigest()
+
+def parse_timestamp(text):
+    """Parses '2026-10-18T10:41:39', '2026-10-18 10:41', '20261018_104139' or a bare date (end of that day)."""
+    text = text.strip()
+    if re.fullmatch(r"\d{8}_\d{6}", text): return datetime.strptime(text, "%Y%m%d_%H%M%S")
+    try: parsed = datetime.fromisoformat(text)
+    except ValueError: raise BackupStoreError(f"Unrecognised timestamp '{text}'. Use e.g. 2026-10-18T10:41:39.") from None
+    if parsed.tzinfo is not None: parsed = parsed.astimezone().replace(tzinfo=None) # Versions are stored in local time
+    if re.fullmatch(r"\d{4}-\d{2}-\d{2}", text): parsed += timedelta(days=1, microseconds=-1)
+    return parsed
+
+# --- JSON diff ---
+def _item_keys(items):
+    return [canonical_json(item) for item in items]
+
+def _diff_dict(old, new, path, ops):
+    # Applying removes then adds keeps the surviving keys in their old order and appends new ones;
+    # if that is not the new order, the whole object is replaced so key order round-trips.
+    expected_order = [key for key in old if key in new] + [key for key in new if key not in old]
+    if expected_order != list(new):
+        ops.append({"op": "replace", "path": format_pointer(path), "value": new}); return
+    for key in old:
+        if key not in new: ops.append({"op": "remove", "path": format_pointer(path + (key,))})
+    for key in new:
+        if key in old: diff_json(old[key], new[key], path + (key,), ops)
+        else: ops.append({"op": "add", "path": format_pointer(path + (key,)), "value": new[key]})
+
+def _diff_list(old, new, path, ops):
+    # Ops are emitted in order, so when an opcode is reached the list already matches `new` up to j1.
+    matcher = difflib.SequenceMatcher(None, _item_keys(old), _item_keys(new), autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal": continue
+        paired = min(i2 - i1, j2 - j1)
+        for offset in range(paired): diff_json(old[i1 + offset], new[j1 + offset], path + (str(j1 + offset),), ops)
+        for _ in range(i2 - i1 - paired): ops.append({"op": "remove", "path": format_pointer(path + (str(j1 + paired),))})
+        for offset in range(paired, j2 - j1): ops.append({"op": "add", "path": format_pointer(path + (str(j1 + offset),)), "value": new[j1 + offset]})
+
+def diff_json(old, new, path=(), ops=None):
+    """Returns RFC 6902 operations that turn old into new (applied with saga_json_patch.apply_patch)."""
+    if ops is None: ops = []
+    if isinstance(old, dict) and isinstance(new, dict): _diff_dict(old, new, path, ops)
+    elif isinstance(old, list) and isinstance(new, list): _diff_list(old, new, path, ops)
+    elif type(old) is not type(new) or old != new: ops.append({"op": "replace", "path": format_pointer(path), "value": new})
+    return ops
+
+# --- Store ---
+def _atomic_write_bytes(output_file, payload):
+    temp_file = f"{output_file}.tmp"
+    try:
+        with open(temp_file, 'wb') as f: f.write(payload); f.flush(); os.fsync(f.fileno())
+        os.replace(temp_file, output_file)
+    finally:
+        if os.path.exists(temp_file): os.remove(temp_file)
+
+class BackupStore:
+    """Delta/snapshot version history of one data file (see module docstring for the layout)."""
+    def __init__(self, history_dir, source_name=None):
+        self.history_dir = history_dir
+        self.objects_dir = os.path.join(history_dir, "objects")
+        self.manifest_file = os.path.join(history_dir, MANIFEST_FILENAME)
+        self.manifest = {"format_version": BACKUP_STORE_FORMAT_VERSION, "source_file": source_name, "versions": []}
+        if os.path.exists(self.manifest_file):
+            try:
+                with open(self.manifest_file, 'r', encoding='utf-8') as f: self.manifest = json.load(f)
+            except (IOError, json.JSONDecodeError) as e: raise BackupStoreError(f"Cannot read {self.manifest_file}: {e}") from None
+            if self.manifest.get("format_version") != BACKUP_STORE_FORMAT_VERSION: raise BackupStoreError(f"{self.manifest_file} has unsupported format version {self.manifest.get('format_version')}.")
+        self._content_cache = {} # sha256 -> content of the versions reconstructed by this instance
+
+    @classmethod
+    def for_file(cls, file_path):
+        return cls(get_history_dir(file_path), os.path.basename(file_path))
+
+    @property
+    def versions(self):
+        return self.manifest["versions"]
+
+    def _object_path(self, sha256):
+        return os.path.join(self.objects_dir, f"{sha256}.json.gz")
+
+    def _read_object(self, sha256):
+        try:
+            with gzip.open(self._object_path(sha256), 'rt', encoding='utf-8') as f: return json.load(f)
+        except (IOError, OSError, json.JSONDecodeError) as e: raise BackupStoreError(f"Missing or corrupt object {sha256} in {self.history_dir}: {e}") from None
+
+    def _write_object(self, sha256, stored_object):
+        os.makedirs(self.objects_dir, exist_ok=True)
+        _atomic_write_bytes(self._object_path(sha256), gzip.compress(canonical_json(stored_object).encode("utf-8"), compresslevel=6, mtime=0))
+
+    def _save_manifest(self):
+        os.makedirs(self.history_dir, exist_ok=True)
+        _atomic_write_bytes(self.manifest_file, json.dumps(self.manifest, indent=2, ensure_ascii=False).encode("utf-8"))
+
+    def _chain_length(self, sha256):
+        # Number of deltas between this object and its snapshot (kept as 'depth' in the manifest).
+        for entry in self.versions:
+            if entry["sha256"] == sha256 and "depth" in entry: return entry["depth"]
+        length = 0
+        while True:
+            stored_object = self._read_object(sha256)
+            if stored_object["kind"] == "snapshot": return length
+            sha256 = stored_object["base"]; length += 1
+
+    def load_version(self, sha256):
+        """Returns the content of a stored version (a snapshot plus the deltas after it)."""
+        if sha256 in self._content_cache: return json.loads(self._content_cache[sha256])
+        chain = []
+        while True:
+            stored_object = self._read_object(sha256)
+            if stored_object["kind"] == "snapshot": content = stored_object["content"]; break
+            chain.append(stored_object["patch"]); sha256 = stored_object["base"]
+        for patch in reversed(chain): content = apply_patch(content, patch)
+        return content
+
+    def record(self, content, timestamp=None, previous_content=None):
+        """
+        Captures content as a new version unless it equals the latest one.
+
+        Args:
+            content: The file content (parsed JSON) to capture.
+            timestamp (datetime): Capture time (default: now).
+            previous_content: The content of the latest version, if the caller already has it
+                in memory; saves reconstructing it from the store to compute the delta.
+
+        Returns:
+            str: 'snapshot', 'delta', 'existing' (content already stored under another version)
+                 or None if content equals the latest version (nothing recorded).
+        """
+        content_text = canonical_json(content)
+        sha256 = hashlib.sha256(content_text.encode("utf-8")).hexdigest()
+        latest = self.versions[-1] if self.versions else None
+        if latest and latest["sha256"] == sha256: return None
+
+        if os.path.exists(self._object_path(sha256)): kind = "existing"; depth = self._chain_length(sha256)
+        else:
+            kind = "snapshot"; depth = 0
+            latest_depth = self._chain_length(latest["sha256"]) if latest else None
+            if latest and latest_depth + 1 <= SNAPSHOT_INTERVAL:
+                base_content = previous_content if previous_content is not None else self.load_version(latest["sha256"])
+                patch = diff_json(base_content, content)
+                if len(canonical_json(patch)) <= SNAPSHOT_SIZE_RATIO * len(content_text):
+                    self._write_object(sha256, {"kind": "delta", "base": latest["sha256"], "patch": patch}); kind = "delta"; depth = latest_depth + 1
+            if kind == "snapshot": self._write_object(sha256, {"kind": "snapshot", "content": content})
+        self.versions.append({"timestamp": (timestamp or datetime.now()).strftime(TIMESTAMP_FORMAT), "sha256": sha256, "kind": kind, "depth": depth})
+        self._save_manifest()
+        self._content_cache = {sha256: content_text}
+        return kind
+
+    def version_at(self, when):
+        """Returns the newest version entry captured at or before when (a datetime)."""
+        candidates = [entry for entry in self.versions if datetime.strptime(entry["timestamp"], TIMESTAMP_FORMAT) <= when]
+        if not candidates: raise BackupStoreError(f"No version of {self.manifest.get('source_file')} captured at or before {when.strftime(TIMESTAMP_FORMAT)}.")
+        return candidates[-1]
+
+    def prune(self, keep_days=90, keep_last=10, now=None):
+        """
+        Drops versions older than keep_days, always keeping the newest keep_last versions, and
+        deletes objects no kept version needs (including the snapshot/delta chain behind it).
+
+        Returns:
+            tuple: (removed_version_count, removed_object_count)
+        """
+        cutoff = (now or datetime.now()) - timedelta(days=keep_days)
+        kept = [entry for position, entry in enumerate(self.versions)
+                if position >= len(self.versions) - keep_last or datetime.strptime(entry["timestamp"], TIMESTAMP_FORMAT) >= cutoff]
+        removed_versions = len(self.versions) - len(kept)
+        needed = set()
+        for entry in kept:
+            sha256 = entry["sha256"]
+            while sha256 not in needed:
+                needed.add(sha256)
+                stored_object = self._read_object(sha256)
+                if stored_object["kind"] == "snapshot": break
+                sha256 = stored_object["base"]
+        removed_objects = 0
+        if os.path.isdir(self.objects_dir):
+            for filename in os.listdir(self.objects_dir):
+                if filename.endswith(".json.gz") and filename[:-len(".json.gz")] not in needed:
+                    os.remove(os.path.join(self.objects_dir, filename)); removed_objects += 1
+        if removed_versions or removed_objects:
+            self.manifest["versions"] = kept; self._save_manifest()
+        return removed_versions, removed_objects
+
+    def disk_usage(self):
+        total = os.path.getsize(self.manifest_file) if os.path.exists(self.manifest_file) else 0
+        if os.path.isdir(self.objects_dir): total += sum(os.path.getsize(os.path.join(self.objects_dir, name)) for name in os.listdir(self.objects_dir))
+        return total
+
+def record_file_version(file_path, content=None, timestamp=None, previous_content=None):
+    """Captures a data file (its parsed content, or read from disk) into its backup store. Returns record()'s result."""
+    if content is None:
+        with open(file_path, 'r', encoding='utf-8') as f: content = json.load(f)
+    return BackupStore.for_file(file_path).record(content, timestamp=timestamp, previous_content=previous_content)
+
+def restore_file(file_path, when, output_path=None):
+    """Writes the version of file_path captured at or before when to output_path (default: file_path). Returns the version entry."""
+    from json_updater import write_json_file_atomically # Imported here: json_updater imports this module
+    store = BackupStore.for_file(file_path)
+    entry = store.version_at(when)
+    write_json_file_atomically(store.load_version(entry["sha256"]), output_path or file_path)
+    return entry
+
+def _find_history_dirs(path):
+    # A data file -> its history dir; a folder -> every history dir below it.
+    if os.path.isfile(path): return [get_history_dir(path)]
+    found = []
+    for root, dirs, _ in os.walk(path):
+        found.extend(os.path.join(root, d) for d in dirs if d.endswith(HISTORY_DIR_SUFFIX))
+        dirs[:] = [d for d in dirs if not d.endswith(HISTORY_DIR_SUFFIX)]
+    return sorted(found)
+
+def import_legacy_backups(path, delete_legacy=False):
+    """
+    Captures every backup/<name>.backup_<YYYYmmdd_HHMMSS>.json below path into <name>'s store, oldest
+    first, at the backup's timestamp. Must run before new versions are captured for that file, since
+    versions are appended in the order they are recorded. Returns the number of files imported.
+    """
+    imported = 0
+    for root, dirs, files in os.walk(path):
+        if os.path.basename(root).lower() != "backup": continue
+        dirs[:] = []
+        legacy_files = sorted((match.group("stamp"), match.group("base"), filename) for filename in files for match in [LEGACY_BACKUP_PATTERN.match(filename)] if match)
+        stores = {}; previous = {}
+        for stamp, base, filename in legacy_files:
+            legacy_path = os.path.join(root, filename)
+            try:
+                with open(legacy_path, 'r', encoding='utf-8') as f: content = json.load(f)
+            except (IOError, json.JSONDecodeError) as e: print(f"Skipping {legacy_path}: {e}"); continue
+            store = stores.setdefault(base, BackupStore(os.path.join(root, base + HISTORY_DIR_SUFFIX), base + ".json"))
+            store.record(content, timestamp=datetime.strptime(stamp, "%Y%m%d_%H%M%S"), previous_content=previous.get(base))
+            previous[base] = content; imported += 1
+            if delete_legacy: os.remove(legacy_path)
+            print(f"Imported {legacy_path}")
+    return imported
+
+if __name__ == "__main__":
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Delta-based version history for SAGA data files. See script header for details.", formatter_class=argparse.RawTextHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    capture_parser = subparsers.add_parser("capture", help="Capture the current content of a data file.")
+    capture_parser.add_argument("file", help="Data file, e.g. data/character_elements/talents.json.")
+    list_parser = subparsers.add_parser("list", help="List the captured versions of a data file.")
+    list_parser.add_argument("file", help="Data file, e.g. data/character_elements/talents.json.")
+    restore_parser = subparsers.add_parser("restore", help="Restore a data file as it was at a point in time.")
+    restore_parser.add_argument("file", help="Data file, e.g. data/character_elements/talents.json.")
+    restore_parser.add_argument("--at", required=True, help="Point in time, e.g. 2026-10-18T10:41:39, 2026-10-18 (end of day) or 20261018_104139.")
+    restore_parser.add_argument("--output", default=None, help="Write the restored version here instead of over the data file.")
+    prune_parser = subparsers.add_parser("prune", help="Apply the retention policy to one data file or every store below a folder.")
+    prune_parser.add_argument("path", nargs="?", default=os.path.join(script_dir, '..', '..', 'data'), help="Data file or folder (default: ../../data).")
+    prune_parser.add_argument("--keep_days", type=int, default=90, help="Keep every version newer than this many days (default: 90).")
+    prune_parser.add_argument("--keep_last", type=int, default=10, help="Always keep this many newest versions (default: 10).")
+    import_parser = subparsers.add_parser("import_legacy", help="Move backup/<name>.backup_<timestamp>.json copies into the stores.")
+    import_parser.add_argument("path", nargs="?", default=os.path.join(script_dir, '..', '..', 'data'), help="Folder to search (default: ../../data).")
+    import_parser.add_argument("--delete_legacy", action="store_true", help="Delete each legacy copy once it is imported.")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "capture":
+            result = record_file_version(args.file)
+            print(f"Captured {args.file} as a {result}." if result else f"{args.file} is unchanged since its latest version.")
+        elif args.command == "list":
+            store = BackupStore.for_file(args.file)
+            for entry in store.versions: print(f"{entry['timestamp']}  {entry['kind']:<8}  {entry['sha256'][:12]}")
+            print(f"{len(store.versions)} version(s), {store.disk_usage():,} bytes in {store.history_dir}")
+        elif args.command == "restore":
+            entry = restore_file(args.file, parse_timestamp(args.at), args.output)
+            print(f"Restored the version captured at {entry['timestamp']} ({entry['sha256'][:12]}) to {args.output or args.file}")
+        elif args.command == "prune":
+            for history_dir in _find_history_dirs(args.path):
+                removed_versions, removed_objects = BackupStore(history_dir).prune(keep_days=args.keep_days, keep_last=args.keep_last)
+                print(f"{history_dir}: removed {removed_versions} version(s), {removed_objects} object(s).")
+        else:
+            print(f"Imported {import_legacy_backups(args.path, delete_legacy=args.delete_legacy)} legacy backup(s).")
+    except (BackupStoreError, IOError, json.JSONDecodeError) as e:
+        print(f"Error: {e}"); exit(1)
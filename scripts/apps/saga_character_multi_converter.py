@@ -1,8 +1,13 @@
+import concurrent.futures
 import json
 import csv
+import hashlib
+import inspect
 import io
 import re
 import os
+import time
+from collections import OrderedDict
 
 # --- 1. CONFIGURATION ---
 LOCAL_ROOT_PATH = r'D:\OneDrive\Documents\GitHub\SagaIndex'
@@ -51,6 +56,17 @@ PROCESS_CONFIG = {
     "prestige_classes": False,
     "droids": True,  # Added new entry for droids, set to True for processing
 }
+PRINT_EFFECT_RULE_STATS = True # Per-rule hit counts and match time of parse_effects_from_text, printed after the run
+# parse_prerequisites_from_text() results are cached (LRU) and the cache is kept between runs in this file (None: memory only)
+PREREQUISITE_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "compiled_output", "prerequisite_parse_cache.json")
+PREREQUISITE_CACHE_SIZE = 4096
+# Feats and talents: build records in this many worker processes (chunks of ROW_CHUNK_SIZE rows, output order unchanged); 1 = in this process
+ROW_PROCESS_JOBS = 1
+ROW_CHUNK_SIZE = 100
+# Feats and talents: only rows that are new or changed since the last run are parsed; the records of the other rows are
+# reused from the sidecar data/<category>/backup/<name>.rows.json next to the output. False: always rebuild every row.
+INCREMENTAL_ROW_CONVERSION = True
+ROW_FINGERPRINT_VERSION = 1 # Bump to rebuild every row once (the converter source below the configuration is part of the fingerprint anyway)
 
 # --- Placeholder for pasting CSV data directly (alternative to file paths) ---
 """
@@ -107,8 +123,7 @@ def get_prerequisite_text_from_row_list(row_list, indices_map, column_options):
     return ", ".join(prereq_texts) if prereq_texts else "None"
 
 
-def parse_prerequisites_from_text(text):
-    if not text or text.strip().lower() == 'none': return []
+def _parse_prerequisites_uncached(text):
     prereqs = []; normalized_text = re.sub(r'\s*;\s*|\s+and\s+', ', ', text, flags=re.IGNORECASE)
     parts = [p.strip() for p in normalized_text.split(',') if p.strip()]
     for part in parts:
@@ -148,81 +163,196 @@ def parse_prerequisites_from_text(text):
         obj["type"] = "other"; prereqs.append(obj)
     return prereqs
 
-def parse_effects_from_text(description, context_skill=None, is_recursive_call=False):
+# --- Prerequisite parse cache (used by parse_prerequisites_from_text) ---
+# The same prerequisite strings recur across feats, talents, techniques, secrets, regimens and
+# prestige classes, so parsed results are shared: they are tuples of FrozenPrerequisite dicts
+# (serialized by json exactly like lists of dicts). Copy one (`dict(p)`) before modifying it.
+PREREQUISITE_PARSER_VERSION = 1 # Bump to drop cached results; edits to _parse_prerequisites_uncached also drop them
+
+class FrozenPrerequisite(dict):
+    def _read_only(self, *args, **kwargs): raise TypeError("parsed prerequisites are shared by every record with the same text; copy with dict() before modifying")
+    __setitem__ = __delitem__ = update = pop = popitem = clear = setdefault = __ior__ = _read_only
+    def __reduce__(self): return (FrozenPrerequisite, (dict(self),)) # Pickle/copy without going through __setitem__
+
+class PrerequisiteParseCache:
+    """Bounded LRU of parse results keyed by prerequisite text, persisted as JSON and tagged with the parser version."""
+    def __init__(self, max_entries=PREREQUISITE_CACHE_SIZE, cache_path=None):
+        self.max_entries = max_entries; self.cache_path = cache_path
+        self.entries = OrderedDict(); self.parser_version = self.current_parser_version()
+        self.hits = 0; self.misses = 0; self.evictions = 0; self.loaded_entries = 0; self.loaded = False
+        self.parsed_texts = [] # Texts parsed (missed) in this process, in order; see build_records()
+
+    @staticmethod
+    def current_parser_version():
+        try: parser_source = inspect.getsource(_parse_prerequisites_uncached)
+        except (OSError, TypeError): parser_source = ""
+        return f"{PREREQUISITE_PARSER_VERSION}:{hashlib.sha256(parser_source.encode('utf-8')).hexdigest()[:16]}"
+
+    def _load(self):
+        self.loaded = True
+        if not self.cache_path or not os.path.exists(self.cache_path): return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f: cache_file = json.load(f)
+        except (IOError, OSError, json.JSONDecodeError) as e: print(f"Warning: Could not read prerequisite cache {self.cache_path}: {e}. Starting empty."); return
+        if not isinstance(cache_file, dict) or cache_file.get("parser_version") != self.parser_version: print("Prerequisite cache was written by another parser version; starting empty."); return
+        for text, prereqs in cache_file.get("entries", [])[-self.max_entries:]: self.entries[text] = tuple(FrozenPrerequisite(p) for p in prereqs)
+        self.loaded_entries = len(self.entries)
+
+    def get(self, text):
+        if not self.loaded: self._load()
+        result = self.entries.get(text)
+        if result is not None: self.entries.move_to_end(text); self.hits += 1; return result
+        self.misses += 1; self.parsed_texts.append(text)
+        return self.add(text, tuple(FrozenPrerequisite(p) for p in _parse_prerequisites_uncached(text)))
+
+    def add(self, text, result):
+        self.entries[text] = result; self.entries.move_to_end(text)
+        if len(self.entries) > self.max_entries: self.entries.popitem(last=False); self.evictions += 1
+        return result
+
+    def save(self):
+        """Writes the entries (least recently used first) to cache_path, if set and anything was looked up."""
+        if not self.cache_path or not (self.hits or self.misses): return
+        try:
+            cache_dir = os.path.dirname(self.cache_path)
+            if cache_dir: os.makedirs(cache_dir, exist_ok=True)
+            temp_path = self.cache_path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f: json.dump({"parser_version": self.parser_version, "entries": [[text, result] for text, result in self.entries.items()]}, f, ensure_ascii=False)
+            os.replace(temp_path, self.cache_path)
+        except (IOError, OSError) as e: print(f"Warning: Could not write prerequisite cache {self.cache_path}: {e}")
+
+    def print_stats(self):
+        lookups = self.hits + self.misses
+        print(f"Prerequisite cache: {lookups} lookup(s), {self.hits} hit(s) ({self.hits / lookups:.1%}), {self.misses} parsed, {self.evictions} evicted; "
+              f"{self.loaded_entries} entr{'y' if self.loaded_entries == 1 else 'ies'} loaded from disk, {len(self.entries)} now cached." if lookups else "Prerequisite cache: not used.")
+
+PREREQUISITE_CACHE = PrerequisiteParseCache(cache_path=PREREQUISITE_CACHE_PATH)
+
+def parse_prerequisites_from_text(text):
+    """Returns the structured prerequisites in text, as a shared read-only tuple (see FrozenPrerequisite)."""
+    if not text or text.strip().lower() == 'none': return ()
+    # Keyed on the exact text: separators are whitespace-sensitive ("X and Y" vs "X andY"), and the
+    # text_description of each part keeps its inner spacing, so no normalization is result-preserving.
+    return PREREQUISITE_CACHE.get(text)
+
+# --- Effect extraction rules (used by parse_effects_from_text) ---
+# Each rule is compiled once at import. `required_any` lists literals the pattern cannot match
+# without (checked against the lowercased text), so most rules are skipped with a substring test
+# instead of a regex scan. EFFECT_RULE_STATS counts, per rule, the texts seen, the texts skipped by
+# that test, the effects produced and the time spent matching; see print_effect_rule_stats().
+EFFECT_RULE_STATS = {}
+
+class EffectRule:
+    def __init__(self, name, pattern, build_effects=None, required_any=(), flags=0, match_original_text=False, find_all=False):
+        self.name = name; self.pattern = re.compile(pattern, flags); self.build_effects = build_effects
+        self.required_any = required_any; self.match_original_text = match_original_text; self.find_all = find_all
+        self.stats = EFFECT_RULE_STATS.setdefault(name, {"texts": 0, "skipped": 0, "hits": 0, "seconds": 0.0})
+
+    def matches(self, description, desc_lower):
+        """Returns the rule's matches in the text (all of them if find_all, else at most one)."""
+        self.stats["texts"] += 1
+        if self.required_any and not any(literal in desc_lower for literal in self.required_any): self.stats["skipped"] += 1; return []
+        text = description if self.match_original_text else desc_lower; started = time.perf_counter()
+        if self.find_all: found = list(self.pattern.finditer(text))
+        else: found = self.pattern.search(text); found = [found] if found else []
+        self.stats["seconds"] += time.perf_counter() - started
+        return found
+
+    def apply(self, description, desc_lower):
+        effects = [effect for match in self.matches(description, desc_lower) for effect in self.build_effects(match)]
+        self.stats["hits"] += len(effects)
+        return effects
+
+def _bonus_penalty_effects(match):
+    action = match.group(1).strip(); value_str = match.group(2).strip()
+    specific_type_keywords = match.group(3).strip() if match.group(3) else ""
+    general_indicator = match.group(4).strip() if match.group(4) else ""
+    target_str = match.group(5).strip(); effect_type = "generic_modifier"; numeric_value = None
+    word_to_num = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5}
+    if value_str.isdigit() or (value_str.startswith(('+','-')) and value_str[1:].isdigit()): numeric_value = int(value_str)
+    elif value_str in word_to_num: numeric_value = word_to_num[value_str]
+    if "penalty" in general_indicator or (numeric_value is not None and numeric_value < 0) or value_str.startswith('-'): effect_type = "penalty"
+    elif "bonus" in general_indicator or (numeric_value is not None and numeric_value > 0) or value_str.startswith('+'): effect_type = "bonus"
+    elif "damage" in general_indicator or "damage" in target_str: effect_type = "damage_modifier"
+    elif "speed" in target_str: effect_type = "speed_modifier"
+    elif "condition track" in target_str or "persistent step" in general_indicator: effect_type = "condition_track_change"
+    bonus_or_penalty_category = specific_type_keywords if specific_type_keywords else "untyped"
+    if bonus_or_penalty_category == "untyped" and general_indicator and general_indicator not in ["bonus", "penalty"]: bonus_or_penalty_category = general_indicator
+    return [{"type": effect_type, "action_verb": action, "value_description": value_str, "numeric_value_approx": numeric_value, "bonus_or_penalty_type": bonus_or_penalty_category, "target_description": target_str}]
+
+def _feat_grant_effects(match):
+    feat_name = match.group(1).strip()
+    if "skill focus" in feat_name and "(" in feat_name and ")" in feat_name:
+        actual_feat = feat_name[feat_name.find("(")+1:feat_name.find(")")]; return [{"type": "feat_grant", "feat_name": f"Skill Focus ({actual_feat.title()})"}]
+    return [{"type": "feat_grant", "feat_name": feat_name.title()}]
+
+def _reroll_effects(match):
+    check_type = match.group(1).strip(); condition = match.group(2).strip() if match.group(2) else "unspecified"
+    if "must accept" in condition or "must take" in condition: condition = "must take result"
+    elif "keeping" in condition or "better result" in condition : condition = "keep better/specified result"
+    return [{"type": "reroll", "check_type": check_type, "condition": condition}]
+
+def _class_skill_effects(match):
+    skills_text = match.group(1).replace("and", ",").strip()
+    return [{"type": "class_skill", "skill": skill.strip().title()} for skill in skills_text.split(',') if skill.strip() and len(skill.strip()) > 2]
+
+DC_TIER_RULE = EffectRule("dc_tiers", r"DC\s*(\d+)\s*:\s*([\s\S]+?)(?=(?:\n\s*DC\s*\d+\s*:)|\Z)", required_any=("dc",), flags=re.IGNORECASE | re.MULTILINE, match_original_text=True, find_all=True)
+EFFECT_RULES = ( # Evaluated in this order; the effects keep it
+    EffectRule("bonus_penalty",
+               r"(gain(?:s)?|grants?|adds?|provides?|receives?|suffer(?:s)?|takes?|imposes?|reduces?|increases?)"
+               r"\s*(?:a|an)?\s*"
+               r"([+-]?\d+|one|two|three|four|five|half your level|character level|level|STR modifier|DEX modifier|CON modifier|INT modifier|WIS modifier|CHA modifier|Strength modifier|Dexterity modifier|Constitution modifier|Intelligence modifier|Wisdom modifier|Charisma modifier)"
+               r"\s*"
+               r"((?:point|step|die|persistent step|natural armor|species|armor|shield|equipment|circumstance|feat|inherent|insight|morale|size|dodge|racial|untyped))?"
+               r"\s*"
+               r"((?:bonus|penalty|points of damage|persistent step))?"
+               r"\s*(?:on|to|against|from|of|in|with|for|by)\s*"
+               r"([\w\s\(\)\-\,\/\%]+?)"
+               r"(?:\s*(?:checks|defense|attacks|damage|rolls|speed|track|DC|modifier|penalty|threshold|damage threshold|duration)|$)",
+               _bonus_penalty_effects, required_any=("gain", "grant", "add", "provide", "receive", "suffer", "take", "impose", "reduce", "increase"), find_all=True),
+    EffectRule("feat_grant", r"gain(?:s)? ([\w\s\(\)]+?) as a bonus feat", _feat_grant_effects, required_any=("as a bonus feat",)),
+    EffectRule("damage_reduction", r"(?:DR|damage reduction)\s*(\d+)", lambda match: [{"type": "damage_reduction", "value": int(match.group(1))}], required_any=("dr", "damage"), flags=re.IGNORECASE, match_original_text=True),
+    EffectRule("natural_weapon", r"(claws?|teeth|bite|horns?|tail|tentacles?)(?:.*?dealing)?\s*(\d+d\d+)\s*(\w+)?\s*(?:damage)?",
+               lambda match: [{"type": "natural_weapon", "weapon_name": match.group(1).strip(), "damage_dice": match.group(2).strip(), "damage_type": match.group(3).strip() if match.group(3) else "unspecified"}],
+               required_any=("claw", "teeth", "bite", "horn", "tail", "tentacle")),
+    EffectRule("reroll", r"reroll (?:any |one |a )?([\w\s]+?)(?: check)?(?:, (keeping|but must accept|but must take|and take the better result|keeping the better result))?", _reroll_effects, required_any=("reroll ",)),
+    EffectRule("class_skill", r"([\w\s\(\),]+?)\s*(?:is|are)\s*(?:always considered a |a )?class skill", _class_skill_effects, required_any=("class skill",), find_all=True),
+    EffectRule("special_action", r"(once per encounter|once per day|at will)?\s*(?:as a|as an)?\s*(swift|standard|full-round|move|free|reaction)\s*(?:action)?",
+               lambda match: [{"type": "special_action", "frequency": match.group(1).strip() if match.group(1) else "at will (unless specified otherwise)", "action_cost": match.group(2).strip()}],
+               required_any=("swift", "standard", "full-round", "move", "free", "reaction")),
+    EffectRule("immunity", r"immune to ([\w\s]+?)(?: effects)?(?:and|or|,|\.|$)", lambda match: [{"type": "immunity", "immune_to": match.group(1).strip()}], required_any=("immune to ",), find_all=True),
+)
+
+def _parse_effects_without_tiers(description, desc_lower):
+    if not description: return [{"type": "narrative_only", "summary": "No description provided."}]
     effects = []
+    for rule in EFFECT_RULES: effects.extend(rule.apply(description, desc_lower))
+    if not effects: effects.append({"type": "narrative_only", "summary": "Mechanics are described textually in the description."})
+    return effects
+
+def parse_effects_from_text(description, context_skill=None, is_recursive_call=False):
     if not description: return [{"type": "narrative_only", "summary": "No description provided."}]
-    if not is_recursive_call:
-        dc_tier_pattern = re.compile(r"DC\s*(\d+)\s*:\s*([\s\S]+?)(?=(?:\n\s*DC\s*\d+\s*:)|\Z)", re.IGNORECASE | re.MULTILINE)
-        dc_matches = list(dc_tier_pattern.finditer(description))
-        if len(dc_matches) >= 1:
-            tiers = []
-            for match in dc_matches:
-                dc_value = int(match.group(1)); tier_description_full = match.group(2).strip()
-                tier_description_cleaned = mtr_explanations(tier_description_full)
-                tier_structured_effects = parse_effects_from_text(tier_description_cleaned, context_skill=None, is_recursive_call=True)
-                if len(tier_structured_effects) > 1 and tier_structured_effects[0].get("type") == "narrative_only": tier_structured_effects.pop(0)
-                elif not tier_structured_effects and tier_description_cleaned: tier_structured_effects = [{"type": "narrative_only", "summary": tier_description_cleaned}]
-                tiers.append({"dc": dc_value, "description": tier_description_cleaned, "structured_effects": tier_structured_effects})
-            if tiers:
-                progression_rule = "cumulative_up_to_achieved_dc"
-                if "only the highest" in description.lower() or "instead of the normal effect" in description.lower(): progression_rule = "highest_achieved_only"
-                effects.append({"type": "dc_progression", "check_skill_or_ability": context_skill or "Contextual Skill/Ability Check", "progression_rule": progression_rule, "tiers": sorted(tiers, key=lambda x: x['dc']), "full_progression_text": mtr_explanations(description)})
-                return effects
     desc_lower = description.lower()
-    bonus_penalty_regex = r"(gain(?:s)?|grants?|adds?|provides?|receives?|suffer(?:s)?|takes?|imposes?|reduces?|increases?)" \
-                          r"\s*(?:a|an)?\s*" \
-                          r"([+-]?\d+|one|two|three|four|five|half your level|character level|level|STR modifier|DEX modifier|CON modifier|INT modifier|WIS modifier|CHA modifier|Strength modifier|Dexterity modifier|Constitution modifier|Intelligence modifier|Wisdom modifier|Charisma modifier)" \
-                          r"\s*" \
-                          r"((?:point|step|die|persistent step|natural armor|species|armor|shield|equipment|circumstance|feat|inherent|insight|morale|size|dodge|racial|untyped))?" \
-                          r"\s*" \
-                          r"((?:bonus|penalty|points of damage|persistent step))?" \
-                          r"\s*(?:on|to|against|from|of|in|with|for|by)\s*" \
-                          r"([\w\s\(\)\-\,\/\%]+?)" \
-                          r"(?:\s*(?:checks|defense|attacks|damage|rolls|speed|track|DC|modifier|penalty|threshold|damage threshold|duration)|$)"
-    for match in re.finditer(bonus_penalty_regex, desc_lower):
-        action = match.group(1).strip(); value_str = match.group(2).strip()
-        specific_type_keywords = match.group(3).strip() if match.group(3) else ""
-        general_indicator = match.group(4).strip() if match.group(4) else ""
-        target_str = match.group(5).strip(); effect_type = "generic_modifier"; numeric_value = None
-        word_to_num = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5}
-        if value_str.isdigit() or (value_str.startswith(('+','-')) and value_str[1:].isdigit()): numeric_value = int(value_str)
-        elif value_str in word_to_num: numeric_value = word_to_num[value_str]
-        if "penalty" in general_indicator or (numeric_value is not None and numeric_value < 0) or value_str.startswith('-'): effect_type = "penalty"
-        elif "bonus" in general_indicator or (numeric_value is not None and numeric_value > 0) or value_str.startswith('+'): effect_type = "bonus"
-        elif "damage" in general_indicator or "damage" in target_str: effect_type = "damage_modifier"
-        elif "speed" in target_str: effect_type = "speed_modifier"
-        elif "condition track" in target_str or "persistent step" in general_indicator: effect_type = "condition_track_change"
-        bonus_or_penalty_category = specific_type_keywords if specific_type_keywords else "untyped"
-        if bonus_or_penalty_category == "untyped" and general_indicator and general_indicator not in ["bonus", "penalty"]: bonus_or_penalty_category = general_indicator
-        effects.append({"type": effect_type, "action_verb": action, "value_description": value_str, "numeric_value_approx": numeric_value, "bonus_or_penalty_type": bonus_or_penalty_category, "target_description": target_str})
-    feat_grant_match = re.search(r"gain(?:s)? ([\w\s\(\)]+?) as a bonus feat", desc_lower)
-    if feat_grant_match:
-        feat_name = feat_grant_match.group(1).strip()
-        if "skill focus" in feat_name and "(" in feat_name and ")" in feat_name:
-             actual_feat = feat_name[feat_name.find("(")+1:feat_name.find(")")]; effects.append({"type": "feat_grant", "feat_name": f"Skill Focus ({actual_feat.title()})"})
-        else: effects.append({"type": "feat_grant", "feat_name": feat_name.title()})
-    dr_match = re.search(r"(?:DR|damage reduction)\s*(\d+)", description, re.IGNORECASE);
-    if dr_match: effects.append({"type": "damage_reduction", "value": int(dr_match.group(1))})
-    natural_weapon_match = re.search(r"(claws?|teeth|bite|horns?|tail|tentacles?)(?:.*?dealing)?\s*(\d+d\d+)\s*(\w+)?\s*(?:damage)?", desc_lower)
-    if natural_weapon_match: effects.append({"type": "natural_weapon", "weapon_name": natural_weapon_match.group(1).strip(), "damage_dice": natural_weapon_match.group(2).strip(), "damage_type": natural_weapon_match.group(3).strip() if natural_weapon_match.group(3) else "unspecified"})
-    reroll_match = re.search(r"reroll (?:any |one |a )?([\w\s]+?)(?: check)?(?:, (keeping|but must accept|but must take|and take the better result|keeping the better result))?", desc_lower)
-    if reroll_match:
-        check_type = reroll_match.group(1).strip(); condition = reroll_match.group(2).strip() if reroll_match.group(2) else "unspecified"
-        if "must accept" in condition or "must take" in condition: condition = "must take result"
-        elif "keeping" in condition or "better result" in condition : condition = "keep better/specified result"
-        effects.append({"type": "reroll", "check_type": check_type, "condition": condition})
-    class_skill_match = re.findall(r"([\w\s\(\),]+?)\s*(?:is|are)\s*(?:always considered a |a )?class skill", desc_lower)
-    for skill_match_group in class_skill_match:
-        skills_text = skill_match_group.replace("and", ",").strip()
-        skills = [s.strip() for s in skills_text.split(',') if s.strip() and len(s.strip()) > 2]
-        for skill in skills: effects.append({"type": "class_skill", "skill": skill.title()})
-    action_match = re.search(r"(once per encounter|once per day|at will)?\s*(?:as a|as an)?\s*(swift|standard|full-round|move|free|reaction)\s*(?:action)?", desc_lower)
-    if action_match: effects.append({"type": "special_action", "frequency": action_match.group(1).strip() if action_match.group(1) else "at will (unless specified otherwise)", "action_cost": action_match.group(2).strip()})
-    immunity_match = re.findall(r"immune to ([\w\s]+?)(?: effects)?(?:and|or|,|\.|$)", desc_lower)
-    for immune_item in immunity_match: effects.append({"type": "immunity", "immune_to": immune_item.strip()})
-    if not effects and description: effects.append({"type": "narrative_only", "summary": "Mechanics are described textually in the description."})
-    elif not effects and not description: effects.append({"type": "narrative_only", "summary": "No description provided."})
-    return effects
+    if is_recursive_call: return _parse_effects_without_tiers(description, desc_lower)
+    dc_matches = DC_TIER_RULE.matches(description, desc_lower)
+    if not dc_matches: return _parse_effects_without_tiers(description, desc_lower)
+    tiers = []
+    for match in dc_matches:
+        dc_value = int(match.group(1)); tier_description_cleaned = mtr_explanations(match.group(2).strip())
+        tier_structured_effects = _parse_effects_without_tiers(tier_description_cleaned, tier_description_cleaned.lower())
+        if len(tier_structured_effects) > 1 and tier_structured_effects[0].get("type") == "narrative_only": tier_structured_effects.pop(0)
+        tiers.append({"dc": dc_value, "description": tier_description_cleaned, "structured_effects": tier_structured_effects})
+    DC_TIER_RULE.stats["hits"] += len(tiers)
+    progression_rule = "cumulative_up_to_achieved_dc"
+    if "only the highest" in desc_lower or "instead of the normal effect" in desc_lower: progression_rule = "highest_achieved_only"
+    return [{"type": "dc_progression", "check_skill_or_ability": context_skill or "Contextual Skill/Ability Check", "progression_rule": progression_rule, "tiers": sorted(tiers, key=lambda x: x['dc']), "full_progression_text": mtr_explanations(description)}]
+
+def print_effect_rule_stats():
+    """Prints EFFECT_RULE_STATS, most expensive rule first."""
+    print("Effect rule statistics (parse_effects_from_text):")
+    print(f"  {'Rule':<18} {'Texts':>7} {'Skipped':>8} {'Effects':>8} {'Time (ms)':>10}")
+    for rule_name, stats in sorted(EFFECT_RULE_STATS.items(), key=lambda item: item[1]["seconds"], reverse=True):
+        print(f"  {rule_name:<18} {stats['texts']:>7} {stats['skipped']:>8} {stats['hits']:>8} {stats['seconds'] * 1000:>10.1f}")
 
 def parse_action_type(action_text):
     if not action_text: return None
@@ -313,24 +443,29 @@ def read_csv_data(file_path, string_data_var_name=None):
     except FileNotFoundError: print(f"Error: CSV file not found at '{file_path}'."); return []
     except Exception as e: print(f"Error reading or parsing CSV data from {source_type}: {e}"); return []
 
+def render_json_record(record):
+    """Returns record as text the way save_json_data() writes it into the output list (indent=2, three levels deep)."""
+    return json.dumps(record, indent=2).replace("\n", "\n      ") # Newlines inside strings are escaped, so every newline starts a line
+
 def save_json_data(data, output_path, data_type_name):
-    if not data: print(f"No data to save for {data_type_name}."); data_to_save = []
-    else: data_to_save = sorted(data, key=lambda x: x.get("name", "")) # Ensure 'name' exists or handle missing key
+    save_rendered_json_data([(record.get("name", ""), render_json_record(record)) for record in data or []], output_path, data_type_name) # Ensure 'name' exists or handle missing key
+
+def save_rendered_json_data(named_records, output_path, data_type_name):
+    """save_json_data() for records already rendered with render_json_record(); named_records holds (name, text) pairs."""
+    if not named_records: print(f"No data to save for {data_type_name}."); rendered_list = "[]"
+    else: rendered_list = "[\n      " + ",\n      ".join(text for _, text in sorted(named_records, key=lambda named_record: named_record[0])) + "\n    ]"
     
     # Correctly form the top-level key based on data_type_name
     list_key_name = f"{data_type_name.lower().replace(' ', '_')}_list"
     wrapper_key_name = f"{data_type_name.lower().replace(' ', '_')}_data"
+    description = f"Compilation of {data_type_name} for Star Wars SAGA Edition."
 
-    final_output = {
-        wrapper_key_name: {
-            "description": f"Compilation of {data_type_name} for Star Wars SAGA Edition.",
-            list_key_name: data_to_save
-        }
-    }
+    # Same text as json.dumps({wrapper_key_name: {"description": ..., list_key_name: [...]}}, indent=2)
+    final_output = f'{{\n  {json.dumps(wrapper_key_name)}: {{\n    "description": {json.dumps(description)},\n    {json.dumps(list_key_name)}: {rendered_list}\n  }}\n}}'
     try:
         output_dir = os.path.dirname(output_path)
         if output_dir and not os.path.exists(output_dir): os.makedirs(output_dir); print(f"Created output directory: {output_dir}")
-        with open(output_path, 'w', encoding='utf-8') as f: json.dump(final_output, f, indent=2)
+        with open(output_path, 'w', encoding='utf-8') as f: f.write(final_output)
         print(f"Successfully generated {data_type_name} JSON to: {output_path}\n")
     except Exception as e: print(f"Error writing {data_type_name} JSON to file {output_path}: {e}\n")
 
@@ -593,87 +728,229 @@ def process_skills_csv():
         final_skill_list.append(skill_obj)
     save_json_data(final_skill_list, SKILLS_JSON_PATH, "Skills")
 
-def process_feats_csv():
+def snapshot_run_stats():
+    """Returns the current effect rule stats and prerequisite cache counters, for run_stats_since()."""
+    return {rule_name: dict(stats) for rule_name, stats in EFFECT_RULE_STATS.items()}, PREREQUISITE_CACHE.hits, PREREQUISITE_CACHE.misses, len(PREREQUISITE_CACHE.parsed_texts)
+
+def run_stats_since(snapshot):
+    """
+    Returns (effect_stats, (hits, misses), parsed_prerequisites) accumulated since snapshot, so work done
+    in another process can be added to this one's statistics and persistent cache with merge_run_stats().
+    """
+    effect_stats_before, hits_before, misses_before, parsed_before = snapshot
+    effect_stats = {rule_name: {key: value - effect_stats_before[rule_name][key] for key, value in stats.items()} for rule_name, stats in EFFECT_RULE_STATS.items()}
+    parsed_prerequisites = [(text, PREREQUISITE_CACHE.entries[text]) for text in PREREQUISITE_CACHE.parsed_texts[parsed_before:] if text in PREREQUISITE_CACHE.entries]
+    return effect_stats, (PREREQUISITE_CACHE.hits - hits_before, PREREQUISITE_CACHE.misses - misses_before), parsed_prerequisites
+
+def merge_run_stats(effect_stats, cache_counters, parsed_prerequisites):
+    for rule_name, stats in effect_stats.items():
+        for key, value in stats.items(): EFFECT_RULE_STATS[rule_name][key] += value
+    PREREQUISITE_CACHE.hits += cache_counters[0]; PREREQUISITE_CACHE.misses += cache_counters[1]
+    if not PREREQUISITE_CACHE.loaded: PREREQUISITE_CACHE._load() # Keep the persisted entries when this process has not looked anything up itself
+    for text, result in parsed_prerequisites:
+        if text not in PREREQUISITE_CACHE.entries: PREREQUISITE_CACHE.add(text, result)
+
+def _build_records_chunk(build_record, rows, skip_none=True):
+    # Worker side of build_records(); also returns the chunk's run stats (see run_stats_since())
+    snapshot = snapshot_run_stats()
+    records = [record for record in map(build_record, rows) if record is not None or not skip_none]
+    return (records,) + run_stats_since(snapshot)
+
+def build_records(build_record, raw_rows, jobs=None, chunk_size=None, skip_none=True):
+    """
+    Returns [build_record(row) for row in raw_rows], skipping None (unless skip_none is False). With
+    jobs > 1 the rows are split into chunks of chunk_size and built in a process pool; chunks are
+    collected in submission order, so the result is identical to the serial one. build_record must
+    be a module-level function. jobs/chunk_size default to ROW_PROCESS_JOBS/ROW_CHUNK_SIZE.
+    """
+    jobs = ROW_PROCESS_JOBS if jobs is None else jobs; chunk_size = chunk_size or ROW_CHUNK_SIZE
+    if jobs <= 1 or len(raw_rows) <= chunk_size: return [record for record in map(build_record, raw_rows) if record is not None or not skip_none]
+    chunks = [raw_rows[start:start + chunk_size] for start in range(0, len(raw_rows), chunk_size)]
+    records = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as executor:
+        for chunk_records, *run_stats in executor.map(_build_records_chunk, [build_record] * len(chunks), chunks, [skip_none] * len(chunks)):
+            records.extend(chunk_records); merge_run_stats(*run_stats)
+    return records
+
+def get_row_sidecar_path(output_path):
+    """Returns the row fingerprint sidecar of a converter output: backup/<name>.rows.json next to it."""
+    output_dir, filename = os.path.split(output_path)
+    return os.path.join(output_dir, "backup", os.path.splitext(filename)[0] + ".rows.json")
+
+def _output_signature(output_path):
+    try: stat_result = os.stat(output_path)
+    except OSError: return None
+    return [stat_result.st_mtime_ns, stat_result.st_size]
+
+class RowFingerprintSidecar:
+    """
+    Fingerprint (SHA-256 of converter version + raw CSV row) of every row of one converter output, with the
+    name and render_json_record() text of the record each row produced (None for skipped rows). Rows whose
+    fingerprint is known are neither parsed nor rendered again.
+    """
+    FORMAT_VERSION = 1
+
+    def __init__(self, sidecar_path, output_path):
+        self.sidecar_path = sidecar_path; self.output_path = output_path
+        self.converter_version = self.current_converter_version()
+        self._version_hash = hashlib.sha256(f"{self.converter_version}\n".encode('utf-8'))
+        self.records = {}; self.row_fingerprints = []; self.output_signature = None
+        self.previous_row_fingerprints = None; self.reused_rows = 0; self.parsed_rows = 0
+        self._load()
+
+    @classmethod
+    def for_output(cls, output_path):
+        return cls(get_row_sidecar_path(output_path), output_path)
+
+    @staticmethod
+    def current_converter_version():
+        try:
+            with open(os.path.abspath(__file__), 'r', encoding='utf-8') as f: converter_source = f.read()
+        except (IOError, OSError): converter_source = ""
+        converter_source = converter_source.split("# --- 2. HELPER FUNCTIONS (GENERAL) ---", 1)[-1] # Configuration edits (paths, PROCESS_CONFIG) keep the fingerprints
+        return f"{ROW_FINGERPRINT_VERSION}:{hashlib.sha256(converter_source.encode('utf-8')).hexdigest()[:16]}"
+
+    def _load(self):
+        if not os.path.exists(self.sidecar_path): return
+        try:
+            with open(self.sidecar_path, 'r', encoding='utf-8') as f: sidecar = json.load(f)
+        except (IOError, OSError, json.JSONDecodeError) as e: print(f"Warning: Could not read row fingerprints {self.sidecar_path}: {e}. Rebuilding every row."); return
+        if not isinstance(sidecar, dict) or sidecar.get("format_version") != self.FORMAT_VERSION or sidecar.get("converter_version") != self.converter_version:
+            print(f"Row fingerprints in {self.sidecar_path} were written by another converter version; rebuilding every row."); return
+        self.records = sidecar.get("records", {}); self.previous_row_fingerprints = sidecar.get("row_fingerprints")
+        self.output_signature = sidecar.get("output_signature")
+
+    def fingerprint(self, row_raw):
+        try: row_text = "\x1f".join(row_raw) + "\x1e" + "\x1f".join(row_raw.values()) # Column names and order are part of the row
+        except TypeError: row_text = repr(list(row_raw.items())) # Short/long rows: csv.DictReader filled in None keys or values
+        row_hash = self._version_hash.copy(); row_hash.update(row_text.encode('utf-8'))
+        return row_hash.hexdigest()
+
+    def build(self, build_record, raw_rows, jobs=None):
+        """Returns the (name, text) of the records of raw_rows (see save_rendered_json_data()), parsing only the rows whose fingerprint has no stored record."""
+        self.row_fingerprints = [self.fingerprint(row_raw) for row_raw in raw_rows]
+        new_rows = {}
+        for fingerprint, row_raw in zip(self.row_fingerprints, raw_rows):
+            if fingerprint not in self.records and fingerprint not in new_rows: new_rows[fingerprint] = row_raw
+        if new_rows:
+            new_records = build_records(build_record, list(new_rows.values()), jobs=jobs, skip_none=False)
+            self.records.update((fingerprint, None if record is None else [record.get("name", ""), render_json_record(record)]) for fingerprint, record in zip(new_rows, new_records))
+        self.parsed_rows = len(new_rows); self.reused_rows = sum(1 for fingerprint in self.row_fingerprints if fingerprint not in new_rows)
+        return [self.records[fingerprint] for fingerprint in self.row_fingerprints if self.records[fingerprint] is not None]
+
+    def output_is_current(self):
+        """True if nothing was parsed, the rows are the ones of the last run and the output file was not touched since."""
+        return not self.parsed_rows and self.row_fingerprints == self.previous_row_fingerprints and self.output_signature is not None and self.output_signature == _output_signature(self.output_path)
+
+    def save(self):
+        """Writes the fingerprints and records of the current rows (records of removed rows are dropped)."""
+        try:
+            os.makedirs(os.path.dirname(self.sidecar_path), exist_ok=True)
+            temp_path = self.sidecar_path + ".tmp"
+            sidecar = {"format_version": self.FORMAT_VERSION, "converter_version": self.converter_version, "output_signature": _output_signature(self.output_path),
+                       "row_fingerprints": self.row_fingerprints, "records": {fingerprint: self.records[fingerprint] for fingerprint in dict.fromkeys(self.row_fingerprints)}}
+            with open(temp_path, 'w', encoding='utf-8') as f: f.write(json.dumps(sidecar, ensure_ascii=False)) # dumps() uses the C encoder, dump() does not
+            os.replace(temp_path, self.sidecar_path)
+        except (IOError, OSError) as e: print(f"Warning: Could not write row fingerprints {self.sidecar_path}: {e}")
+
+    def print_stats(self, data_type_name):
+        print(f"{data_type_name}: {self.parsed_rows} row(s) parsed, {self.reused_rows} reused from {self.sidecar_path}.")
+
+def build_and_save_records(build_record, raw_rows, output_path, data_type_name, jobs=None, incremental=None):
+    """
+    Builds the records of raw_rows and saves them with save_json_data(). Incrementally (default:
+    INCREMENTAL_ROW_CONVERSION) only new/changed rows are parsed and rendered (see RowFingerprintSidecar),
+    and the output is not rewritten when no row changed.
+    """
+    if not (INCREMENTAL_ROW_CONVERSION if incremental is None else incremental): save_json_data(build_records(build_record, raw_rows, jobs=jobs), output_path, data_type_name); return
+    sidecar = RowFingerprintSidecar.for_output(output_path)
+    named_records = sidecar.build(build_record, raw_rows, jobs=jobs); sidecar.print_stats(data_type_name)
+    if sidecar.output_is_current(): print(f"{data_type_name} unchanged; kept {output_path}\n"); return
+    save_rendered_json_data(named_records, output_path, data_type_name); sidecar.save()
+
+def build_feat_record(row_raw):
+    row = {k: clean_value(v) for k,v in row_raw.items()}
+    name = row.get('FEAT', row.get('Feat', '')) # Check alternative column names
+    if not name: return None
+    benefit_text = mtr_explanations(row.get('BENEFIT', row.get('Benefit', '')))
+    # Handle multiple possible desc columns, prioritizing more specific ones
+    full_text_additional_raw = row.get('Desc.', row.get('DESC', row.get('Desc', row.get('Description', ''))))
+    full_text_additional = mtr_explanations(full_text_additional_raw) if full_text_additional_raw else None
+    
+    prereq_text_raw = get_prerequisite_text_from_row_dict(row, ['PREREQUISITES', 'PREREQUISITE', 'Prerequisites', 'Prerequisite'])
+    tags_str = row.get('TAG', '')
+    feat_types = []
+    if tags_str:
+        cleaned_tags = tags_str.replace('][', ',').replace('[', '').replace(']', '') # Handle "][", "[", "]"
+        feat_types = sorted([t.strip() for t in cleaned_tags.split(',') if t.strip()])
+    
+    bonus_classes = []
+    base_class_columns = ["Jedi", "Noble", "Scoundrel", "Scout", "Soldier"] # Standard SAGA base classes
+    for char_class_col_name in base_class_columns:
+        class_marker = row.get(char_class_col_name, '')
+        if class_marker.strip().lower() == 'x': # Check for 'x' or similar marker
+            bonus_classes.append(char_class_col_name)
+
+    primary_effect_text = benefit_text if benefit_text else full_text_additional
+    
+    feat = {
+        "name": name, 
+        "type": feat_types if feat_types else ["Unknown"], 
+        "prerequisites_text": prereq_text_raw, 
+        "prerequisites_structured": parse_prerequisites_from_text(prereq_text_raw), 
+        "benefit_summary": benefit_text, 
+        "effects": parse_effects_from_text(primary_effect_text), # Parse based on primary text
+        "bonus_feat_for_classes": sorted(list(set(bonus_classes))), 
+        "source_book": row.get('BOOK', row.get('Source', '')).strip(), 
+        "page": str(row.get('PAGE', row.get('Page', ''))).strip(), 
+        "special_note": row.get('SPECIAL', row.get('Special', '')).strip() or None
+    }
+    if full_text_additional and full_text_additional != benefit_text : 
+        feat["full_text_description"] = full_text_additional
+    return feat
+
+def process_feats_csv(jobs=None, incremental=None):
     print("Processing Feats...")
     raw_data = read_csv_data(FEATS_CSV_PATH)
     processed_feats = []
     if not raw_data: save_json_data(processed_feats, FEATS_JSON_PATH, "Feats"); return
-    for row_raw in raw_data:
-        row = {k: clean_value(v) for k,v in row_raw.items()}
-        name = row.get('FEAT', row.get('Feat', '')) # Check alternative column names
-        if not name: continue
-        benefit_text = mtr_explanations(row.get('BENEFIT', row.get('Benefit', '')))
-        # Handle multiple possible desc columns, prioritizing more specific ones
-        full_text_additional_raw = row.get('Desc.', row.get('DESC', row.get('Desc', row.get('Description', ''))))
-        full_text_additional = mtr_explanations(full_text_additional_raw) if full_text_additional_raw else None
-        
-        prereq_text_raw = get_prerequisite_text_from_row_dict(row, ['PREREQUISITES', 'PREREQUISITE', 'Prerequisites', 'Prerequisite'])
-        tags_str = row.get('TAG', '')
-        feat_types = []
-        if tags_str:
-            cleaned_tags = tags_str.replace('][', ',').replace('[', '').replace(']', '') # Handle "][", "[", "]"
-            feat_types = sorted([t.strip() for t in cleaned_tags.split(',') if t.strip()])
-        
-        bonus_classes = []
-        base_class_columns = ["Jedi", "Noble", "Scoundrel", "Scout", "Soldier"] # Standard SAGA base classes
-        for char_class_col_name in base_class_columns:
-            class_marker = row.get(char_class_col_name, '')
-            if class_marker.strip().lower() == 'x': # Check for 'x' or similar marker
-                bonus_classes.append(char_class_col_name)
-
-        primary_effect_text = benefit_text if benefit_text else full_text_additional
-        
-        feat = {
-            "name": name, 
-            "type": feat_types if feat_types else ["Unknown"], 
-            "prerequisites_text": prereq_text_raw, 
-            "prerequisites_structured": parse_prerequisites_from_text(prereq_text_raw), 
-            "benefit_summary": benefit_text, 
-            "effects": parse_effects_from_text(primary_effect_text), # Parse based on primary text
-            "bonus_feat_for_classes": sorted(list(set(bonus_classes))), 
-            "source_book": row.get('BOOK', row.get('Source', '')).strip(), 
-            "page": str(row.get('PAGE', row.get('Page', ''))).strip(), 
-            "special_note": row.get('SPECIAL', row.get('Special', '')).strip() or None
-        }
-        if full_text_additional and full_text_additional != benefit_text : 
-            feat["full_text_description"] = full_text_additional
-        processed_feats.append(feat)
-    save_json_data(processed_feats, FEATS_JSON_PATH, "Feats")
+    build_and_save_records(build_feat_record, raw_data, FEATS_JSON_PATH, "Feats", jobs=jobs, incremental=incremental)
+
+def build_talent_record(row_raw):
+    row = {k: clean_value(v) for k,v in row_raw.items()}
+    name = row.get('TALENT', '')
+    if not name: return None
+    benefit_text = mtr_explanations(row.get('BENEFIT', row.get('Benefit', '')))
+    full_text_additional_raw = row.get('Desc.', row.get('DESC', row.get('Desc', row.get('Description', ''))))
+    full_text_additional = mtr_explanations(full_text_additional_raw) if full_text_additional_raw else None
+    
+    prereq_text_raw = get_prerequisite_text_from_row_dict(row, ['PREREQUISITE', 'Prerequisites'])
+    class_association_val = row.get('CLASS', '')
+    associated_classes = sorted(list(set([c.strip() for c in class_association_val.split(',') if c.strip()]))) if class_association_val else ["Unknown"]
+    
+    primary_effect_text = benefit_text if benefit_text else full_text_additional
+
+    talent = {
+        "name": name, 
+        "talent_tree": row.get('TREE', 'Unknown').strip(), 
+        "class_association": associated_classes, 
+        "prerequisites_text": prereq_text_raw, 
+        "prerequisites_structured": parse_prerequisites_from_text(prereq_text_raw), 
+        "description": benefit_text, # Main benefit in "description"
+        "effects": parse_effects_from_text(primary_effect_text), 
+        "source_book": row.get('BOOK', '').strip(), 
+        "page": str(row.get('PAGE', '')).strip()
+    }
+    if full_text_additional and full_text_additional != benefit_text : 
+        talent["full_text_description"] = full_text_additional # Store extra desc if different
+    return talent
 
-def process_talents_csv():
+def process_talents_csv(jobs=None, incremental=None):
     print("Processing Talents...")
     raw_data = read_csv_data(TALENTS_CSV_PATH)
     processed_talents = []
     if not raw_data: save_json_data(processed_talents, TALENTS_JSON_PATH, "Talents"); return
-    for row_raw in raw_data:
-        row = {k: clean_value(v) for k,v in row_raw.items()}
-        name = row.get('TALENT', '')
-        if not name: continue
-        benefit_text = mtr_explanations(row.get('BENEFIT', row.get('Benefit', '')))
-        full_text_additional_raw = row.get('Desc.', row.get('DESC', row.get('Desc', row.get('Description', ''))))
-        full_text_additional = mtr_explanations(full_text_additional_raw) if full_text_additional_raw else None
-        
-        prereq_text_raw = get_prerequisite_text_from_row_dict(row, ['PREREQUISITE', 'Prerequisites'])
-        class_association_val = row.get('CLASS', '')
-        associated_classes = sorted(list(set([c.strip() for c in class_association_val.split(',') if c.strip()]))) if class_association_val else ["Unknown"]
-        
-        primary_effect_text = benefit_text if benefit_text else full_text_additional
-
-        talent = {
-            "name": name, 
-            "talent_tree": row.get('TREE', 'Unknown').strip(), 
-            "class_association": associated_classes, 
-            "prerequisites_text": prereq_text_raw, 
-            "prerequisites_structured": parse_prerequisites_from_text(prereq_text_raw), 
-            "description": benefit_text, # Main benefit in "description"
-            "effects": parse_effects_from_text(primary_effect_text), 
-            "source_book": row.get('BOOK', '').strip(), 
-            "page": str(row.get('PAGE', '')).strip()
-        }
-        if full_text_additional and full_text_additional != benefit_text : 
-            talent["full_text_description"] = full_text_additional # Store extra desc if different
-        processed_talents.append(talent)
-    save_json_data(processed_talents, TALENTS_JSON_PATH, "Talents")
+    build_and_save_records(build_talent_record, raw_data, TALENTS_JSON_PATH, "Talents", jobs=jobs, incremental=incremental)
 
 def process_techniques_csv():
     print("Processing Force Techniques...")
@@ -1067,4 +1344,5 @@ if __name__ == '__main__':
     if PROCESS_CONFIG.get("force_powers", False): process_force_powers_csv()
     if PROCESS_CONFIG.get("prestige_classes", False): process_prestige_classes_csv()
     if PROCESS_CONFIG.get("droids", False): process_droids_csv() # Added call for droid processing
-    print("\nConfigured CSV processing complete.")
\ No newline at end of file
+    if PRINT_EFFECT_RULE_STATS and any(stats["texts"] for stats in EFFECT_RULE_STATS.values()): print_effect_rule_stats()
+    PREREQUISITE_CACHE.save(); PREREQUISITE_CACHE.print_stats()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: saga_convert_pipeline.py
+Version: 1.1.0
+Date: 2026-10-18
+
+Purpose:
+Single entry point for rebuilding the data files from the CSV exports in
+`scripts/csv/`. Runs the converters of `saga_character_multi_converter.py` and
+`saga_index_multi_converter.py` (and optionally `compile_saga_data.py`) as
+pipeline stages: a dependency graph is built from the files each stage reads and
+writes, independent stages run in parallel worker processes, and the wall time
+of every stage is reported.
+
+Stages:
+    * One per converter, named like the converters' PROCESS_CONFIG keys:
+        species, skills, feats, talents, techniques, secrets, regimens,
+        starship_maneuvers, force_powers, prestige_classes, droids (character
+        converter) and droid_systems, hazards (index converter). The index
+        converter's placeholder converters write nothing and are not stages.
+    * `compile`: compiles the data directory into
+        compiled_output/compiled_saga_index.json (incremental, see compile_saga_data.py).
+    * Each stage lists the path constants it reads and writes (a species run
+        reads Character-Species.csv and Character-Traits.csv, a skills run the
+        skills, skill uses and use CSVs). A stage depends on every selected
+        stage that writes a file it reads, or a file inside a directory it
+        reads (so `compile` waits for all converters), and on earlier stages
+        writing the same file. Stages that were not selected are not pulled in.
+    * Stage output is buffered and printed when the stage finishes, so the logs
+        of parallel stages do not interleave. If a stage fails, the stages that
+        depend on it are skipped and the pipeline exits with status 1.
+    * Effect rule stats and prerequisite cache results of the character
+        converter are gathered from the workers and printed/saved once at the end.
+
+Instructions for Use:
+    * Rebuild every data file from scripts/csv (paths below --root_path):
+        `python saga_convert_pipeline.py all --root_path ../..`
+    * ...and compile the result:
+        `python saga_convert_pipeline.py all compile --root_path ../..`
+    * Only some converters, in at most two processes:
+        `python saga_convert_pipeline.py species skills talents --jobs 2`
+    * No stage names: runs the converters enabled in the converters' PROCESS_CONFIG.
+    * Show the stages, their files and the dependency graph: `--list`.
+    * feats and talents only parse CSV rows that changed since the last run;
+        `--full_rebuild` parses every row.
+
+Version Notes:
+* 1.0.0 (2026-10-18): Initial release. File-based dependency graph, parallel stages, per-stage timing report.
+* 1.1.0 (2026-10-18): Added `--full_rebuild` (feats/talents reuse unchanged rows by default).
+"""
+
+import argparse
+import concurrent.futures
+import contextlib
+import importlib
+import io
+import os
+import re
+import sys
+import time
+import traceback
+
+# --- CONFIGURATION ---
+LOCAL_ROOT_PATH = r'D:\OneDrive\Documents\GitHub\SagaIndex'
+COMPILE_DATA_DIR_PATH = os.path.join(LOCAL_ROOT_PATH, 'data')
+COMPILE_OUTPUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "compiled_output", "compiled_saga_index.json")
+
+CHARACTER_CONVERTER = "saga_character_multi_converter"
+INDEX_CONVERTER = "saga_index_multi_converter"
+
+class PipelineStage:
+    """One converter run: module.function_name(), reading/writing the files named by path constants of module."""
+    def __init__(self, name, module_name, function_name, inputs=(), outputs=(), builds_row_records=False):
+        self.name = name; self.module_name = module_name; self.function_name = function_name
+        self.inputs = inputs; self.outputs = outputs; self.builds_row_records = builds_row_records
+
+    def resolve_paths(self, module):
+        return [getattr(module, constant) for constant in self.inputs], [getattr(module, constant) for constant in self.outputs]
+
+PIPELINE_STAGES = {stage.name: stage for stage in (
+    PipelineStage("species", CHARACTER_CONVERTER, "process_species_csv", ("SPECIES_MAIN_CSV_PATH", "SPECIES_TRAITS_CSV_PATH"), ("SPECIES_JSON_PATH",)),
+    PipelineStage("skills", CHARACTER_CONVERTER, "process_skills_csv", ("SKILLS_DEF_CSV_PATH", "SKILL_USES_CSV_PATH", "SKILL_ACTIONS_CSV_PATH"), ("SKILLS_JSON_PATH",)),
+    PipelineStage("feats", CHARACTER_CONVERTER, "process_feats_csv", ("FEATS_CSV_PATH",), ("FEATS_JSON_PATH",), builds_row_records=True),
+    PipelineStage("talents", CHARACTER_CONVERTER, "process_talents_csv", ("TALENTS_CSV_PATH",), ("TALENTS_JSON_PATH",), builds_row_records=True),
+    PipelineStage("techniques", CHARACTER_CONVERTER, "process_techniques_csv", ("TECHNIQUES_CSV_PATH",), ("TECHNIQUES_JSON_PATH",)),
+    PipelineStage("secrets", CHARACTER_CONVERTER, "process_secrets_csv", ("SECRETS_CSV_PATH",), ("SECRETS_JSON_PATH",)),
+    PipelineStage("regimens", CHARACTER_CONVERTER, "process_regimens_csv", ("REGIMENS_CSV_PATH",), ("REGIMENS_JSON_PATH",)),
+    PipelineStage("starship_maneuvers", CHARACTER_CONVERTER, "process_starship_maneuvers_csv", ("STARSHIP_MANEUVERS_CSV_PATH",), ("STARSHIP_MANEUVERS_JSON_PATH",)),
+    PipelineStage("force_powers", CHARACTER_CONVERTER, "process_force_powers_csv", ("FORCE_POWERS_CSV_PATH",), ("FORCE_POWERS_JSON_PATH",)),
+    PipelineStage("prestige_classes", CHARACTER_CONVERTER, "process_prestige_classes_csv", ("PRESTIGE_CLASSES_CSV_PATH",), ("PRESTIGE_CLASSES_JSON_PATH",)),
+    PipelineStage("droids", CHARACTER_CONVERTER, "process_droids_csv", ("DROID_CHASSIS_CSV_PATH",), ("DROID_CHASSIS_JSON_PATH",)),
+    PipelineStage("droid_systems", INDEX_CONVERTER, "process_droid_systems_csv", ("DROID_SYSTEMS_CSV_PATH",), ("DROID_SYSTEMS_JSON_PATH",)),
+    PipelineStage("hazards", INDEX_CONVERTER, "process_hazards_csv", ("HAZARDS_CSV_PATH",), ("HAZARDS_JSON_PATH",)),
+    PipelineStage("compile", "saga_convert_pipeline", "compile_data", ("COMPILE_DATA_DIR_PATH",), ("COMPILE_OUTPUT_PATH",)),
+)}
+CONVERTER_STAGE_NAMES = [name for name in PIPELINE_STAGES if name != "compile"]
+
+class StageResult:
+    def __init__(self, name, seconds, started_at, log, error=None, run_stats=None):
+        self.name = name; self.seconds = seconds; self.started_at = started_at
+        self.log = log; self.error = error; self.run_stats = run_stats
+        self.finished_at = started_at + seconds
+
+def set_root_path(module, root_path):
+    """Re-roots every *_PATH constant of module that lies below its LOCAL_ROOT_PATH onto root_path (backslash or slash separated)."""
+    old_root = module.LOCAL_ROOT_PATH
+    for constant, value in list(vars(module).items()):
+        if constant.endswith("_PATH") and constant != "LOCAL_ROOT_PATH" and isinstance(value, str) and value.startswith(old_root):
+            setattr(module, constant, os.path.join(root_path, *[part for part in re.split(r"[\\/]", value[len(old_root):]) if part]))
+    module.LOCAL_ROOT_PATH = root_path
+
+def load_stage_module(stage, root_path):
+    module = importlib.import_module(stage.module_name)
+    if module.LOCAL_ROOT_PATH != root_path: set_root_path(module, root_path)
+    return module
+
+def compile_data():
+    """The 'compile' stage: incremental compile of COMPILE_DATA_DIR_PATH into COMPILE_OUTPUT_PATH."""
+    from compile_saga_data import compile_json_data
+    compile_json_data(COMPILE_DATA_DIR_PATH, COMPILE_OUTPUT_PATH, incremental=True)
+
+def _normalized(path):
+    return os.path.normcase(os.path.abspath(path))
+
+def build_dependency_graph(stage_names, root_path):
+    """Returns {stage name: set of the selected stages it has to wait for} (see module docstring)."""
+    stage_files = {}
+    for name in stage_names:
+        stage = PIPELINE_STAGES[name]; inputs, outputs = stage.resolve_paths(load_stage_module(stage, root_path))
+        stage_files[name] = ([_normalized(p) for p in inputs], [_normalized(p) for p in outputs])
+    graph = {name: set() for name in stage_names}
+    for position, name in enumerate(stage_names):
+        inputs, outputs = stage_files[name]
+        for other_position, other_name in enumerate(stage_names):
+            if other_name == name: continue
+            other_outputs = stage_files[other_name][1]
+            if any(output == path or output.startswith(path.rstrip(os.sep) + os.sep) for output in other_outputs for path in inputs): graph[name].add(other_name)
+            elif other_position < position and set(outputs) & set(other_outputs): graph[name].add(other_name) # Same output file: keep the given order
+    return graph
+
+def run_stage(stage_name, root_path, row_jobs=None, collect_run_stats=False, full_rebuild=False):
+    """
+    Runs one stage in this process with its output buffered. Returns a StageResult; exceptions are
+    reported in it rather than raised. With collect_run_stats the character converter's run stats
+    are returned too (for stages run in a worker process). full_rebuild turns off the feats/talents
+    row reuse (see RowFingerprintSidecar in saga_character_multi_converter.py).
+    """
+    stage = PIPELINE_STAGES[stage_name]; log = io.StringIO(); error = None; snapshot = None
+    started_at = time.time(); start = time.perf_counter()
+    with contextlib.redirect_stdout(log):
+        try:
+            module = load_stage_module(stage, root_path)
+            if collect_run_stats and hasattr(module, "snapshot_run_stats"): snapshot = module.snapshot_run_stats()
+            getattr(module, stage.function_name)(**({"jobs": row_jobs, "incremental": False if full_rebuild else None} if stage.builds_row_records else {}))
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"; traceback.print_exc(file=log)
+    seconds = time.perf_counter() - start
+    return StageResult(stage_name, seconds, started_at, log.getvalue(), error, module.run_stats_since(snapshot) if snapshot else None)
+
+def print_timing_report(results, wall_seconds, jobs, pipeline_started_at):
+    """Prints each stage's wall time and start/finish offsets (in start order) plus the pipeline wall time."""
+    print("\n--- Pipeline Timing Report ---")
+    if results:
+        name_width = max(len(name) for name in results)
+        for result in sorted(results.values(), key=lambda r: r.started_at):
+            status = "  FAILED" if result.error else ""
+            print(f"  {result.name:<{name_width}}  {result.seconds * 1000:>9.1f} ms  (start {(result.started_at - pipeline_started_at) * 1000:>8.1f} ms, end {(result.finished_at - pipeline_started_at) * 1000:>8.1f} ms){status}")
+        print(f"  Sum of stage times: {sum(r.seconds for r in results.values()) * 1000:.1f} ms")
+    else:
+        print("  No stages were run.")
+    print(f"  Pipeline wall time (jobs: {jobs}): {wall_seconds * 1000:.1f} ms")
+
+def run_pipeline(stage_names, root_path=LOCAL_ROOT_PATH, jobs=None, row_jobs=None, full_rebuild=False):
+    """
+    Runs the named stages in dependency order, up to jobs at a time in worker processes
+    (jobs <= 1: one after another in this process). Returns {stage name: StageResult}
+    and the names of the stages that failed or were skipped.
+    """
+    stage_names = [name for name in PIPELINE_STAGES if name in set(stage_names)] # Registry order
+    jobs = jobs or os.cpu_count() or 1
+    graph = build_dependency_graph(stage_names, root_path)
+    results = {}; succeeded = set(); failed = set(); remaining = list(stage_names); running = {}
+    pipeline_started_at = time.time(); start = time.perf_counter()
+
+    def finish(result, from_worker):
+        results[result.name] = result
+        print(f"--- {result.name} ({result.seconds * 1000:.1f} ms{', FAILED' if result.error else ''}) ---")
+        if result.log: print(result.log, end="" if result.log.endswith("\n") else "\n")
+        if result.error: print(f"Error: Stage '{result.name}' failed: {result.error}"); failed.add(result.name)
+        else: succeeded.add(result.name)
+        if from_worker and result.run_stats: importlib.import_module(CHARACTER_CONVERTER).merge_run_stats(*result.run_stats)
+
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(stage_names))) if jobs > 1 and len(stage_names) > 1 else None
+    try:
+        while remaining or running:
+            progressed = False
+            for name in list(remaining):
+                if graph[name] & failed:
+                    print(f"Skipping stage '{name}': it depends on failed stage(s) {', '.join(sorted(graph[name] & failed))}.")
+                    remaining.remove(name); failed.add(name); progressed = True
+                elif graph[name] <= succeeded:
+                    remaining.remove(name); progressed = True
+                    if executor: running[executor.submit(run_stage, name, root_path, row_jobs, True, full_rebuild)] = name
+                    else: finish(run_stage(name, root_path, row_jobs, full_rebuild=full_rebuild), False)
+            if running:
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try: finish(future.result(), True)
+                    except Exception as e: finish(StageResult(name, 0.0, time.time(), "", f"worker process failed: {e}"), True)
+            elif remaining and not progressed:
+                print(f"Error: Dependency cycle between stages {', '.join(remaining)}; not running them.")
+                failed.update(remaining); remaining.clear()
+    finally:
+        if executor: executor.shutdown()
+
+    wall_seconds = time.perf_counter() - start
+    if any(PIPELINE_STAGES[name].module_name == CHARACTER_CONVERTER for name in results):
+        character_converter = importlib.import_module(CHARACTER_CONVERTER)
+        if character_converter.PRINT_EFFECT_RULE_STATS and any(stats["texts"] for stats in character_converter.EFFECT_RULE_STATS.values()): character_converter.print_effect_rule_stats()
+        character_converter.PREREQUISITE_CACHE.save(); character_converter.PREREQUISITE_CACHE.print_stats()
+    print_timing_report(results, wall_seconds, jobs if executor else 1, pipeline_started_at)
+    return results, failed
+
+def enabled_stage_names():
+    """The converter stages switched on in the converters' PROCESS_CONFIG."""
+    return [name for name in CONVERTER_STAGE_NAMES if importlib.import_module(PIPELINE_STAGES[name].module_name).PROCESS_CONFIG.get(name, False)]
+
+def print_stage_list(root_path):
+    graph = build_dependency_graph(list(PIPELINE_STAGES), root_path)
+    for name, stage in PIPELINE_STAGES.items():
+        inputs, outputs = stage.resolve_paths(load_stage_module(stage, root_path))
+        print(f"{name}:")
+        for path in inputs: print(f"    reads  {path}")
+        for path in outputs: print(f"    writes {path}")
+        print(f"    after  {', '.join(sorted(graph[name])) or '-'}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the CSV to JSON converters as one pipeline. See script header for details.", formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("stages", nargs="*", help=f"Stages to run, or 'all' for every converter (default: those enabled in PROCESS_CONFIG):\n{', '.join(PIPELINE_STAGES)}.")
+    parser.add_argument("--root_path", default=LOCAL_ROOT_PATH, help=f"Root path of the SagaIndex repository (scripts/csv and data below it). Defaults to:\n'{LOCAL_ROOT_PATH}'.")
+    parser.add_argument("--jobs", type=int, default=None, help="Run up to N stages at once in worker processes (default: CPU count; 1 = one after another in this process).")
+    parser.add_argument("--row_jobs", type=int, default=None, help="Worker processes per feats/talents stage (default: the converter's ROW_PROCESS_JOBS).")
+    parser.add_argument("--full_rebuild", action="store_true", help="Parse every feats/talents row again instead of reusing the records of unchanged rows.")
+    parser.add_argument("--list", action="store_true", help="Show the stages, the files they read and write and what they wait for, then exit.")
+    args = parser.parse_args()
+
+    if args.list: print_stage_list(args.root_path); sys.exit(0)
+    stage_names = []
+    for name in args.stages or enabled_stage_names():
+        if name == "all": stage_names.extend(CONVERTER_STAGE_NAMES)
+        elif name in PIPELINE_STAGES: stage_names.append(name)
+        else: parser.error(f"unknown stage '{name}' (choose from: all, {', '.join(PIPELINE_STAGES)})")
+    if not stage_names: print("No stages selected (nothing is enabled in PROCESS_CONFIG)."); sys.exit(0)
+    _, failed_stages = run_pipeline(stage_names, root_path=args.root_path, jobs=args.jobs, row_jobs=args.row_jobs, full_rebuild=args.full_rebuild)
+    print("\nPipeline complete." if not failed_stages else f"\nPipeline finished with {len(failed_stages)} failed or skipped stage(s): {', '.join(sorted(failed_stages))}.")
+    sys.exit(1 if failed_stages else 0)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: saga_edit_journal.py
+Version: 1.1.0
+Date: 2026-10-18
+
+Purpose:
+Write-ahead journal of the edits `json_updater.py` has applied to each data file,
+so an interrupted run can be resumed and re-running an edits file is idempotent:
+edits already committed to a file are skipped instead of producing "already
+exists" warnings or being applied twice.
+
+Journal Layout (`data/<category>/backup/<name>.journal.jsonl`, append-only, one JSON object per line):
+    * {"event": "snapshot", "edit_ids": [...], "timestamp": ...}: the first line
+        of a compacted journal (see below); these edits are committed.
+    * {"event": "begin", "txn": ..., "target_file_key": ..., "edit_ids": [...],
+        "file_signature": [mtime_ns, size, inode] | null, "timestamp": ...}
+        Written (and fsync'd) before the data file is saved; lists the edits the
+        save contains and the signature of the file before the save.
+    * {"event": "commit", "txn": ..., "timestamp": ...}: the save succeeded.
+    * {"event": "abort", "txn": ..., "timestamp": ...}: the save did not happen.
+    * A 'begin' without 'commit'/'abort' means the run died during the save.
+        Saves are atomic (temp file + os.replace), so the next run checks the
+        file: if its signature changed since the 'begin', the save went through
+        and the transaction is committed; otherwise it is aborted.
+    * Once a save completes and the journal has more than COMPACT_AFTER_ENTRIES
+        lines, it is rewritten as a single snapshot of the committed IDs that can
+        still match: every explicit `edit_id`, and the derived IDs of the
+        RETAINED_EDITS_FILES edits files committed most recently.
+    * A dry run opens the journal read-only (interrupted saves are resolved in
+        memory only).
+
+Edit IDs:
+    * An edit's `edit_id` field if it has one. It is matched across edits files,
+        so use it for edits that may be sent more than once in different files.
+    * Otherwise an ID derived from the edits file: a SHA-256 of its path,
+        modification time and content (canonical JSON), the edit's position in
+        it and the SHA-256 of the edit itself, e.g. `edits-3f2a...c1/12:9be0...47`.
+        Re-running an unchanged edits file (or resuming an interrupted one) skips
+        the edits it already committed; the same edit in another edits file, or
+        in the same file written again (e.g. setting a page back to a value it
+        had before), is applied.
+    * Edits sent to the updater daemon without an `edit_id` are not journaled.
+
+Instructions for Use:
+    * `json_updater.py` uses the journal by default (`--no_journal` disables it;
+        `--chunk_size N` saves and commits every N edits per file, so a crash
+        loses at most one chunk).
+    * Show what the journal holds for a data file (read-only):
+        `python saga_edit_journal.py ../../data/character_elements/talents.json`
+
+Version Notes:
+* 1.0.0 (2026-10-18): Initial release. Per-file append-only journal with crash recovery.
+* 1.0.1 (2026-10-18): Edits without `edit_id` get run-scoped IDs; they used to be skipped for good once journaled.
+* 1.1.0 (2026-10-18):
+    * Edits without `edit_id` get IDs derived from the edits file instead of the run, so
+      re-running or resuming an edits file skips its committed edits again.
+    * Journal compaction after a completed save; read-only journals for dry runs.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import uuid
+from datetime import datetime
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+DERIVED_ID_PREFIX = "edits-"
+COMPACT_AFTER_ENTRIES = 200 # Journal lines before a completed save rewrites the journal as one snapshot
+RETAINED_EDITS_FILES = 50 # Edits files whose derived IDs survive a compaction (most recently committed first)
+_UNMATCHABLE_ID_PATTERN = re.compile(r"^(run-[0-9a-f]{12}:[0-9a-f]{20}#\d+|daemon-[0-9a-f]{32})$") # Journaled by 1.0.1 and the 1.0.0 daemon; no edit ever gets them again
+
+def get_journal_path(file_path):
+    """Returns the journal of a data file: backup/<name>.journal.jsonl next to it."""
+    file_dir, filename = os.path.split(os.path.abspath(file_path))
+    return os.path.join(file_dir, "backup", os.path.splitext(filename)[0] + JOURNAL_SUFFIX)
+
+def _canonical_digest(content):
+    return hashlib.sha256(json.dumps(content, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def compute_edit_ids(edit_requests, edits_file_path=None):
+    """Returns one ID per edit request of the edits file edits_file_path (see module docstring), in the same order."""
+    try: edits_file_identity = [os.path.abspath(edits_file_path), os.stat(edits_file_path).st_mtime_ns] if edits_file_path else None
+    except OSError: edits_file_identity = None
+    edits_file_digest = _canonical_digest([edits_file_identity, edit_requests])[:16]
+    return [str(edit["edit_id"]) if isinstance(edit, dict) and edit.get("edit_id") is not None else f"{DERIVED_ID_PREFIX}{edits_file_digest}/{position}:{_canonical_digest(edit)[:12]}"
+            for position, edit in enumerate(edit_requests)]
+
+def _edits_file_of(edit_id):
+    # The edits file a derived ID belongs to, or None for an explicit edit_id.
+    if not edit_id.startswith(DERIVED_ID_PREFIX) or "/" not in edit_id: return None
+    return edit_id.split("/", 1)[0]
+
+def _file_signature(file_path):
+    try: stat_result = os.stat(file_path)
+    except OSError: return None
+    return [stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino] # A replaced file always has a new inode
+
+class EditJournal:
+    """Append-only journal of committed edit IDs for one data file. read_only: never writes (dry runs)."""
+    def __init__(self, journal_path, file_path, read_only=False):
+        self.journal_path = journal_path; self.file_path = file_path; self.read_only = read_only
+        self.committed_ids = set(); self.transactions = {}; self.recovered = []
+        self._edits_files = {} # Edits file -> its committed derived IDs, least recently committed first
+        self._entry_count = 0
+        self._load()
+
+    @classmethod
+    def for_file(cls, file_path, read_only=False):
+        return cls(get_journal_path(file_path), file_path, read_only=read_only)
+
+    def _load(self):
+        if not os.path.exists(self.journal_path): return
+        pending = {}
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                self._entry_count += 1
+                try: entry = json.loads(line)
+                except json.JSONDecodeError: continue # A torn last line from a crash mid-append
+                if entry.get("event") == "snapshot": self._add_committed_ids(entry.get("edit_ids", []))
+                elif entry.get("event") == "begin": pending[entry["txn"]] = entry
+                elif entry.get("event") == "commit" and entry.get("txn") in pending: self._mark_committed(pending.pop(entry["txn"]))
+                elif entry.get("event") == "abort": pending.pop(entry.get("txn"), None)
+        for txn, begin_entry in pending.items(): # Interrupted saves: decide from the data file itself
+            if _file_signature(self.file_path) != begin_entry.get("file_signature"):
+                self._append({"event": "commit", "txn": txn, "recovered": True}); self._mark_committed(begin_entry)
+                self.recovered.append((txn, "committed"))
+            else:
+                self._append({"event": "abort", "txn": txn, "recovered": True})
+                self.recovered.append((txn, "aborted"))
+
+    def _mark_committed(self, begin_entry):
+        self._add_committed_ids(begin_entry.get("edit_ids", []))
+        self.transactions[begin_entry["txn"]] = begin_entry
+
+    def _add_committed_ids(self, edit_ids):
+        edit_ids = [edit_id for edit_id in edit_ids if not _UNMATCHABLE_ID_PATTERN.match(edit_id)]
+        self.committed_ids.update(edit_ids)
+        for edit_id in edit_ids:
+            edits_file = _edits_file_of(edit_id)
+            if edits_file is None: continue
+            derived_ids = self._edits_files.pop(edits_file, []); derived_ids.append(edit_id); self._edits_files[edits_file] = derived_ids # Re-inserted: most recent last
+
+    def _append(self, entry):
+        if self.read_only: return
+        self._entry_count += 1
+        entry.setdefault("timestamp", datetime.now().isoformat(timespec='seconds'))
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n"); f.flush(); os.fsync(f.fileno())
+
+    def begin(self, target_file_key, edit_ids):
+        """Records that a save containing edit_ids is about to happen. Returns the transaction ID."""
+        txn = uuid.uuid4().hex
+        self._append({"event": "begin", "txn": txn, "target_file_key": target_file_key, "edit_ids": list(edit_ids), "file_signature": _file_signature(self.file_path)})
+        self.transactions[txn] = {"edit_ids": list(edit_ids), "committed": False}
+        return txn
+
+    def commit(self, txn):
+        self._append({"event": "commit", "txn": txn})
+        self._add_committed_ids(self.transactions[txn]["edit_ids"]); self.transactions[txn]["committed"] = True
+        if self._entry_count > COMPACT_AFTER_ENTRIES and all(entry.get("committed", True) for entry in self.transactions.values()): self.compact()
+
+    def abort(self, txn):
+        self._append({"event": "abort", "txn": txn}); self.transactions.pop(txn, None)
+
+    def compact(self):
+        """Rewrites the journal as one snapshot of the committed IDs that can still match (see module docstring)."""
+        if self.read_only: return
+        retained_edits_files = list(self._edits_files)[-RETAINED_EDITS_FILES:]
+        self._edits_files = {edits_file: self._edits_files[edits_file] for edits_file in retained_edits_files}
+        edit_ids = sorted(edit_id for edit_id in self.committed_ids if _edits_file_of(edit_id) is None) + [edit_id for edit_ids in self._edits_files.values() for edit_id in edit_ids]
+        self.committed_ids = set(edit_ids); self.transactions = {}
+        temp_path = self.journal_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"event": "snapshot", "edit_ids": edit_ids, "timestamp": datetime.now().isoformat(timespec='seconds')}, ensure_ascii=False) + "\n"); f.flush(); os.fsync(f.fileno())
+        os.replace(temp_path, self.journal_path)
+        self._entry_count = 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show the json_updater edit journal of a data file. See script header for details.")
+    parser.add_argument("file", help="Data file, e.g. data/character_elements/talents.json.")
+    args = parser.parse_args()
+    journal = EditJournal.for_file(args.file, read_only=True)
+    for txn, outcome in journal.recovered: print(f"Interrupted save {txn}: {outcome} (recorded by the next json_updater run).")
+    print(f"{journal.journal_path}: {len(journal.committed_ids)} committed edit ID(s), {len(journal.committed_ids) - sum(map(len, journal._edits_files.values()))} of them explicit, from {journal._entry_count} journal line(s).")
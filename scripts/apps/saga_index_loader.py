@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: saga_index_loader.py
+Version: 1.2.0
+Date: 2026-10-18
+
+Purpose:
+Fast loader for the compiled Star Wars Saga Edition index produced by
+`compile_saga_data.py`. Besides the pretty-printed `compiled_saga_index.json`,
+the compiler can emit a compact binary artifact (`compiled_saga_index.sagabin`)
+that loads back into exactly the same nested structure much faster, which cuts
+cold-start time for services that load the whole index.
+
+Artifact Profiles (written next to compiled_saga_index.json):
+    * minified (`.min.json`): same JSON without whitespace.
+    * gzip (`.json.gz`): minified JSON, gzip level 9. Stdlib only.
+    * zstd (`.json.zst`): minified JSON, zstd level 19. Optional: requires
+        `pip install zstandard` for both writing and reading. No trained
+        dictionary is used: on a single multi-MB document zstd already learns
+        the repeated keys, and a dictionary made the artifact larger.
+    * binary (`.sagabin`): see below.
+    `load_compiled_index()` picks the right decoder from the file extension.
+
+Binary Format (.sagabin):
+    * 7-byte magic `SAGAIDX`, 1-byte format version.
+    * 4-byte interpreter tag (`importlib.util.MAGIC_NUMBER`) of the Python that
+        wrote the file.
+    * Payload: the compiled tree serialized with the stdlib `marshal` codec.
+        Repeated strings (keys such as `source_book`, `page`, ...) are written
+        once and back-referenced, so the artifact is smaller than the JSON.
+    * `marshal` is only guaranteed to round-trip on the same Python version, so
+        the interpreter tag is checked on load. On a mismatch (or a damaged file)
+        the loader falls back to the `.json` file next to the artifact.
+    * Only load artifacts you produced yourself; `marshal` is not meant for
+        untrusted input.
+
+Sharded Index (`compile_saga_data.py --shards`):
+    * Each source file's subtree is written as its own shard under
+        `compiled_saga_index_shards/`, listed in `compiled_saga_index.toc.json`
+        (dotted key path -> relative shard path, profile and source file).
+    * `LazySagaIndex(toc_file)` is a read-only mapping with the same nested layout
+        as the compiled index. A shard is read on first access and cached, so
+        `index["character_elements.feats"]` (or
+        `index["character_elements"]["feats"]`) only loads the feats file.
+
+    * Produce the artifacts: `python compile_saga_data.py --binary --profile gzip`
+    * Load it from Python:
+        from saga_index_loader import load_compiled_index
+        index = load_compiled_index("compiled_output/compiled_saga_index.sagabin")
+    * Compare load time and file size against the JSON output:
+        `python saga_index_loader.py compiled_output/compiled_saga_index.json --benchmark`
+
+Version Notes:
+* 1.0.0 (2026-10-18): Initial release. Binary writer/loader and load benchmark.
+* 1.1.0 (2026-10-18): Added minified, gzip and zstd artifact profiles. Loader picks the format from the file extension.
+* 1.2.0 (2026-10-18): Added `LazySagaIndex` for sharded indexes and the shared `write_data_file()`/`encode_profile()` helpers.
+"""
+
+import argparse
+import gzip
+import importlib.util
+import json
+import marshal
+import os
+import threading
+import time
+from collections.abc import Mapping
+
+try:
+    import zstandard # Optional: only needed for the 'zstd' artifact profile.
+except ImportError:
+    zstandard = None
+
+BINARY_MAGIC = b"SAGAIDX"
+BINARY_FORMAT_VERSION = 1
+BINARY_EXTENSION = ".sagabin"
+MARSHAL_VERSION = 4
+_HEADER = BINARY_MAGIC + bytes([BINARY_FORMAT_VERSION]) + importlib.util.MAGIC_NUMBER
+
+# Extra artifacts the compiler can write next to the pretty-printed JSON output.
+# Checked longest-suffix first by get_profile_for_path().
+ARTIFACT_PROFILES = {
+    "minified": ".min.json",
+    "gzip": ".json.gz",
+    "zstd": ".json.zst",
+    "binary": BINARY_EXTENSION,
+}
+PROFILE_EXTENSIONS = dict(ARTIFACT_PROFILES, pretty=".json")
+TOC_FORMAT_VERSION = 1
+ZSTD_LEVEL = 19
+MINIFIED_SEPARATORS = (',', ':')
+
+class CompiledIndexFormatError(ValueError):
+    """Raised when a compiled artifact cannot be read by this interpreter/environment."""
+
+def get_binary_path(json_output_file):
+    """Returns the .sagabin path that sits next to a compiled .json output file."""
+    base, _ = os.path.splitext(json_output_file)
+    return f"{base}{BINARY_EXTENSION}"
+
+def get_artifact_path(json_output_file, profile):
+    """Returns the path of the given artifact profile next to a compiled .json output file."""
+    base, _ = os.path.splitext(json_output_file)
+    return f"{base}{ARTIFACT_PROFILES[profile]}"
+
+def get_profile_for_path(file_path):
+    """Returns the artifact profile for a file path, or 'pretty' for plain .json."""
+    for profile, suffix in sorted(ARTIFACT_PROFILES.items(), key=lambda item: len(item[1]), reverse=True):
+        if file_path.endswith(suffix): return profile
+    return "pretty"
+
+def _minified_json_bytes(compiled_data):
+    return json.dumps(compiled_data, separators=MINIFIED_SEPARATORS, ensure_ascii=False).encode('utf-8')
+
+def _atomic_write_bytes(output_file, payload):
+    temp_file = f"{output_file}.tmp"
+    try:
+        with open(temp_file, 'wb') as f: f.write(payload)
+        os.replace(temp_file, output_file)
+    finally:
+        if os.path.exists(temp_file): os.remove(temp_file)
+
+def encode_profile(data, profile):
+    """
+    Serializes data to bytes in the given profile ("pretty" or any ARTIFACT_PROFILES key).
+
+    Raises:
+        CompiledIndexFormatError: If the profile is unknown or its optional codec is missing.
+    """
+    if profile == "pretty":
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    if profile == "minified":
+        return _minified_json_bytes(data)
+    if profile == "gzip":
+        # mtime=0 keeps the artifact byte-identical between runs with the same data.
+        return gzip.compress(_minified_json_bytes(data), compresslevel=9, mtime=0)
+    if profile == "zstd":
+        if zstandard is None:
+            raise CompiledIndexFormatError("The 'zstd' profile requires the 'zstandard' package (pip install zstandard).")
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(_minified_json_bytes(data))
+    if profile == "binary":
+        return _HEADER + marshal.dumps(data, MARSHAL_VERSION)
+    raise CompiledIndexFormatError(f"Unknown artifact profile '{profile}'.")
+
+def write_data_file(data, output_file, profile):
+    """
+    Atomically writes data to output_file in the given profile.
+
+    Returns:
+        bool: True on success, False otherwise (the reason is printed).
+    """
+    try:
+        _atomic_write_bytes(output_file, encode_profile(data, profile))
+        return True
+    except CompiledIndexFormatError as e:
+        print(f"Warning: {e} Skipping {output_file}.")
+        return False
+    except (IOError, OSError, ValueError) as e:
+        print(f"Error writing {profile} file {output_file}: {e}")
+        return False
+
+def write_artifact(compiled_data, json_output_file, profile):
+    """
+    Writes one artifact profile of compiled_data next to json_output_file.
+
+    Args:
+        compiled_data (dict): The nested compiled index.
+        json_output_file (str): Path of the main (pretty) compiled JSON output.
+        profile (str): One of ARTIFACT_PROFILES.
+
+    Returns:
+        bool: True on success, False otherwise.
+    """
+    artifact_path = get_artifact_path(json_output_file, profile)
+    if not write_data_file(compiled_data, artifact_path, profile): return False
+    print(f"{profile.capitalize()} artifact saved to: {artifact_path}")
+    return True
+
+def write_binary_index(compiled_data, output_file):
+    """
+    Writes compiled_data to output_file in the .sagabin format.
+
+    Returns:
+        bool: True on success, False otherwise.
+    """
+    if not write_data_file(compiled_data, output_file, "binary"): return False
+    print(f"Binary index saved to: {output_file}")
+    return True
+
+def load_binary_index(binary_file):
+    """
+    Reads a .sagabin artifact back into the nested compiled structure.
+
+    Raises:
+        CompiledIndexFormatError: If the header does not match this interpreter/format.
+    """
+    with open(binary_file, 'rb') as f:
+        raw_bytes = f.read()
+    if not raw_bytes.startswith(BINARY_MAGIC):
+        raise CompiledIndexFormatError(f"'{binary_file}' is not a SAGA binary index.")
+    if raw_bytes[:len(_HEADER)] != _HEADER:
+        raise CompiledIndexFormatError(f"'{binary_file}' was written by a different format or Python version.")
+    try:
+        return marshal.loads(memoryview(raw_bytes)[len(_HEADER):])
+    except (EOFError, ValueError, TypeError) as e:
+        raise CompiledIndexFormatError(f"'{binary_file}' is damaged: {e}")
+
+def _load_zstd_json(file_path):
+    if zstandard is None:
+        raise CompiledIndexFormatError(f"Reading '{file_path}' requires the 'zstandard' package (pip install zstandard).")
+    with open(file_path, 'rb') as f:
+        return json.loads(zstandard.ZstdDecompressor().decompress(f.read()))
+
+def load_compiled_index(file_path):
+    """
+    Loads a compiled index, picking the format from the file extension
+    (.json, .min.json, .json.gz, .json.zst or .sagabin).
+    A .sagabin that cannot be read falls back to the .json next to it.
+    """
+    profile = get_profile_for_path(file_path)
+    if profile == "binary":
+        try:
+            return load_binary_index(file_path)
+        except (CompiledIndexFormatError, IOError) as e:
+            json_fallback = file_path[:-len(BINARY_EXTENSION)] + ".json"
+            if not os.path.exists(json_fallback): raise
+            print(f"Warning: {e} Falling back to {json_fallback}.")
+            file_path = json_fallback
+    elif profile == "gzip":
+        with gzip.open(file_path, 'rb') as f:
+            return json.loads(f.read())
+    elif profile == "zstd":
+        return _load_zstd_json(file_path)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def get_toc_path(json_output_file):
+    """Returns the shard table-of-contents path that sits next to a compiled .json output file."""
+    base, _ = os.path.splitext(json_output_file)
+    return f"{base}.toc.json"
+
+def get_shard_dir(json_output_file):
+    """Returns the directory holding one shard per source file for a compiled .json output file."""
+    base, _ = os.path.splitext(json_output_file)
+    return f"{base}_shards"
+
+def get_shard_path(shard_dir, path_parts, profile):
+    """Returns the shard file path for a source file's key path (e.g. ['character_elements', 'feats'])."""
+    return os.path.join(shard_dir, *path_parts) + PROFILE_EXTENSIONS[profile]
+
+class LazySagaIndex(Mapping):
+    """
+    Read-only mapping over a sharded compiled index that mirrors the nested layout of
+    compiled_saga_index.json, loading each shard on first access and caching it.
+
+        index = LazySagaIndex("compiled_output/compiled_saga_index.toc.json")
+        feats = index["character_elements"]["feats"]      # loads one shard
+        feats = index["character_elements.feats"]         # same, dotted key path
+        "index_elements" in index                         # no shard loaded
+
+    Directory levels are returned as LazySagaIndex views over the same shared cache.
+    """
+    def __init__(self, toc_file, _state=None, _prefix=()):
+        if _state is None:
+            with open(toc_file, 'r', encoding='utf-8') as f:
+                toc = json.load(f)
+            if toc.get("format_version") != TOC_FORMAT_VERSION:
+                raise CompiledIndexFormatError(f"'{toc_file}' has an unsupported table-of-contents format.")
+            toc_dir = os.path.dirname(os.path.abspath(toc_file))
+            shards = {}
+            for shard in toc.get("shards", []):
+                shards[tuple(shard["key_path"].split("."))] = os.path.join(toc_dir, *shard["path"].split("/"))
+            _state = {"shards": shards, "cache": {}, "lock": threading.Lock()}
+        self._state = _state
+        self._prefix = _prefix
+        self._children = []
+        for key_path in _state["shards"]:
+            if len(key_path) > len(_prefix) and key_path[:len(_prefix)] == _prefix and key_path[len(_prefix)] not in self._children:
+                self._children.append(key_path[len(_prefix)])
+
+    def _load_shard(self, key_path):
+        cache = self._state["cache"]
+        if key_path not in cache:
+            with self._state["lock"]:
+                if key_path not in cache:
+                    cache[key_path] = load_compiled_index(self._state["shards"][key_path])
+        return cache[key_path]
+
+    def __getitem__(self, key):
+        node = self
+        for part in str(key).split("."):
+            if not isinstance(node, LazySagaIndex):
+                node = node[int(part)] if isinstance(node, list) else node[part] # Inside a loaded shard
+                continue
+            if part not in node._children:
+                raise KeyError(key)
+            key_path = node._prefix + (part,)
+            if key_path in node._state["shards"]:
+                node = node._load_shard(key_path)
+            else:
+                node = LazySagaIndex(None, _state=node._state, _prefix=key_path)
+        return node
+
+    def __iter__(self):
+        return iter(self._children)
+
+    def __len__(self):
+        return len(self._children)
+
+    def __contains__(self, key):
+        parts = tuple(str(key).split("."))
+        key_path = self._prefix + parts
+        shards = self._state["shards"]
+        # Directory levels and shard roots are answered from the table of contents alone.
+        if any(shard_path[:len(key_path)] == key_path for shard_path in shards):
+            return True
+        for depth in range(len(self._prefix) + 1, len(key_path)):
+            if key_path[:depth] in shards:
+                try: self[".".join(parts)]
+                except (KeyError, IndexError, TypeError, ValueError): return False
+                return True
+        return False
+
+    def loaded_shards(self):
+        """Returns the dotted key paths of the shards loaded so far."""
+        return [".".join(key_path) for key_path in self._state["cache"]]
+
+    def to_dict(self):
+        """Loads every shard below this level and returns a plain nested dict."""
+        return {key: (value.to_dict() if isinstance(value, LazySagaIndex) else value) for key, value in self.items()}
+
+def _time_load(load_function, file_path, repeats):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        load_function(file_path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def run_benchmark(json_file, repeats=5):
+    """
+    Compares size and best-of-N load time of the compiled JSON against every artifact
+    profile next to it. The binary artifact is (re)built from the JSON if it is missing.
+    """
+    binary_file = get_binary_path(json_file)
+    reference_data = load_compiled_index(json_file)
+    if not os.path.exists(binary_file):
+        print(f"No binary artifact found. Building {binary_file} from {json_file}...")
+        write_binary_index(reference_data, binary_file)
+
+    results = [("pretty", json_file, _time_load(load_compiled_index, json_file, repeats))]
+    for profile in ARTIFACT_PROFILES:
+        artifact_path = get_artifact_path(json_file, profile)
+        if not os.path.exists(artifact_path): continue
+        try:
+            if load_compiled_index(artifact_path) != reference_data:
+                print(f"Warning: {profile} artifact does not match the JSON output. Recompile before benchmarking.")
+            results.append((profile, artifact_path, _time_load(load_compiled_index, artifact_path, repeats)))
+        except CompiledIndexFormatError as e:
+            print(f"Skipping {profile}: {e}")
+    json_size = os.path.getsize(json_file); json_time = results[0][2]
+    print(f"\n--- Compiled Index Load Benchmark (best of {repeats}) ---")
+    for label, path, elapsed in results:
+        size = os.path.getsize(path)
+        print(f"  {label:<9} {size / 1024:>10.1f} KB ({size / json_size:>6.1%})  {elapsed * 1000:>8.1f} ms ({json_time / elapsed:>5.2f}x)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load or benchmark a compiled SAGA index (.json or .sagabin).", formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("compiled_file", help="Path to a compiled index (.json, .min.json, .json.gz, .json.zst or .sagabin).")
+    parser.add_argument("--benchmark", action="store_true", help="Compare load time and size of the JSON output and every artifact next to it.")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of timed loads per format for --benchmark (default: 5).")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        profile = get_profile_for_path(args.compiled_file)
+        json_path = args.compiled_file if profile == "pretty" else args.compiled_file[:-len(ARTIFACT_PROFILES[profile])] + ".json"
+        run_benchmark(json_path, args.repeats)
+    else:
+        start = time.perf_counter()
+        try:
+            index = load_compiled_index(args.compiled_file)
+        except CompiledIndexFormatError as e:
+            print(f"Error: {e}"); exit(1)
+        print(f"Loaded {len(index)} top-level categories from {args.compiled_file} in {(time.perf_counter() - start) * 1000:.1f} ms.")
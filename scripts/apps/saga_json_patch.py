@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: saga_json_patch.py
+Version: 1.0.0
+Date: 2026-10-18
+
+Purpose:
+JSON Patch (RFC 6902) engine used by `json_updater.py` to apply the `payload`
+operation lists of 'update' edits. Pointer paths are parsed once and cached, a
+whole operation list is applied to a record in one pass, and the list is atomic:
+if any operation fails, every operation already applied is undone and the record
+is left exactly as it was.
+
+Supported Operations:
+    * `add`, `remove`, `replace`, `move`, `copy`, `test` (RFC 6902 section 4).
+    * Array indices are decimal digits; `-` in `add`/`move`/`copy` appends.
+
+Compatibility With Existing Edit Files:
+    * Paths are parsed the way `json_updater.py` always has: leading/trailing and
+        repeated `/` are ignored (so `page` and `/page/` both mean `/page`), and
+        `~1`/`~0` are decoded to `/` and `~`.
+    * `replace` on an object creates the member if it is missing (RFC 6902 would
+        reject it); edit files have long relied on this.
+    * `test` compares JSON values: `1 == 1.0`, but `true` is not `1`.
+
+Instructions for Use:
+    from saga_json_patch import apply_patch, JsonPatchError
+    try:
+        record = apply_patch(record, [{"op": "test", "path": "/page", "value": "39"},
+                                      {"op": "replace", "path": "/page", "value": "40"}])
+    except JsonPatchError as e:
+        print(f"Patch rejected, record unchanged: {e}")
+    The return value is the patched document; it is a different object only when
+    an operation replaced the root (path "").
+
+Version Notes:
+* 1.0.0 (2026-10-18): Initial release. Cached pointer parsing, full RFC 6902 op set, undo-log rollback.
+"""
+
+import copy
+import functools
+
+PATCH_OPERATIONS = ("add", "remove", "replace", "move", "copy", "test")
+_MISSING = object()
+
+class JsonPatchError(Exception):
+    """Raised when a patch operation is invalid or cannot be applied. The document is left unchanged."""
+
+@functools.lru_cache(maxsize=8192)
+def parse_pointer(path):
+    """Returns the decoded segments of a JSON Pointer path as a tuple (cached; `""` is the root)."""
+    return tuple(segment.replace("~1", "/").replace("~0", "~") for segment in path.strip("/").split("/") if segment)
+
+def format_pointer(segments):
+    return "/" + "/".join(segment.replace("~", "~0").replace("/", "~1") for segment in segments)
+
+def _json_equal(left, right):
+    if isinstance(left, bool) or isinstance(right, bool): return type(left) is type(right) and left == right
+    if isinstance(left, (int, float)) and isinstance(right, (int, float)): return left == right
+    if type(left) is not type(right): return False
+    if isinstance(left, dict): return left.keys() == right.keys() and all(_json_equal(left[key], right[key]) for key in left)
+    if isinstance(left, list): return len(left) == len(right) and all(_json_equal(a, b) for a, b in zip(left, right))
+    return left == right
+
+def _list_index(container, segment, allow_end=False):
+    if allow_end and segment == "-": return len(container)
+    if not segment.isdigit(): raise JsonPatchError(f"'{segment}' is not an array index")
+    return int(segment)
+
+def _resolve(document, segments):
+    container = document
+    for segment in segments:
+        try:
+            container = container[_list_index(container, segment)] if isinstance(container, list) else container[segment]
+        except (KeyError, IndexError, TypeError):
+            raise JsonPatchError(f"path {format_pointer(segments)} not found") from None
+    return container
+
+def top_level_keys(operations):
+    """Returns the first path segment of every location the operations may modify (for copy-on-write callers)."""
+    keys = set()
+    for operation in operations:
+        if not isinstance(operation, dict) or operation.get("op") == "test": continue
+        for field in ("path", "from"):
+            if isinstance(operation.get(field), str):
+                segments = parse_pointer(operation[field])
+                if segments: keys.add(segments[0])
+    return keys
+
+class _PatchRun:
+    # One apply_patch() call: the current root plus an undo log of (callable, args) entries.
+    def __init__(self, document, allow_root_replace):
+        self.document = document; self.original_document = document
+        self.allow_root_replace = allow_root_replace
+        self.undo_log = []
+
+    def rollback(self):
+        for undo_function, undo_args in reversed(self.undo_log): undo_function(*undo_args)
+        self.undo_log.clear(); self.document = self.original_document
+
+    def _replace_root(self, value, op_name):
+        if not self.allow_root_replace: raise JsonPatchError(f"'{op_name}' of the document root is not allowed here")
+        self.document = value
+
+    def add(self, segments, value, op_name="add"):
+        if not segments: return self._replace_root(value, op_name)
+        parent = _resolve(self.document, segments[:-1]); key = segments[-1]
+        if isinstance(parent, list):
+            index = _list_index(parent, key, allow_end=True)
+            if index > len(parent): raise JsonPatchError(f"index {index} is out of range for {format_pointer(segments)}")
+            parent.insert(index, value); self.undo_log.append((parent.pop, (index,)))
+        elif isinstance(parent, dict):
+            previous = parent.get(key, _MISSING)
+            parent[key] = value
+            self.undo_log.append((parent.pop, (key,)) if previous is _MISSING else (parent.__setitem__, (key, previous)))
+        else: raise JsonPatchError(f"parent of {format_pointer(segments)} is not an object or array")
+
+    def remove(self, segments):
+        if not segments: raise JsonPatchError("cannot remove the document root")
+        parent = _resolve(self.document, segments[:-1]); key = segments[-1]
+        if isinstance(parent, list):
+            index = _list_index(parent, key)
+            if index >= len(parent): raise JsonPatchError(f"path {format_pointer(segments)} not found")
+            value = parent.pop(index); self.undo_log.append((parent.insert, (index, value)))
+        elif isinstance(parent, dict):
+            if key not in parent: raise JsonPatchError(f"path {format_pointer(segments)} not found")
+            saved_items = list(parent.items()) # Restoring all items keeps the member order on rollback
+            value = parent.pop(key); self.undo_log.append((_restore_items, (parent, saved_items)))
+        else: raise JsonPatchError(f"parent of {format_pointer(segments)} is not an object or array")
+        return value
+
+    def replace(self, segments, value):
+        if not segments: return self._replace_root(value, "replace")
+        parent = _resolve(self.document, segments[:-1]); key = segments[-1]
+        if isinstance(parent, list):
+            index = _list_index(parent, key)
+            if index >= len(parent): raise JsonPatchError(f"path {format_pointer(segments)} not found")
+            self.undo_log.append((parent.__setitem__, (index, parent[index]))); parent[index] = value
+        elif isinstance(parent, dict): self.add(segments, value, op_name="replace") # Lenient: creates a missing member
+        else: raise JsonPatchError(f"parent of {format_pointer(segments)} is not an object or array")
+
+    def apply(self, operation):
+        if not isinstance(operation, dict): raise JsonPatchError(f"operation must be an object, got {type(operation).__name__}")
+        op_name = operation.get("op"); path = operation.get("path")
+        if op_name not in PATCH_OPERATIONS: raise JsonPatchError(f"unknown op '{op_name}'")
+        if not isinstance(path, str): raise JsonPatchError(f"'{op_name}' requires a string 'path'")
+        segments = parse_pointer(path)
+        if op_name in ("add", "replace", "test") and "value" not in operation: raise JsonPatchError(f"'{op_name}' {path} requires a 'value'")
+        if op_name == "add": self.add(segments, operation["value"])
+        elif op_name == "remove": self.remove(segments)
+        elif op_name == "replace": self.replace(segments, operation["value"])
+        elif op_name == "test":
+            if not _json_equal(_resolve(self.document, segments), operation["value"]): raise JsonPatchError(f"test failed: {format_pointer(segments)} does not equal {operation['value']!r}")
+        else:
+            if not isinstance(operation.get("from"), str): raise JsonPatchError(f"'{op_name}' requires a string 'from'")
+            from_segments = parse_pointer(operation["from"])
+            if op_name == "copy": self.add(segments, copy.deepcopy(_resolve(self.document, from_segments)), op_name="copy")
+            elif from_segments == segments: _resolve(self.document, from_segments) # A move onto itself only has to exist
+            else:
+                if segments[:len(from_segments)] == from_segments: raise JsonPatchError(f"cannot move {format_pointer(from_segments)} into its own child {format_pointer(segments)}")
+                self.add(segments, self.remove(from_segments), op_name="move")
+
+def _restore_items(target_dict, saved_items):
+    target_dict.clear(); target_dict.update(saved_items)
+
+def apply_patch(document, operations, allow_root_replace=True, dry_run=False):
+    """
+    Applies a list of RFC 6902 operations to document, in place and atomically.
+
+    Args:
+        document: The JSON value (usually a record dict) to patch.
+        operations (list): Patch operations ({"op", "path", "value"/"from"}).
+        allow_root_replace (bool): Whether an operation may replace the whole document (path "").
+        dry_run (bool): Apply and then undo every operation, leaving document unchanged;
+            a JsonPatchError still reports whether the patch would apply.
+
+    Returns:
+        The patched document (a new object only if the root was replaced).
+
+    Raises:
+        JsonPatchError: An operation failed; all earlier operations have been undone.
+    """
+    if not isinstance(operations, list): raise JsonPatchError(f"patch must be a list of operations, got {type(operations).__name__}")
+    patch_run = _PatchRun(document, allow_root_replace)
+    for position, operation in enumerate(operations):
+        try: patch_run.apply(operation)
+        except JsonPatchError as e:
+            patch_run.rollback()
+            op_label = operation.get("op") if isinstance(operation, dict) else "invalid"
+            raise JsonPatchError(f"operation {position} ({op_label}): {e}") from None
+    if dry_run: patch_run.rollback()
+    return patch_run.document
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: saga_prerequisite_graph.py
+Version: 1.0.0
+Date: 2026-10-18
+
+Purpose:
+Links the `prerequisites_structured` entries written by
+`saga_character_multi_converter.parse_prerequisites_from_text()` to the records
+they name. The graph is built once (e.g. at compile time) and answers
+"what does this require", "what does this unlock" and "what can I take next"
+with lookups proportional to the number of edges involved, instead of
+re-running text matching over every file.
+
+Graph Contents (`compiled_saga_index.prereq_graph.json`):
+    * `nodes`: one entry per record of feats, talents, skills, classes,
+        prestige_classes, force_powers, force_techniques and species, keyed
+        `<file_key>:<record id or name>` (with ` (<source_book>)` appended if a
+        name appears more than once in a file).
+    * `requires`: node -> resolved prerequisite edges
+        (`{"target", "type", "text"}`), in prerequisite order. "A or B"
+        prerequisites also carry `"alternatives"` (any one satisfies them).
+    * `unlocks`: the reverse edges, target -> `{"source", "type"}`.
+    * `unresolved`: prerequisites that name a record which could not be found.
+        Prerequisites that are not records (ability scores, BAB, "other", ...)
+        are neither linked nor reported.
+    * `sources`: SHA-256 of each source file, so an unchanged graph is not rebuilt.
+
+Resolution Rules:
+    * Names and ids are compared case-insensitively with punctuation folded to
+        `_`, so `armor_proficiency_light`, `Armor Proficiency (light)` and
+        `armor_proficiency_light_cr_82` (id suffix) all match. A trailing
+        qualifier falls back to the base record (`weapon_focus_lightsabers` ->
+        Weapon Focus), and `Know`/`tech` expand to `Knowledge`/`Technology`.
+    * The structured fields are tried first, then the prerequisite's text_description.
+    * `feat`, `feat_or_ability`, `feat_with_chosen_weapon`, `restriction_feat`:
+        feats first, then talents (some "feat" prerequisites are talents), then
+        species and skills for `feat_or_ability` (e.g. "Wookiee", "Stealth").
+    * `talent`, `talent_prerequisite`: talents (the named talent tree breaks ties).
+    * `skill_trained`, `trained_skill`, `skill_rank`, `skill_application_known`: skills.
+    * `class_level`: classes, then prestige classes.
+    * `force_power`, `force_power_known`: force powers. `force_technique`: force techniques.
+
+Instructions for Use:
+    * Build it with the compiler: `python compile_saga_data.py --prerequisite_graph`
+        or standalone: `python saga_prerequisite_graph.py build --data_dir ../../data`
+    * Query it from the command line:
+        `python saga_prerequisite_graph.py show feats "Dodge"`
+    * Query it from Python:
+        from saga_prerequisite_graph import PrerequisiteGraph
+        graph = PrerequisiteGraph("compiled_output/compiled_saga_index.prereq_graph.json")
+        dodge = graph.find_node("feats", "Dodge")
+        graph.unlocks(dodge)                  # what Dodge leads to
+        graph.available_next({dodge})         # records whose linked prerequisites are all met
+
+Version Notes:
+* 1.0.0 (2026-10-18): Initial release. Prerequisite resolution, reverse edges and query API.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+
+from saga_record_store import extract_record_list, find_collection_source
+
+GRAPH_FORMAT_VERSION = 1
+GRAPH_COLLECTIONS = ["feats", "talents", "skills", "classes", "prestige_classes", "force_powers", "force_techniques", "species"]
+
+# Prerequisite type -> (fields holding the target name/id, target collections in priority order)
+PREREQUISITE_TARGETS = {
+    "feat": (["feat_id", "name"], ["feats", "talents"]),
+    "feat_or_ability": (["name"], ["feats", "talents", "species", "skills"]),
+    "feat_with_chosen_weapon": (["feat_id", "name"], ["feats"]),
+    "restriction_feat": (["name"], ["feats"]),
+    "talent": (["talent_id", "talent_name"], ["talents"]),
+    "talent_prerequisite": (["talent_name"], ["talents"]),
+    "skill_trained": (["skill_name"], ["skills"]),
+    "trained_skill": (["name"], ["skills"]),
+    "skill_rank": (["skill_name"], ["skills"]),
+    "skill_application_known": (["skill_id"], ["skills"]),
+    "class_level": (["class_name"], ["classes", "prestige_classes"]),
+    "force_power": (["name"], ["force_powers"]),
+    "force_power_known": (["power_name"], ["force_powers"]),
+    "force_technique": (["name"], ["force_techniques"]),
+}
+# Whole-token abbreviations used in prerequisite text, e.g. 'Trained in Know (tech)'.
+REFERENCE_ALIASES = {"know": "knowledge", "tech": "technology", "use_force": "use_the_force"}
+
+def get_graph_path(json_output_file):
+    """Returns the prerequisite graph path that sits next to a compiled .json output file."""
+    base, _ = os.path.splitext(json_output_file)
+    return f"{base}.prereq_graph.json"
+
+def normalize_reference(text):
+    """Folds a record name or id to a comparison key: 'Armor Proficiency (Light)' -> 'armor_proficiency_light'."""
+    return re.sub(r"[^a-z0-9]+", "_", str(text).lower()).strip("_")
+
+def _expand_aliases(reference):
+    reference = REFERENCE_ALIASES.get(reference, reference)
+    return "_".join(REFERENCE_ALIASES.get(token, token) for token in reference.split("_"))
+
+def _reference_alternatives(value):
+    """
+    Returns the candidate references of one prerequisite value as a list of alternatives,
+    each a list of normalized keys to try in order ('Pilot or Ride' -> [['pilot'], ['ride']]).
+    """
+    value = re.sub(r"^\s*(?:trained in|talents?:|feats?:|force powers?:|force techniques?:)?\s*(?:the\s+)?", "", str(value), flags=re.IGNORECASE)
+    alternatives = []
+    for option in re.split(r"\s+or\s+", value):
+        option = re.sub(r"\s+(?:skill|species)$", "", option.strip(" .*"), flags=re.IGNORECASE)
+        # 'Weapon Focus (rifles)' style names also try the base name.
+        keys = [normalize_reference(option), normalize_reference(re.sub(r"\s*\(.*\)$", "", option))]
+        keys = [_expand_aliases(_strip_id_suffix(key)) for key in dict.fromkeys(keys) if key]
+        if keys: alternatives.append(keys)
+    return alternatives
+
+def _lookup_reference(file_lookup, reference):
+    if reference in file_lookup: return file_lookup[reference]
+    # 'weapon_proficiency_heavy_weapons' -> 'weapon_proficiency': drop trailing tokens down to the base record.
+    tokens = reference.split("_")
+    for cut in range(len(tokens) - 1, 0, -1):
+        if "_".join(tokens[:cut]) in file_lookup: return file_lookup["_".join(tokens[:cut])]
+    return None
+
+def _strip_id_suffix(record_id):
+    # Converter ids end in '_<book>_<page>' (e.g. 'armor_proficiency_light_cr_82').
+    return re.sub(r"_[a-z0-9]+_\d+$", "", record_id)
+
+def _build_nodes(collections):
+    """Returns (nodes, lookup) where lookup[file_key][normalized name/id] -> [node keys]."""
+    nodes, lookup = {}, {}
+    for file_key, records in collections.items():
+        name_counts = {}
+        for record in records:
+            if isinstance(record, dict) and record.get("name"): name_counts[record["name"]] = name_counts.get(record["name"], 0) + 1
+        file_lookup = lookup.setdefault(file_key, {})
+        for position, record in enumerate(records):
+            if not isinstance(record, dict) or not (record.get("id") or record.get("name")): continue
+            label = record.get("id") or record["name"]
+            if not record.get("id") and name_counts.get(record["name"], 0) > 1 and record.get("source_book"):
+                label = f"{record['name']} ({record['source_book']})"
+            node_key = f"{file_key}:{label}"
+            if node_key in nodes: node_key = f"{node_key}#{position}"
+            nodes[node_key] = {"file_key": file_key, "id": record.get("id"), "name": record.get("name"), "source_book": record.get("source_book"), "talent_tree": record.get("talent_tree"), "position": position}
+            references = {normalize_reference(record.get("name", ""))}
+            if record.get("id"):
+                references.add(normalize_reference(record["id"]))
+                references.add(normalize_reference(_strip_id_suffix(normalize_reference(record["id"]))))
+            for reference in references - {""}:
+                file_lookup.setdefault(reference, []).append(node_key)
+    return nodes, lookup
+
+def _resolve(prerequisite, nodes, lookup):
+    """
+    Returns the node keys a prerequisite refers to (more than one for 'A or B'), an
+    empty list if it names an unknown record, or None if it is not a record reference.
+    The structured fields are tried in order (e.g. talent_id, then talent_name), then
+    text_description.
+    """
+    target_rule = PREREQUISITE_TARGETS.get(prerequisite.get("type"))
+    if not target_rule: return None
+    fields, target_collections = target_rule
+    values = [prerequisite[field] for field in fields if prerequisite.get(field)]
+    if prerequisite.get("text_description"): values.append(prerequisite["text_description"])
+    for value in values:
+        targets = []
+        for keys in _reference_alternatives(value):
+            target = None
+            for file_key in target_collections:
+                for reference in keys:
+                    candidates = _lookup_reference(lookup.get(file_key, {}), reference)
+                    if not candidates: continue
+                    target = candidates[0]
+                    if len(candidates) > 1 and prerequisite.get("required_talent_tree"):
+                        target = next((node_key for node_key in candidates if nodes[node_key].get("talent_tree") == prerequisite["required_talent_tree"]), target)
+                    break
+                if target: break
+            if target is None: break # Every alternative must be a known record.
+            targets.append(target)
+        else:
+            if targets: return list(dict.fromkeys(targets))
+    return []
+
+def build_prerequisite_graph(collections):
+    """
+    Builds the graph from {file_key: record list}.
+
+    Returns:
+        dict: {"nodes", "requires", "unlocks", "unresolved"} (see script header).
+    """
+    nodes, lookup = _build_nodes(collections)
+    requires, unlocks, unresolved = {}, {}, []
+    for node_key, node in nodes.items():
+        record = collections[node["file_key"]][node["position"]]
+        for prerequisite in record.get("prerequisites_structured") or []:
+            if not isinstance(prerequisite, dict): continue
+            targets = _resolve(prerequisite, nodes, lookup)
+            if targets is None: continue
+            text = prerequisite.get("text_description") or next((prerequisite[field] for field in PREREQUISITE_TARGETS[prerequisite["type"]][0] if prerequisite.get(field)), "")
+            if not targets:
+                unresolved.append({"source": node_key, "type": prerequisite["type"], "text": text})
+                continue
+            targets = [target for target in targets if target != node_key]
+            if not targets: continue
+            edge = {"target": targets[0], "type": prerequisite["type"], "text": text}
+            if len(targets) > 1: edge["alternatives"] = targets # Any one of them satisfies the prerequisite
+            requires.setdefault(node_key, []).append(edge)
+            for target in targets:
+                unlocks.setdefault(target, []).append({"source": node_key, "type": prerequisite["type"]})
+    return {"nodes": nodes, "requires": requires, "unlocks": unlocks, "unresolved": unresolved}
+
+def load_graph_collections(base_data_dir):
+    """Returns ({file_key: record list}, {file_key: sha256}) for the graph collections found under base_data_dir."""
+    collections, sources = {}, {}
+    for file_key in GRAPH_COLLECTIONS:
+        source_file = find_collection_source(base_data_dir, file_key)
+        if source_file is None:
+            print(f"Warning: No '{file_key}.json' found under '{base_data_dir}'. Its records will not be linked.")
+            continue
+        try:
+            with open(source_file, 'rb') as f:
+                raw_bytes = f.read()
+            records = extract_record_list(json.loads(raw_bytes.decode('utf-8')), file_key)
+        except (IOError, UnicodeDecodeError, json.JSONDecodeError) as e:
+            print(f"Error reading {source_file}: {e}. Its records will not be linked.")
+            continue
+        if records is None: continue
+        collections[file_key] = records
+        sources[file_key] = hashlib.sha256(raw_bytes).hexdigest()
+    return collections, sources
+
+def write_prerequisite_graph(base_data_dir, graph_file, force=False):
+    """
+    Builds the graph from base_data_dir and writes it to graph_file, unless the source
+    files are unchanged since the graph was last written.
+
+    Returns:
+        bool: True if the graph on disk is up to date, False on failure.
+    """
+    collections, sources = load_graph_collections(base_data_dir)
+    if not collections:
+        print("Error: None of the prerequisite graph collections could be loaded.")
+        return False
+    if not force and os.path.exists(graph_file):
+        try:
+            with open(graph_file, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+            if previous.get("format_version") == GRAPH_FORMAT_VERSION and previous.get("sources") == sources:
+                return True
+        except (IOError, json.JSONDecodeError):
+            pass # Rebuilt below.
+
+    graph = dict(format_version=GRAPH_FORMAT_VERSION, sources=sources, **build_prerequisite_graph(collections))
+    temp_file = f"{graph_file}.tmp"
+    try:
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(graph, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_file, graph_file)
+    except (IOError, OSError) as e:
+        print(f"Error writing prerequisite graph {graph_file}: {e}")
+        if os.path.exists(temp_file): os.remove(temp_file)
+        return False
+    edge_count = sum(len(edges) for edges in graph["requires"].values())
+    print(f"Prerequisite graph saved to: {graph_file} ({len(graph['nodes'])} nodes, {edge_count} edges, {len(graph['unresolved'])} unresolved)")
+    return True
+
+class PrerequisiteGraph:
+    """Read-only queries over a graph file written by write_prerequisite_graph()."""
+    def __init__(self, graph_file):
+        with open(graph_file, 'r', encoding='utf-8') as f:
+            graph = json.load(f)
+        if graph.get("format_version") != GRAPH_FORMAT_VERSION:
+            raise ValueError(f"'{graph_file}' has an unsupported prerequisite graph format. Rebuild it.")
+        self.nodes = graph["nodes"]
+        self._requires = graph["requires"]
+        self._unlocks = graph["unlocks"]
+        self.unresolved = graph["unresolved"]
+        self._lookup = {}
+        for node_key, node in self.nodes.items():
+            for reference in (node.get("name"), node.get("id")):
+                if reference: self._lookup.setdefault((node["file_key"], normalize_reference(reference)), []).append(node_key)
+
+    def find_node(self, file_key, name_or_id):
+        """Returns the node key for a record of file_key by name or id, or None."""
+        if f"{file_key}:{name_or_id}" in self.nodes: return f"{file_key}:{name_or_id}"
+        matches = self._lookup.get((file_key, normalize_reference(name_or_id)))
+        return matches[0] if matches else None
+
+    def requires(self, node_key):
+        """Returns the resolved prerequisite edges of a node."""
+        return self._requires.get(node_key, [])
+
+    def unlocks(self, node_key):
+        """Returns the reverse edges: records that list node_key as a prerequisite."""
+        return self._unlocks.get(node_key, [])
+
+    def available_next(self, owned_node_keys):
+        """
+        Returns the node keys (not already owned) whose linked prerequisites are all in
+        owned_node_keys and that depend on at least one of them. Non-record requirements
+        (ability scores, BAB, ...) are not checked here.
+        """
+        owned = set(owned_node_keys)
+        candidates = {edge["source"] for node_key in owned for edge in self.unlocks(node_key)} - owned
+        def is_met(edge):
+            met = any(target in owned for target in edge.get("alternatives", [edge["target"]]))
+            return not met if edge["type"] == "restriction_feat" else met
+        return sorted(node_key for node_key in candidates if all(is_met(edge) for edge in self.requires(node_key)))
+
+if __name__ == "__main__":
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    default_graph_file = get_graph_path(os.path.join(script_dir, "compiled_output", "compiled_saga_index.json"))
+    parser = argparse.ArgumentParser(description="Build or query the SAGA prerequisite graph. See script header for details.", formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--graph", default=default_graph_file, help="Path of the graph file (default: compiled_output/compiled_saga_index.prereq_graph.json).")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Build the graph from the data directory.")
+    build_parser.add_argument("--data_dir", default=os.path.join(script_dir, '..', '..', 'data'), help="Path to the 'data' directory (default: ../../data).")
+    build_parser.add_argument("--force", action="store_true", help="Rebuild even if the source files are unchanged.")
+    show_parser = subparsers.add_parser("show", help="Show what a record requires and unlocks.")
+    show_parser.add_argument("file_key", help="Collection, e.g. feats or talents.")
+    show_parser.add_argument("name", help="Record name or id.")
+    subparsers.add_parser("unresolved", help="List prerequisites that name an unknown record.")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if not write_prerequisite_graph(args.data_dir, args.graph, force=args.force): exit(1)
+    else:
+        try:
+            graph = PrerequisiteGraph(args.graph)
+        except (IOError, ValueError, json.JSONDecodeError) as e:
+            print(f"Error: {e}"); exit(1)
+        if args.command == "unresolved":
+            for entry in graph.unresolved: print(f"{entry['source']}: [{entry['type']}] {entry['text']}")
+            print(f"({len(graph.unresolved)} unresolved)")
+        else:
+            node_key = graph.find_node(args.file_key, args.name)
+            if node_key is None:
+                print(f"No '{args.file_key}' record named '{args.name}'."); exit(1)
+            print(f"{node_key}")
+            print("  Requires:")
+            for edge in graph.requires(node_key): print(f"    - {edge['target']} [{edge['type']}]")
+            print("  Unlocks:")
+            for edge in graph.unlocks(node_key): print(f"    - {edge['source']} [{edge['type']}]")
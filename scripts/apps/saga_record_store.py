@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: saga_record_store.py
+Version: 1.0.0
+Date: 2026-10-18
+
+Purpose:
+Point lookups into the large Star Wars Saga Edition list files (talents, starships,
+species, droid chassis, feats) without parsing the whole file. A build step writes
+each `<name>_data.<name>_list` collection into a flat record file (one minified
+JSON record per line) plus a sidecar offset index. The reader memory-maps the
+record file and decodes only the record that was asked for.
+
+Store Layout (default: `compiled_output/compiled_saga_index_records/`):
+    * `<name>.records`: every record of the collection as a minified JSON blob,
+        one per line, in source order.
+    * `<name>.records.idx.json`: format version, source file signature
+        (mtime/size) and record file size, the (offset, length) of every record,
+        and lookup tables mapping `id`, `name` and `name` + `source_book` to
+        record positions. Names are not unique (e.g. the same talent printed
+        in two books), so every table maps to a list of positions.
+
+Instructions for Use:
+    * Build (or refresh) the store. Collections whose source file is unchanged
+        are skipped:
+        `python saga_record_store.py build --data_dir ../../data`
+        or as part of a compile: `python compile_saga_data.py --record_store`
+    * Look up a record from the command line:
+        `python saga_record_store.py get talents --name "Accurate Blow" --source_book C`
+    * Look up a record from Python:
+        from saga_record_store import RecordStore
+        with RecordStore("compiled_output/compiled_saga_index_records", "talents") as talents:
+            record = talents.get(name="Accurate Blow", source_book="C")
+    * Compare a cold point lookup against loading the whole JSON file:
+        `python saga_record_store.py benchmark talents --name "Accurate Blow" --data_dir ../../data`
+
+Version Notes:
+* 1.0.0 (2026-10-18): Initial release. Record file/offset index builder, mmap reader and CLI.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import time
+
+RECORD_STORE_FORMAT_VERSION = 1
+RECORD_EXTENSION = ".records"
+INDEX_EXTENSION = ".records.idx.json"
+DEFAULT_COLLECTIONS = ["talents", "starships", "species", "droid_chassis", "feats"]
+NAME_SOURCE_SEPARATOR = "\u001f" # Joins name and source_book into one index key
+
+class RecordStoreError(ValueError):
+    """Raised when a record store is missing, stale or does not match its index."""
+
+def get_record_store_dir(json_output_file):
+    """Returns the record store directory that sits next to a compiled .json output file."""
+    base, _ = os.path.splitext(json_output_file)
+    return f"{base}_records"
+
+def get_record_file_path(store_dir, collection_name):
+    return os.path.join(store_dir, f"{collection_name}{RECORD_EXTENSION}")
+
+def get_index_file_path(store_dir, collection_name):
+    return os.path.join(store_dir, f"{collection_name}{INDEX_EXTENSION}")
+
+def find_collection_source(base_data_dir, collection_name):
+    """Returns the path of '<collection_name>.json' under base_data_dir (skipping 'backup' folders), or None."""
+    for root, dirs, files in os.walk(base_data_dir):
+        dirs[:] = [d for d in dirs if d.lower() != 'backup']
+        if f"{collection_name}.json" in files:
+            return os.path.join(root, f"{collection_name}.json")
+    return None
+
+def extract_record_list(file_content, collection_name):
+    """
+    Returns the record list of a '<name>_data.<name>_list' file, or None if the
+    file does not have that layout.
+    """
+    data_wrapper = file_content.get(f"{collection_name}_data") if isinstance(file_content, dict) else None
+    if not isinstance(data_wrapper, dict): return None
+    records = data_wrapper.get(f"{collection_name}_list")
+    if records is None: # e.g. vehicles.json uses 'vehicle_list'
+        records = next((value for key, value in data_wrapper.items() if key.endswith("_list") and isinstance(value, list)), None)
+    return records if isinstance(records, list) else None
+
+def _atomic_write_bytes(output_file, payload):
+    temp_file = f"{output_file}.tmp"
+    try:
+        with open(temp_file, 'wb') as f: f.write(payload)
+        os.replace(temp_file, output_file)
+    finally:
+        if os.path.exists(temp_file): os.remove(temp_file)
+
+def _source_signature(source_file):
+    stat_result = os.stat(source_file)
+    return {"mtime_ns": stat_result.st_mtime_ns, "size": stat_result.st_size}
+
+def _read_index(index_file):
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (IOError, json.JSONDecodeError):
+        return None
+
+def build_collection(source_file, store_dir, collection_name, force=False):
+    """
+    Writes the record file and offset index for one collection.
+
+    Returns:
+        str: "built", "unchanged" or "failed".
+    """
+    record_file = get_record_file_path(store_dir, collection_name)
+    index_file = get_index_file_path(store_dir, collection_name)
+    signature = _source_signature(source_file)
+    if not force and os.path.exists(record_file):
+        previous_index = _read_index(index_file)
+        if previous_index and previous_index.get("format_version") == RECORD_STORE_FORMAT_VERSION and \
+           previous_index.get("source_signature") == signature and previous_index.get("record_file_size") == os.path.getsize(record_file):
+            return "unchanged"
+
+    try:
+        with open(source_file, 'r', encoding='utf-8') as f:
+            records = extract_record_list(json.load(f), collection_name)
+    except (IOError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        print(f"Error reading {source_file}: {e}. Skipping '{collection_name}'.")
+        return "failed"
+    if records is None:
+        print(f"Warning: {source_file} has no '{collection_name}_data' record list. Skipping '{collection_name}'.")
+        return "failed"
+
+    blobs = []
+    offsets = []
+    by_id, by_name, by_name_source = {}, {}, {}
+    position_offset = 0
+    for position, record in enumerate(records):
+        blob = json.dumps(record, separators=(',', ':'), ensure_ascii=False).encode('utf-8') + b"\n"
+        blobs.append(blob)
+        offsets.append([position_offset, len(blob) - 1])
+        position_offset += len(blob)
+        if not isinstance(record, dict): continue
+        if record.get("id") is not None:
+            by_id.setdefault(str(record["id"]), []).append(position)
+        if record.get("name") is not None:
+            by_name.setdefault(str(record["name"]), []).append(position)
+            name_source_key = f"{record['name']}{NAME_SOURCE_SEPARATOR}{record.get('source_book') or ''}"
+            by_name_source.setdefault(name_source_key, []).append(position)
+
+    index = {
+        "format_version": RECORD_STORE_FORMAT_VERSION,
+        "collection": collection_name,
+        "source_signature": signature,
+        "record_file_size": position_offset,
+        "offsets": offsets,
+        "by_id": by_id,
+        "by_name": by_name,
+        "by_name_source": by_name_source,
+    }
+    try:
+        os.makedirs(store_dir, exist_ok=True)
+        _atomic_write_bytes(record_file, b"".join(blobs))
+        # The index is written last: a record file without a matching index is rebuilt next time.
+        _atomic_write_bytes(index_file, json.dumps(index, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+    except (IOError, OSError) as e:
+        print(f"Error writing record store for '{collection_name}': {e}")
+        return "failed"
+    print(f"Record store for '{collection_name}' saved to: {record_file} ({len(records)} records)")
+    return "built"
+
+def build_record_store(base_data_dir, store_dir, collections=None, force=False):
+    """
+    Builds (or refreshes) the record store for each collection found under base_data_dir.
+
+    Returns:
+        bool: True if every requested collection is present and up to date in the store.
+    """
+    all_ok = True
+    for collection_name in collections or DEFAULT_COLLECTIONS:
+        source_file = find_collection_source(base_data_dir, collection_name)
+        if source_file is None:
+            print(f"Warning: No '{collection_name}.json' found under '{base_data_dir}'. Skipping.")
+            all_ok = False
+            continue
+        if build_collection(source_file, store_dir, collection_name, force=force) == "failed":
+            all_ok = False
+    return all_ok
+
+class RecordStore:
+    """
+    Read-only view over one collection of a record store. The record file is
+    memory-mapped; only the requested records are decoded.
+
+        with RecordStore(store_dir, "talents") as talents:
+            talents.get(name="Accurate Blow", source_book="C")
+            talents.get(id="some-id")
+            talents.find(name="Block")  # every record with that name
+    """
+    def __init__(self, store_dir, collection_name):
+        self.collection_name = collection_name
+        self.record_file = get_record_file_path(store_dir, collection_name)
+        index = _read_index(get_index_file_path(store_dir, collection_name))
+        if index is None or index.get("format_version") != RECORD_STORE_FORMAT_VERSION:
+            raise RecordStoreError(f"No usable record store index for '{collection_name}' in '{store_dir}'. Run the build step first.")
+        self._offsets = index["offsets"]
+        self._by_id = index["by_id"]
+        self._by_name = index["by_name"]
+        self._by_name_source = index["by_name_source"]
+        self._file = open(self.record_file, 'rb')
+        try:
+            if os.fstat(self._file.fileno()).st_size != index["record_file_size"]:
+                raise RecordStoreError(f"Record file '{self.record_file}' does not match its index. Rebuild the store.")
+            # An empty collection cannot be memory-mapped.
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if index["record_file_size"] else None
+        except Exception:
+            self._file.close()
+            raise
+
+    def close(self):
+        if self._mmap is not None: self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def record_at(self, position):
+        """Decodes and returns the record at the given position (source order)."""
+        offset, length = self._offsets[position]
+        return json.loads(self._mmap[offset:offset + length].decode('utf-8'))
+
+    def positions(self, id=None, name=None, source_book=None):
+        """
+        Returns the positions of the records matching id, or name (optionally narrowed
+        to source_book). An empty source_book matches records without one.
+        """
+        if id is not None:
+            return list(self._by_id.get(str(id), []))
+        if name is None:
+            raise ValueError("Either 'id' or 'name' is required for a record lookup.")
+        if source_book is None:
+            return list(self._by_name.get(str(name), []))
+        return list(self._by_name_source.get(f"{name}{NAME_SOURCE_SEPARATOR}{source_book}", []))
+
+    def find(self, id=None, name=None, source_book=None):
+        """Returns every matching record, in source order."""
+        return [self.record_at(position) for position in self.positions(id=id, name=name, source_book=source_book)]
+
+    def get(self, id=None, name=None, source_book=None):
+        """Returns the first matching record, or None."""
+        matches = self.positions(id=id, name=name, source_book=source_book)
+        return self.record_at(matches[0]) if matches else None
+
+    def __iter__(self):
+        for position in range(len(self._offsets)):
+            yield self.record_at(position)
+
+def run_benchmark(store_dir, collection_name, base_data_dir, name=None, id=None, source_book=None, repeats=5):
+    """Compares a cold point lookup through the store with loading and scanning the full JSON file."""
+    source_file = find_collection_source(base_data_dir, collection_name)
+    if source_file is None:
+        print(f"Error: No '{collection_name}.json' found under '{base_data_dir}'.")
+        return
+
+    def lookup_via_store():
+        with RecordStore(store_dir, collection_name) as store:
+            return store.get(id=id, name=name, source_book=source_book)
+
+    def lookup_via_json():
+        with open(source_file, 'r', encoding='utf-8') as f:
+            records = extract_record_list(json.load(f), collection_name)
+        for record in records:
+            if id is not None and str(record.get("id")) == str(id): return record
+            if id is None and record.get("name") == name and (source_book is None or (record.get("source_book") or "") == source_book): return record
+        return None
+
+    timings = {}
+    for label, lookup in (("json", lookup_via_json), ("store", lookup_via_store)):
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = lookup()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[label] = (best, result)
+    if timings["json"][1] != timings["store"][1]:
+        print("Warning: Store and JSON lookups returned different records. Rebuild the store before benchmarking.")
+    print(f"\n--- Point Lookup Benchmark: {collection_name} (best of {repeats}) ---")
+    for label, (elapsed, _) in timings.items():
+        print(f"  {label:<6} {elapsed * 1000:>8.2f} ms ({timings['json'][0] / elapsed:>6.1f}x)")
+
+if __name__ == "__main__":
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    default_store_dir = get_record_store_dir(os.path.join(script_dir, "compiled_output", "compiled_saga_index.json"))
+    default_data_dir = os.path.join(script_dir, '..', '..', 'data')
+
+    parser = argparse.ArgumentParser(description="Build or query the memory-mapped SAGA record store. See script header for details.", formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--store_dir", default=default_store_dir, help="Record store directory (default: compiled_output/compiled_saga_index_records).")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Build or refresh the record store.")
+    build_parser.add_argument("--data_dir", default=default_data_dir, help="Path to the 'data' directory (default: ../../data).")
+    build_parser.add_argument("--collection", action="append", default=None, help=f"Collection to build (repeatable). Default: {', '.join(DEFAULT_COLLECTIONS)}.")
+    build_parser.add_argument("--force", action="store_true", help="Rebuild even if the source file is unchanged.")
+
+    for command, help_text in (("get", "Print the records matching a lookup."), ("benchmark", "Compare a cold lookup against loading the full JSON file.")):
+        lookup_parser = subparsers.add_parser(command, help=help_text)
+        lookup_parser.add_argument("collection", help="Collection name, e.g. talents.")
+        lookup_parser.add_argument("--id", default=None, help="Record 'id'.")
+        lookup_parser.add_argument("--name", default=None, help="Record 'name'.")
+        lookup_parser.add_argument("--source_book", default=None, help="Record 'source_book' (narrows a --name lookup).")
+        if command == "benchmark":
+            lookup_parser.add_argument("--data_dir", default=default_data_dir, help="Path to the 'data' directory (default: ../../data).")
+            lookup_parser.add_argument("--repeats", type=int, default=5, help="Number of timed lookups per method (default: 5).")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if not build_record_store(args.data_dir, args.store_dir, args.collection, force=args.force): exit(1)
+    elif args.id is None and args.name is None:
+        parser.error("Either --id or --name is required.")
+    elif args.command == "benchmark":
+        run_benchmark(args.store_dir, args.collection, args.data_dir, name=args.name, id=args.id, source_book=args.source_book, repeats=args.repeats)
+    else:
+        try:
+            with RecordStore(args.store_dir, args.collection) as store:
+                matches = store.find(id=args.id, name=args.name, source_book=args.source_book)
+        except (RecordStoreError, IOError) as e:
+            print(f"Error: {e}"); exit(1)
+        if not matches:
+            print(f"No '{args.collection}' record found."); exit(1)
+        print(json.dumps(matches[0] if len(matches) == 1 else matches, indent=2, ensure_ascii=False))
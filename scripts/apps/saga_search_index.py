@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: saga_search_index.py
+Version: 1.0.1
+Date: 2026-10-18
+
+Purpose:
+Full-text search over the `name`, `description` and `full_text_description` of
+every record in the Star Wars Saga Edition list files, so rules lookups such as
+"which talents mention Reflex Defense by 5 or more" are answered from a prebuilt
+inverted index instead of a substring scan over every record.
+
+Index Layout (default: `compiled_output/saga_search.sqlite`):
+    * `search`: SQLite FTS5 table (porter stemming, unicode61 tokenizer) with one
+        row per record: file key, position, record id, name, description and
+        full_text_description. Results are ranked with FTS5's BM25, weighting
+        name matches above description matches above full-text matches.
+    * `_search_manifest`: source file, mtime/size/SHA-256 per file key. A build
+        only re-indexes files that changed and drops files that disappeared.
+    * Collections are discovered the same way as in `saga_sqlite_export.py`
+        (json_updater's `generate_dynamic_target_files_config()` and its
+        discovery registry, so unchanged files are not parsed for discovery).
+
+Instructions for Use:
+    * Build (or refresh) the index:
+        `python saga_search_index.py build --root_path path/to/SagaIndex`
+    * Search from the command line (plain words are ANDed; add `--raw` to use
+        FTS5 query syntax such as `NEAR("Reflex Defense" exceed, 5)` or `reflex OR fortitude`):
+        `python saga_search_index.py query "Reflex Defense by 5 or more" --file talents`
+    * Search from Python:
+        from saga_search_index import search
+        for hit in search("compiled_output/saga_search.sqlite", "Reflex Defense by 5 or more", file_keys=["talents"]):
+            print(hit["file_key"], hit["id"], hit["name"], hit["snippet"])
+
+Version Notes:
+* 1.0.0 (2026-10-18): Initial release. Incremental per-file FTS5 index and ranked query API.
+* 1.0.1 (2026-10-18): Discovery uses json_updater's discovery registry instead of parsing every
+    data file on every build (`--no_discovery_cache` to bypass it).
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import time
+
+from json_updater import DEFAULT_DISCOVERY_REGISTRY_PATH
+from saga_sqlite_export import discover_list_collections, read_collection, sqlite_transaction
+
+SEARCH_FORMAT_VERSION = 1
+SEARCH_TABLE = "search"
+MANIFEST_TABLE = "_search_manifest"
+SEARCH_COLUMNS = ["name", "description", "full_text_description"]
+COLUMN_WEIGHTS = (0.0, 0.0, 0.0, 5.0, 2.0, 1.0) # bm25() weights: file_key, position, record_id, then SEARCH_COLUMNS
+SNIPPET_TOKENS = 16
+
+def _ensure_schema(connection):
+    connection.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(file_key UNINDEXED, position UNINDEXED, record_id UNINDEXED, {', '.join(SEARCH_COLUMNS)}, tokenize='porter unicode61')")
+    connection.execute(f"CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (file_key TEXT PRIMARY KEY, source_file TEXT, mtime_ns INTEGER, size INTEGER, sha256 TEXT, record_count INTEGER, format_version INTEGER, indexed_at TEXT)")
+
+def _text_value(value):
+    if value is None: return ""
+    if isinstance(value, list): return " ".join(_text_value(item) for item in value)
+    if isinstance(value, dict): return " ".join(_text_value(item) for item in value.values())
+    return str(value)
+
+def _reindex_file(connection, file_key, records):
+    connection.execute(f"DELETE FROM {SEARCH_TABLE} WHERE file_key = ?", (file_key,))
+    connection.executemany(
+        f"INSERT INTO {SEARCH_TABLE} (file_key, position, record_id, {', '.join(SEARCH_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)",
+        ((file_key, position, _text_value(record.get("id") or record.get("name")), *(_text_value(record.get(column)) for column in SEARCH_COLUMNS))
+         for position, record in enumerate(records) if isinstance(record, dict)))
+
+def build_search_index(root_path, database_file, force=False, verbose=False, discovery_registry_path=DEFAULT_DISCOVERY_REGISTRY_PATH):
+    """
+    Builds or refreshes the search index for every list collection under root_path/data,
+    re-indexing only files that changed since the previous build.
+
+    Returns:
+        bool: True if the build ran (even if nothing changed), False on a fatal error.
+    """
+    if not os.path.isdir(os.path.join(root_path, 'data')):
+        print(f"Error: Data directory '{os.path.join(root_path, 'data')}' not found. Check --root_path.")
+        return False
+    collections = discover_list_collections(root_path, verbose=verbose, registry_path=discovery_registry_path)
+
+    database_dir = os.path.dirname(database_file)
+    if database_dir: os.makedirs(database_dir, exist_ok=True)
+    connection = sqlite3.connect(database_file, isolation_level=None)
+    reindexed_files, unchanged_files, failed_files = 0, 0, 0
+    try:
+        _ensure_schema(connection)
+        previous = {row[0]: row for row in connection.execute(f"SELECT file_key, source_file, mtime_ns, size, sha256, format_version FROM {MANIFEST_TABLE}")}
+        kept_files = set()
+
+        for file_key, config_details in collections.items():
+            source_file = config_details["full_path"]
+            try:
+                stat_result = os.stat(source_file)
+                previous_row = previous.get(file_key)
+                up_to_date = not force and previous_row is not None and previous_row[5] == SEARCH_FORMAT_VERSION and previous_row[1] == os.path.abspath(source_file)
+                if up_to_date and (previous_row[2], previous_row[3]) == (stat_result.st_mtime_ns, stat_result.st_size):
+                    kept_files.add(file_key)
+                    unchanged_files += 1
+                    continue
+                records, sha256 = read_collection(config_details)
+            except (IOError, OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+                print(f"Error reading {source_file}: {e}. Index for '{file_key}' left as is.")
+                kept_files.add(file_key)
+                failed_files += 1
+                continue
+            if records is None: continue
+
+            with sqlite_transaction(connection):
+                if not (up_to_date and previous_row[4] == sha256):
+                    _reindex_file(connection, file_key, records)
+                    print(f"Indexed '{file_key}': {len(records)} record(s) from {source_file}")
+                    reindexed_files += 1
+                else:
+                    unchanged_files += 1
+                connection.execute(f"INSERT OR REPLACE INTO {MANIFEST_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                   (file_key, os.path.abspath(source_file), stat_result.st_mtime_ns, stat_result.st_size, sha256, len(records), SEARCH_FORMAT_VERSION, time.strftime("%Y-%m-%dT%H:%M:%S")))
+            kept_files.add(file_key)
+
+        for file_key in sorted(set(previous) - kept_files):
+            with sqlite_transaction(connection):
+                connection.execute(f"DELETE FROM {SEARCH_TABLE} WHERE file_key = ?", (file_key,))
+                connection.execute(f"DELETE FROM {MANIFEST_TABLE} WHERE file_key = ?", (file_key,))
+            print(f"Removed '{file_key}' from the search index (source file no longer present or not a list collection).")
+        if reindexed_files:
+            connection.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')")
+    except sqlite3.Error as e:
+        print(f"SQLite error while building search index {database_file}: {e}")
+        return False
+    finally:
+        connection.close()
+
+    print(f"\nSearch index: {reindexed_files} file(s) re-indexed, {unchanged_files} unchanged, {failed_files} failed.")
+    print(f"Index: {database_file}")
+    return True
+
+def build_match_expression(text):
+    """Turns plain text into an FTS5 query that requires every word (punctuation is ignored)."""
+    words = re.findall(r"\w+", text, flags=re.UNICODE)
+    return " ".join(f'"{word}"' for word in words)
+
+def search(database_file, query, limit=10, file_keys=None, raw=False):
+    """
+    Returns ranked matches for query as a list of dicts with 'file_key', 'id', 'name',
+    'position', 'score' (BM25; lower is better) and 'snippet' (matched terms in [brackets]).
+
+    Args:
+        database_file (str): Path of the index built by build_search_index().
+        query (str): Plain words (all required), or FTS5 query syntax if raw is True.
+        limit (int): Maximum number of results.
+        file_keys (list): Restrict results to these file keys (e.g. ["talents", "feats"]).
+        raw (bool): Pass query to FTS5 unchanged.
+    """
+    match_expression = query if raw else build_match_expression(query)
+    if not match_expression: return []
+    sql = (f"SELECT file_key, record_id, name, position, bm25({SEARCH_TABLE}, {', '.join(str(weight) for weight in COLUMN_WEIGHTS)}) AS score, "
+           f"snippet({SEARCH_TABLE}, -1, '[', ']', '...', {SNIPPET_TOKENS}) "
+           f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH ?")
+    parameters = [match_expression]
+    if file_keys:
+        sql += f" AND file_key IN ({', '.join('?' for _ in file_keys)})"
+        parameters.extend(file_keys)
+    sql += " ORDER BY score LIMIT ?"
+    parameters.append(limit)
+
+    connection = sqlite3.connect(f"file:{database_file}?mode=ro", uri=True)
+    try:
+        return [{"file_key": file_key, "id": record_id, "name": name, "position": int(position), "score": score, "snippet": snippet}
+                for file_key, record_id, name, position, score, snippet in connection.execute(sql, parameters)]
+    finally:
+        connection.close()
+
+if __name__ == "__main__":
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Build or query the SAGA Index full-text search index. See script header for details.", formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--index", default=os.path.join(script_dir, "compiled_output", "saga_search.sqlite"), help="Path of the search index (default: compiled_output/saga_search.sqlite next to this script).")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Build or refresh the search index.")
+    build_parser.add_argument("--root_path", default=os.path.join(script_dir, '..', '..'), help="Root path of the SagaIndex repository (the folder containing 'data'). Defaults to two levels above this script.")
+    build_parser.add_argument("--force", action="store_true", help="Re-index every file even if it is unchanged.")
+    build_parser.add_argument("--verbose", action="store_true", help="Show the file discovery log.")
+    build_parser.add_argument("--no_discovery_cache", action="store_true", help="Parse every data file to discover collections instead of using json_updater's discovery registry.")
+
+    query_parser = subparsers.add_parser("query", help="Search the index.")
+    query_parser.add_argument("text", help="Words to search for (all required), or FTS5 syntax with --raw.")
+    query_parser.add_argument("--file", action="append", default=None, help="Restrict to a file key, e.g. talents (repeatable).")
+    query_parser.add_argument("--limit", type=int, default=10, help="Maximum number of results (default: 10).")
+    query_parser.add_argument("--raw", action="store_true", help="Pass the query to FTS5 unchanged.")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if not build_search_index(args.root_path, args.index, force=args.force, verbose=args.verbose, discovery_registry_path=None if args.no_discovery_cache else DEFAULT_DISCOVERY_REGISTRY_PATH): exit(1)
+    else:
+        try:
+            results = search(args.index, args.text, limit=args.limit, file_keys=args.file, raw=args.raw)
+        except sqlite3.Error as e:
+            print(f"Search error: {e}"); exit(1)
+        for rank, hit in enumerate(results, start=1):
+            print(f"{rank:>3}. [{hit['file_key']}] {hit['name']} (id: {hit['id']}, score: {hit['score']:.2f})")
+            print(f"     {hit['snippet']}")
+        if not results: print("No matches.")
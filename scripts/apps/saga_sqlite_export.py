@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: saga_sqlite_export.py
+Version: 1.0.1
+Date: 2026-10-18
+
+Purpose:
+Exports every Star Wars Saga Edition list collection into an on-disk SQLite
+database, so lookups such as "all starships with CL <= 5 from D3" are an index
+scan instead of a Python loop over the loaded JSON. Collections are discovered
+with the same rules `json_updater.py` uses (`generate_dynamic_target_files_config()`):
+every `data/<category>/<name>.json` outside `meta_info` whose
+`<name>_data.<name>_list` is a list of records. Discovery shares json_updater's
+registry (`compiled_output/json_updater_registry.json`), so only files whose
+mtime/size changed are parsed to infer their structure.
+
+Database Layout (default: `compiled_output/saga_index.sqlite`):
+    * One table per collection, named after the file key (e.g. `talents`,
+        `starships`). Columns:
+        * `position`: record position in the source list (primary key).
+        * `id`, `name`, `source_book` (TEXT), `page`, `cl` (NUMERIC, so "39"
+            and 39 compare equal). Each has its own index.
+        * `record`: the full record as JSON; query nested fields with
+            SQLite's `json_extract(record, '$.field')`.
+    * `_export_manifest`: source file, mtime/size/SHA-256 and record count per
+        table. A run only rebuilds tables whose source file changed, and drops
+        tables whose source file no longer exists.
+
+Instructions for Use:
+    * Export (or refresh) the database:
+        `python saga_sqlite_export.py --root_path path/to/SagaIndex`
+    * Query it with any SQLite client, e.g.:
+        SELECT name, cl FROM starships WHERE source_book = 'D3' AND cl <= 5 ORDER BY cl;
+        SELECT name FROM talents WHERE json_extract(record, '$.talent_tree') = 'Awareness';
+    * Or with `--query`:
+        `python saga_sqlite_export.py --query "SELECT name, cl FROM starships WHERE cl <= 5"`
+
+Version Notes:
+* 1.0.0 (2026-10-18): Initial release. Incremental per-collection export with indexed lookup columns.
+* 1.0.1 (2026-10-18): Discovery uses json_updater's discovery registry instead of parsing every
+    data file on every run (`--no_discovery_cache` to bypass it).
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import time
+
+from json_updater import DEFAULT_DISCOVERY_REGISTRY_PATH, generate_dynamic_target_files_config
+
+EXPORT_FORMAT_VERSION = 1
+MANIFEST_TABLE = "_export_manifest"
+INDEXED_COLUMNS = ["id", "name", "source_book", "page", "cl"]
+COLUMN_DEFINITIONS = "position INTEGER PRIMARY KEY, id TEXT, name TEXT, source_book TEXT, page NUMERIC, cl NUMERIC, record TEXT NOT NULL"
+
+def _quote_identifier(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+def discover_list_collections(root_path, verbose=False, registry_path=DEFAULT_DISCOVERY_REGISTRY_PATH):
+    """
+    Returns {file_key: config} for every list collection under root_path/data, using
+    json_updater's discovery (single-object files are left out). registry_path is its
+    discovery cache (None to parse every file).
+    """
+    output = None if verbose else io.StringIO()
+    with contextlib.redirect_stdout(output) if output else contextlib.nullcontext():
+        config = generate_dynamic_target_files_config(root_path, {}, registry_path=registry_path)
+    return {key: details for key, details in sorted(config.items())
+            if details.get("is_list_of_objects") and not details.get("is_single_object_content")}
+
+def _column_value(value):
+    # Lists/objects (rare in lookup columns) are stored as JSON text so they stay queryable.
+    if isinstance(value, (dict, list)): return json.dumps(value, ensure_ascii=False)
+    return value
+
+def read_collection(config_details):
+    """Returns (records, sha256) for a collection, or (None, sha256) if the file has no record list."""
+    with open(config_details["full_path"], 'rb') as f:
+        raw_bytes = f.read()
+    sha256 = hashlib.sha256(raw_bytes).hexdigest()
+    content = json.loads(raw_bytes.decode('utf-8'))
+    wrapper = content.get(config_details["data_wrapper_key"]) if isinstance(content, dict) else None
+    records = wrapper.get(config_details["collection_key"]) if isinstance(wrapper, dict) else None
+    return (records if isinstance(records, list) else None), sha256
+
+@contextlib.contextmanager
+def sqlite_transaction(connection):
+    # Explicit BEGIN so the DROP/CREATE of a rebuild are rolled back together with the inserts.
+    connection.execute("BEGIN")
+    try:
+        yield
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+def _ensure_manifest_table(connection):
+    connection.execute(f"CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (table_name TEXT PRIMARY KEY, source_file TEXT, mtime_ns INTEGER, size INTEGER, sha256 TEXT, record_count INTEGER, format_version INTEGER, exported_at TEXT)")
+
+def _rebuild_table(connection, table_name, records):
+    quoted_table = _quote_identifier(table_name)
+    connection.execute(f"DROP TABLE IF EXISTS {quoted_table}")
+    connection.execute(f"CREATE TABLE {quoted_table} ({COLUMN_DEFINITIONS})")
+    connection.executemany(
+        f"INSERT INTO {quoted_table} (position, id, name, source_book, page, cl, record) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        ((position, *(_column_value(record.get(column)) if isinstance(record, dict) else None for column in INDEXED_COLUMNS), json.dumps(record, ensure_ascii=False))
+         for position, record in enumerate(records)))
+    # Indexes are created after the bulk insert, which is faster than maintaining them row by row.
+    for column in INDEXED_COLUMNS:
+        connection.execute(f"CREATE INDEX {_quote_identifier(f'idx_{table_name}_{column}')} ON {quoted_table} ({column})")
+
+def export_to_sqlite(root_path, database_file, force=False, verbose=False, discovery_registry_path=DEFAULT_DISCOVERY_REGISTRY_PATH):
+    """
+    Exports every list collection under root_path/data into database_file, rebuilding
+    only tables whose source file changed since the previous run.
+
+    Returns:
+        bool: True if the export ran (even if nothing changed), False on a fatal error.
+    """
+    data_base_path = os.path.join(root_path, 'data')
+    if not os.path.isdir(data_base_path):
+        print(f"Error: Data directory '{data_base_path}' not found. Check --root_path.")
+        return False
+    collections = discover_list_collections(root_path, verbose=verbose, registry_path=discovery_registry_path)
+
+    database_dir = os.path.dirname(database_file)
+    if database_dir: os.makedirs(database_dir, exist_ok=True)
+    connection = sqlite3.connect(database_file, isolation_level=None)
+    rebuilt_tables, unchanged_tables, failed_tables = 0, 0, 0
+    try:
+        _ensure_manifest_table(connection)
+        previous = {row[0]: row for row in connection.execute(f"SELECT table_name, source_file, mtime_ns, size, sha256, format_version FROM {MANIFEST_TABLE}")}
+        kept_tables = set()
+
+        for table_name, config_details in collections.items():
+            source_file = config_details["full_path"]
+            try:
+                stat_result = os.stat(source_file)
+                previous_row = previous.get(table_name)
+                up_to_date = not force and previous_row is not None and previous_row[5] == EXPORT_FORMAT_VERSION and previous_row[1] == os.path.abspath(source_file)
+                # Fast path: stat unchanged, skip without reading the file.
+                if up_to_date and (previous_row[2], previous_row[3]) == (stat_result.st_mtime_ns, stat_result.st_size):
+                    kept_tables.add(table_name)
+                    unchanged_tables += 1
+                    continue
+                records, sha256 = read_collection(config_details)
+            except (IOError, OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+                print(f"Error reading {source_file}: {e}. Table '{table_name}' left as is.")
+                kept_tables.add(table_name)
+                failed_tables += 1
+                continue
+            if records is None:
+                print(f"Note: {source_file} has no '{config_details['data_wrapper_key']}.{config_details['collection_key']}' record list. Skipping.")
+                continue
+
+            manifest_row = (table_name, os.path.abspath(source_file), stat_result.st_mtime_ns, stat_result.st_size, sha256, len(records), EXPORT_FORMAT_VERSION, time.strftime("%Y-%m-%dT%H:%M:%S"))
+            with sqlite_transaction(connection): # One transaction per table: a failed rebuild keeps the old table.
+                if not (up_to_date and previous_row[4] == sha256): # Touched but identical content: only refresh the stat
+                    _rebuild_table(connection, table_name, records)
+                    print(f"Exported '{table_name}': {len(records)} record(s) from {source_file}")
+                    rebuilt_tables += 1
+                else:
+                    unchanged_tables += 1
+                connection.execute(f"INSERT OR REPLACE INTO {MANIFEST_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?)", manifest_row)
+            kept_tables.add(table_name)
+
+        # Drop tables whose source file was removed (or no longer holds a record list).
+        for table_name in sorted(set(previous) - kept_tables):
+            with sqlite_transaction(connection):
+                connection.execute(f"DROP TABLE IF EXISTS {_quote_identifier(table_name)}")
+                connection.execute(f"DELETE FROM {MANIFEST_TABLE} WHERE table_name = ?", (table_name,))
+            print(f"Dropped table '{table_name}' (source file no longer present or not a list collection).")
+    except sqlite3.Error as e:
+        print(f"SQLite error while exporting to {database_file}: {e}")
+        return False
+    finally:
+        connection.close()
+
+    print(f"\nSQLite export: {rebuilt_tables} table(s) rebuilt, {unchanged_tables} unchanged, {failed_tables} failed.")
+    print(f"Database: {database_file}")
+    return True
+
+def run_query(database_file, query):
+    """Runs a read-only SQL query against the export and prints the rows."""
+    connection = sqlite3.connect(f"file:{database_file}?mode=ro", uri=True)
+    try:
+        cursor = connection.execute(query)
+        print(" | ".join(column[0] for column in cursor.description or []))
+        row_count = 0
+        for row in cursor:
+            print(" | ".join("" if value is None else str(value) for value in row))
+            row_count += 1
+        print(f"({row_count} row(s))")
+    finally:
+        connection.close()
+
+if __name__ == "__main__":
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Export SAGA Index list collections to SQLite. See script header for details.", formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--root_path", default=os.path.join(script_dir, '..', '..'), help="Root path of the SagaIndex repository (the folder containing 'data'). Defaults to two levels above this script.")
+    parser.add_argument("--output", default=os.path.join(script_dir, "compiled_output", "saga_index.sqlite"), help="Path of the SQLite database (default: compiled_output/saga_index.sqlite next to this script).")
+    parser.add_argument("--force", action="store_true", help="Rebuild every table even if its source file is unchanged.")
+    parser.add_argument("--verbose", action="store_true", help="Show the file discovery log.")
+    parser.add_argument("--no_discovery_cache", action="store_true", help="Parse every data file to discover collections instead of using json_updater's discovery registry.")
+    parser.add_argument("--query", default=None, help="Run a read-only SQL query against the database instead of exporting.")
+    args = parser.parse_args()
+
+    if args.query:
+        try:
+            run_query(args.output, args.query)
+        except sqlite3.Error as e:
+            print(f"SQLite error: {e}"); exit(1)
+    elif not export_to_sqlite(args.root_path, args.output, force=args.force, verbose=args.verbose, discovery_registry_path=None if args.no_discovery_cache else DEFAULT_DISCOVERY_REGISTRY_PATH):
+        exit(1)
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script Name: saga_updater_daemon.py
+Version: 1.0.2
+Date: 2026-10-18
+
+Purpose:
+Server mode for `json_updater.py`. A `json_updater.py` run re-discovers the file
+configs, parses every targeted file, applies the edits and rewrites the files,
+which costs seconds per call; the AI GM sends small edits all session long (NPC
+profile updates against WIDT_NPCS, talent fixes, ...). The daemon keeps each
+file it has edited parsed in memory, applies edit requests with the same
+`apply_edit` semantics (same edit format, same lookups, same warnings) in well
+under a millisecond, and writes the files back on a debounce timer or when a
+client asks it to commit.
+
+How It Works:
+    * A file is loaded the first time an edit targets it and stays resident.
+        Edits go to a copy-on-write working copy (json_updater's
+        CopyOnWriteBatch/RecordLookupIndex), so the content last written to
+        disk stays intact for the backup store and for the save's reordering.
+    * A file with unflushed edits is saved `--flush_delay` seconds after its
+        last edit, and at the latest `--max_flush_delay` seconds after its
+        first unflushed edit. Saves go through json_updater (same key order,
+        sorting, atomic write, backup store and edit journal as a normal run).
+    * If a resident file is changed on disk by something else (another
+        json_updater run, a restore, a hand edit), it is reloaded before the
+        next edit or save, and its unflushed edits are re-applied on top.
+    * Edits are durable once they are flushed: send `?commit=1` (or POST
+        /commit) when an edit must be on disk before the response.
+    * An edit with an `edit_id` is applied once: if that ID is already
+        committed in the file's edit journal or waiting to be flushed, the
+        edit is reported as `duplicate` and skipped. Edits without one are
+        always applied and are not journaled.
+
+HTTP API (JSON bodies and responses; one request at a time is applied):
+    * POST /edits[?commit=1][&dry_run=1]: body is one edit request or a list of
+        them, exactly as in a json_updater edits file. Returns
+        {"results": [{"target_file_key", "status", "log"}...], "pending": N},
+        status being applied, failed, duplicate or invalid (or dry_run / dry_run_failed).
+    * POST /commit[?target_file_key=K]: flush now (all files, or K's file).
+    * GET /status: resident files, unflushed edit counts and timing stats.
+    * POST /shutdown: flush everything and stop the server.
+    * Every POST must be sent with `Content-Type: application/json` and without
+        an `Origin` header (415 / 403 otherwise), so a web page open in a browser
+        cannot post edits to the daemon (cross-site request forgery).
+
+Instructions for Use:
+    * Start it (127.0.0.1:8765 by default; `--unix_socket PATH` serves the same
+        API on a Unix socket instead):
+        `python saga_updater_daemon.py serve --root_path ../.. --npc_profile_file ../json/WIDT_NPCS.json`
+    * Send an edits file to a running daemon and commit it:
+        `python saga_updater_daemon.py send my_edits.json --commit`
+    * Or from any HTTP client:
+        `curl -X POST -H "Content-Type: application/json" --data @edit.json http://127.0.0.1:8765/edits`
+    * Ctrl+C (or POST /shutdown) flushes every pending edit before exiting.
+
+Version Notes:
+* 1.0.0 (2026-10-18): Initial release. Resident files, debounced flush, HTTP/Unix socket API.
+* 1.0.1 (2026-10-18): POST requests need `Content-Type: application/json` and are refused if they
+    carry an `Origin` header (browser requests), closing a cross-site request forgery hole.
+* 1.0.2 (2026-10-18): Edits without an `edit_id` are no longer journaled (their random IDs could never match).
+"""
+
+import argparse
+import contextlib
+import copy
+import http.client
+import http.server
+import io
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import json_updater
+from json_updater import (CopyOnWriteBatch, RecordLookupIndex, apply_edit, create_empty_target_data, generate_dynamic_target_files_config,
+                          load_json_file, locate_edit_target, prepare_data_for_save, save_with_backup_and_journal, write_json_file_atomically)
+from saga_edit_journal import EditJournal
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_FLUSH_DELAY = 2.0 # Seconds after a file's last edit
+DEFAULT_MAX_FLUSH_DELAY = 30.0 # Seconds after a file's first unflushed edit, however busy it is
+
+class UpdaterDaemonError(Exception):
+    """Raised when a resident file cannot be loaded."""
+
+def _file_signature(file_path):
+    try: stat_result = os.stat(file_path)
+    except OSError: return None
+    return (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino)
+
+class HotFile:
+    """
+    One data file held in memory. saved_data is the content last read from or written to disk
+    (None if the file does not exist yet); working_data is its copy-on-write working copy with
+    the unflushed edits, which are also kept in `pending` so they can be re-applied after a reload.
+    """
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.pending = [] # (target_key, config_entry, edit_request, edit_id or None)
+        self.first_pending_time = None; self.last_edit_time = None
+        self._load()
+
+    def _load(self):
+        self.signature = _file_signature(self.file_path)
+        self.saved_data = None
+        if self.signature is not None:
+            self.saved_data = load_json_file(self.file_path)
+            if not self.saved_data: raise UpdaterDaemonError(f"could not load {self.file_path}")
+        self.journal = EditJournal.for_file(self.file_path)
+        for txn, outcome in self.journal.recovered: print(f"  Edit journal: recovered interrupted save {txn} as {outcome}.")
+        self._start_round()
+
+    def _start_round(self):
+        # A round is the span between two flushes: one working copy, one copy-on-write batch.
+        self.working_data = copy.copy(self.saved_data) if self.saved_data is not None else None
+        self.copy_on_write = CopyOnWriteBatch()
+        self.views = {} # (target_key, is_single_object) -> (object the edits operate on, RecordLookupIndex or None)
+        self.unchanged_record_ids = {} # target_key -> id()s of the records loaded this round (see json_updater.reorder_and_sort_records)
+        self.dirty_targets = {} # (target_key, is_single_object) -> config_entry
+
+    def _view(self, target_key, config_entry, is_single_object):
+        view_key = (target_key, is_single_object)
+        if view_key not in self.views:
+            # Locating a target re-clones the containers above it, so views of the other mode go stale.
+            self.views = {key: view for key, view in self.views.items() if key[1] == is_single_object}
+            edit_target = locate_edit_target(self.working_data, config_entry, is_single_object, target_key)
+            if edit_target is None: return None
+            lookup_index = RecordLookupIndex(edit_target, config_entry) if isinstance(edit_target, list) and not is_single_object else None
+            if lookup_index is not None: self.unchanged_record_ids.setdefault(target_key, {id(record) for record in edit_target})
+            self.views[view_key] = (edit_target, lookup_index)
+        return self.views[view_key]
+
+    def is_duplicate(self, edit_id):
+        return edit_id in self.journal.committed_ids or any(pending_edit_id == edit_id for _, _, _, pending_edit_id in self.pending)
+
+    def apply(self, target_key, config_entry, edit_request, edit_id, dry_run=False):
+        """Applies one edit to the working copy (see json_updater.apply_edit). Returns whether it applied."""
+        is_single_object = edit_request.get("is_single_object", config_entry.get("is_single_object_content", False))
+        if self.working_data is None:
+            if edit_request.get("action") != "add": print(f"Error: Target file {self.file_path} not found and the edit is not an 'add'. Skipping."); return False
+            print(f"Target file {self.file_path} not found. Will create it on the next flush.")
+            self.working_data = create_empty_target_data(target_key, config_entry, is_single_object)
+        view = self._view(target_key, config_entry, is_single_object)
+        if view is None: return False
+        edit_target, lookup_index = view
+        if not apply_edit(edit_target, edit_request, dry_run=dry_run, config_details=config_entry, is_single_object_content_override=is_single_object, lookup_index=lookup_index, copy_on_write=self.copy_on_write): return False
+        if dry_run: return True
+        if is_single_object: self.views = {key: view for key, view in self.views.items() if key[1]} # The edit may have replaced a collection
+        self.dirty_targets[(target_key, is_single_object)] = config_entry
+        self.pending.append((target_key, config_entry, edit_request, edit_id))
+        self.last_edit_time = time.monotonic()
+        if self.first_pending_time is None: self.first_pending_time = self.last_edit_time
+        return True
+
+    def reload_if_changed_on_disk(self):
+        """Reloads the file if something else changed it, re-applying the unflushed edits on top."""
+        if _file_signature(self.file_path) == self.signature: return False
+        pending_edits = self.pending; self.pending = []
+        print(f"  {self.file_path} changed on disk; reloading it" + (f" and re-applying {len(pending_edits)} unflushed edit(s)." if pending_edits else "."))
+        self._load()
+        for target_key, config_entry, edit_request, edit_id in pending_edits:
+            if not self.apply(target_key, config_entry, edit_request, edit_id): print(f"  Warning: unflushed edit {edit_id or edit_request} no longer applies after the reload and was dropped.")
+        return True
+
+    def flush_due_time(self, flush_delay, max_flush_delay):
+        if not self.pending: return None
+        return min(self.last_edit_time + flush_delay, self.first_pending_time + max_flush_delay)
+
+    def _write_working_data(self):
+        data_to_save = self.working_data
+        for (target_key, is_single_object), config_entry in self.dirty_targets.items():
+            data_to_save = prepare_data_for_save(data_to_save, self.file_path, config_entry, is_single_object_content_from_edit_flag=is_single_object, unchanged_record_ids=None if is_single_object else self.unchanged_record_ids.get(target_key))
+            if data_to_save is None: return None
+        try:
+            output_dir = os.path.dirname(self.file_path)
+            if output_dir: os.makedirs(output_dir, exist_ok=True)
+            write_json_file_atomically(data_to_save, self.file_path)
+        except Exception as e: print(f"Error writing {os.path.basename(self.file_path)} JSON to file {self.file_path}: {e}"); return None
+        print(f"Successfully saved {len(self.pending)} edit(s) to: {self.file_path}")
+        return data_to_save
+
+    def flush(self, backup_mode="store", backed_up_files_this_run=None):
+        """Saves the unflushed edits (backup, journal and write as in json_updater). Returns whether the file was written."""
+        self.reload_if_changed_on_disk()
+        if not self.pending: return False
+        target_keys_label = ", ".join(sorted({target_key for target_key, _ in self.dirty_targets}))
+        saved_data_obj = save_with_backup_and_journal(self.file_path, self.saved_data, self._write_working_data, backup_mode=backup_mode, backed_up_files_this_run=backed_up_files_this_run,
+                                                      edit_journal=self.journal, journal_label=target_keys_label, applied_edit_ids=[edit_id for _, _, _, edit_id in self.pending if edit_id is not None])
+        if saved_data_obj is None:
+            # The save reordered the working copy in place; rebuild it and retry after another flush_delay.
+            pending_edits = self.pending; self.pending = []; self._load()
+            for target_key, config_entry, edit_request, edit_id in pending_edits: self.apply(target_key, config_entry, edit_request, edit_id)
+            return False
+        self.saved_data = saved_data_obj; self.signature = _file_signature(self.file_path)
+        self.pending = []; self.first_pending_time = self.last_edit_time = None
+        self._start_round()
+        return True
+
+class UpdaterDaemon:
+    """The resident files plus the flush timer. All public methods are thread-safe."""
+    def __init__(self, root_path, discovery_registry_path=None, backup_mode="store", flush_delay=DEFAULT_FLUSH_DELAY, max_flush_delay=DEFAULT_MAX_FLUSH_DELAY):
+        self.root_path = root_path; self.discovery_registry_path = discovery_registry_path; self.backup_mode = backup_mode
+        self.flush_delay = flush_delay; self.max_flush_delay = max_flush_delay
+        self.target_files_config = json_updater.INITIAL_TARGET_FILES_CONFIG.copy()
+        self.hot_files = {} # abspath -> HotFile
+        self.backed_up_files_this_run = set()
+        self.lock = threading.RLock(); self.wakeup = threading.Condition(self.lock); self.stopping = False
+        self.stats = {"edits_received": 0, "edits_applied": 0, "flushes": 0, "apply_seconds_total": 0.0, "apply_seconds_max": 0.0}
+
+    def _config_for(self, target_key):
+        if target_key not in self.target_files_config:
+            generate_dynamic_target_files_config(self.root_path, self.target_files_config, target_file_keys={target_key}, registry_path=self.discovery_registry_path)
+        return self.target_files_config.get(target_key)
+
+    def _hot_file_for(self, config_entry):
+        file_path = os.path.abspath(config_entry["full_path"])
+        hot_file = self.hot_files.get(file_path)
+        if hot_file is None: hot_file = self.hot_files[file_path] = HotFile(file_path)
+        else: hot_file.reload_if_changed_on_disk()
+        return hot_file
+
+    def _apply_one(self, edit_request, dry_run):
+        if not isinstance(edit_request, dict): print(f"Warning: Edit is not a JSON object: {edit_request}"); return "invalid"
+        target_key = edit_request.get("target_file_key")
+        if not target_key: print(f"Warning: Edit missing 'target_file_key': {edit_request}"); return "invalid"
+        config_entry = self._config_for(target_key)
+        if config_entry is None: print(f"Warning: Unknown target_file_key '{target_key}'. Skipping edit."); return "invalid"
+        try: hot_file = self._hot_file_for(config_entry)
+        except UpdaterDaemonError as e: print(f"Error: {e}. Skipping edit."); return "failed"
+        edit_id = str(edit_request["edit_id"]) if edit_request.get("edit_id") is not None else None
+        if edit_id is not None and hot_file.is_duplicate(edit_id): print(f"  Skipping edit '{edit_id}': already applied according to the edit journal."); return "duplicate"
+        applied = hot_file.apply(target_key, config_entry, edit_request, edit_id, dry_run=dry_run)
+        if dry_run: return "dry_run" if applied else "dry_run_failed"
+        return "applied" if applied else "failed"
+
+    def submit_edits(self, edit_requests, dry_run=False, commit=False):
+        """Applies edit requests in order. Returns {"results": [...], "pending": N[, "flushed": [...]]}."""
+        results = []
+        with self.lock:
+            for edit_request in edit_requests:
+                log_buffer = io.StringIO(); started = time.perf_counter()
+                with contextlib.redirect_stdout(log_buffer): status = self._apply_one(edit_request, dry_run)
+                elapsed = time.perf_counter() - started
+                self.stats["edits_received"] += 1; self.stats["apply_seconds_total"] += elapsed; self.stats["apply_seconds_max"] = max(self.stats["apply_seconds_max"], elapsed)
+                if status == "applied": self.stats["edits_applied"] += 1
+                results.append({"target_file_key": edit_request.get("target_file_key") if isinstance(edit_request, dict) else None, "status": status, "log": log_buffer.getvalue().strip()})
+            response = {"results": results}
+            if commit and not dry_run: response["flushed"] = self.flush()
+            response["pending"] = sum(len(hot_file.pending) for hot_file in self.hot_files.values())
+            self.wakeup.notify_all()
+        return response
+
+    def flush(self, target_key=None):
+        """Saves the unflushed edits of every resident file (or only target_key's). Returns the paths written."""
+        with self.lock:
+            if target_key is not None:
+                config_entry = self.target_files_config.get(target_key)
+                hot_files = [self.hot_files[os.path.abspath(config_entry["full_path"])]] if config_entry and os.path.abspath(config_entry["full_path"]) in self.hot_files else []
+            else: hot_files = list(self.hot_files.values())
+            flushed_paths = []
+            for hot_file in hot_files:
+                if hot_file.flush(backup_mode=self.backup_mode, backed_up_files_this_run=self.backed_up_files_this_run): flushed_paths.append(hot_file.file_path); self.stats["flushes"] += 1
+                elif hot_file.pending: hot_file.first_pending_time = hot_file.last_edit_time = time.monotonic() # Failed: back off before retrying
+            return flushed_paths
+
+    def status(self):
+        with self.lock:
+            edits_received = self.stats["edits_received"]
+            return {"resident_files": {path: {"pending_edits": len(hot_file.pending), "dirty_target_keys": sorted({key for key, _ in hot_file.dirty_targets})} for path, hot_file in self.hot_files.items()},
+                    "edits_received": edits_received, "edits_applied": self.stats["edits_applied"], "flushes": self.stats["flushes"],
+                    "mean_apply_ms": round(self.stats["apply_seconds_total"] * 1000 / edits_received, 4) if edits_received else None,
+                    "max_apply_ms": round(self.stats["apply_seconds_max"] * 1000, 4)}
+
+    def run_flush_timer(self):
+        """Flushes each file when its debounce delay expires, until stop() is called."""
+        with self.lock:
+            while not self.stopping:
+                now = time.monotonic(); next_due_time = None
+                for hot_file in list(self.hot_files.values()):
+                    due_time = hot_file.flush_due_time(self.flush_delay, self.max_flush_delay)
+                    if due_time is None: continue
+                    if due_time <= now:
+                        if hot_file.flush(backup_mode=self.backup_mode, backed_up_files_this_run=self.backed_up_files_this_run): self.stats["flushes"] += 1
+                        elif hot_file.pending: hot_file.first_pending_time = hot_file.last_edit_time = now
+                        due_time = hot_file.flush_due_time(self.flush_delay, self.max_flush_delay)
+                    if due_time is not None: next_due_time = due_time if next_due_time is None else min(next_due_time, due_time)
+                self.wakeup.wait(None if next_due_time is None else max(0.0, next_due_time - time.monotonic()))
+
+    def stop(self):
+        """Stops the flush timer and saves everything still pending."""
+        with self.lock:
+            self.stopping = True; self.wakeup.notify_all()
+            return self.flush()
+
+class _UpdaterRequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive, so a client pays the connection setup once
+    disable_nagle_algorithm = True # Headers and body are separate writes; Nagle would hold the body for the delayed ACK (~40 ms)
+
+    def address_string(self):
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix-socket"
+
+    def log_message(self, format, *args):
+        if self.server.verbose: super().log_message(format, *args)
+
+    def _send_json(self, status_code, body):
+        encoded_body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json; charset=utf-8"); self.send_header("Content-Length", str(len(encoded_body)))
+        self.end_headers(); self.wfile.write(encoded_body)
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/status": self._send_json(200, self.server.updater.status())
+        else: self._send_json(404, {"error": f"unknown endpoint {self.path}"})
+
+    def do_POST(self):
+        parsed_url = urlparse(self.path); query = parse_qs(parsed_url.query)
+        flag = lambda name: query.get(name, ["0"])[-1].lower() in ("1", "true", "yes")
+        request_body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        # Browsers may send a cross-site "simple" POST (form/text content types) without a preflight: refuse anything a browser sent
+        if self.headers.get("Origin") is not None: self._send_json(403, {"error": "requests from a browser (Origin header) are not accepted"}); return
+        if self.headers.get_content_type() != "application/json": self._send_json(415, {"error": "Content-Type must be application/json"}); return
+        updater = self.server.updater
+        if parsed_url.path == "/edits":
+            try: edit_requests = json.loads(request_body.decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError) as e: self._send_json(400, {"error": f"body is not valid JSON: {e}"}); return
+            self._send_json(200, updater.submit_edits(edit_requests if isinstance(edit_requests, list) else [edit_requests], dry_run=flag("dry_run"), commit=flag("commit")))
+        elif parsed_url.path == "/commit":
+            log_buffer = io.StringIO()
+            with updater.lock, contextlib.redirect_stdout(log_buffer): flushed_paths = updater.flush(query.get("target_file_key", [None])[-1])
+            self._send_json(200, {"flushed": flushed_paths, "log": log_buffer.getvalue().strip()})
+        elif parsed_url.path == "/shutdown":
+            self._send_json(200, {"flushed": updater.stop()})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        else: self._send_json(404, {"error": f"unknown endpoint {self.path}"})
+
+class _ThreadingHTTPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+class _UnixSocketRequestHandler(_UpdaterRequestHandler):
+    disable_nagle_algorithm = False # TCP_NODELAY does not exist for Unix sockets
+
+if hasattr(socketserver, "UnixStreamServer"):
+    class _ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+def serve(updater, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_socket_path=None, verbose=False):
+    """Serves the HTTP API until POST /shutdown or Ctrl+C, then flushes every pending edit."""
+    if unix_socket_path:
+        if not hasattr(socketserver, "UnixStreamServer"): raise UpdaterDaemonError("Unix sockets are not supported on this platform; use --host/--port.")
+        if os.path.exists(unix_socket_path): os.remove(unix_socket_path) # Left over from a previous run
+        server = _ThreadingUnixHTTPServer(unix_socket_path, _UnixSocketRequestHandler); address_label = unix_socket_path
+    else: server = _ThreadingHTTPServer((host, port), _UpdaterRequestHandler); address_label = f"http://{host}:{server.server_address[1]}"
+    server.updater = updater; server.verbose = verbose
+    flush_timer = threading.Thread(target=updater.run_flush_timer, name="flush-timer", daemon=True); flush_timer.start()
+    print(f"Updater daemon listening on {address_label} (flush {updater.flush_delay}s after the last edit, at most {updater.max_flush_delay}s after the first).")
+    try: server.serve_forever()
+    except KeyboardInterrupt: print("\nInterrupted.")
+    finally:
+        server.server_close()
+        flushed_paths = updater.stop()
+        if unix_socket_path and os.path.exists(unix_socket_path): os.remove(unix_socket_path)
+        print(f"Updater daemon stopped. Flushed {len(flushed_paths)} file(s) on exit.")
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, unix_socket_path):
+        super().__init__("localhost"); self.unix_socket_path = unix_socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM); self.sock.connect(self.unix_socket_path)
+
+def send_request(method, path, body=None, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_socket_path=None):
+    """Sends one request to a running daemon and returns the decoded JSON response."""
+    connection = _UnixHTTPConnection(unix_socket_path) if unix_socket_path else http.client.HTTPConnection(host, port)
+    try:
+        connection.request(method, path, body=json.dumps(body).encode("utf-8") if body is not None else None, headers={"Content-Type": "application/json"})
+        return json.loads(connection.getresponse().read().decode("utf-8"))
+    finally: connection.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resident json_updater server. See script header for details.", formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Address to listen on / connect to (default: {DEFAULT_HOST}).")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT}).")
+    parser.add_argument("--unix_socket", default=None, help="Use this Unix socket path instead of host/port.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="Run the daemon.", formatter_class=argparse.RawTextHelpFormatter)
+    serve_parser.add_argument("--root_path", default=json_updater.DEFAULT_LOCAL_ROOT_PATH, help=f"Root path of the SagaIndex repository. Defaults to:\n'{json_updater.DEFAULT_LOCAL_ROOT_PATH}'.")
+    serve_parser.add_argument("--npc_profile_file", default=None, help=f"NPC Profile JSON file (default: '{json_updater.NPC_PROFILE_FILE_PATH}').")
+    serve_parser.add_argument("--discovery_registry", default=json_updater.DEFAULT_DISCOVERY_REGISTRY_PATH, help="Cache of inferred file configs (see json_updater.py).")
+    serve_parser.add_argument("--no_discovery_cache", action="store_true", help="Do not read or write the discovery registry.")
+    serve_parser.add_argument("--backup_mode", choices=["store", "copy"], default="store", help="As in json_updater.py; 'copy' backs each file up once per daemon run.")
+    serve_parser.add_argument("--flush_delay", type=float, default=DEFAULT_FLUSH_DELAY, help=f"Save a file this many seconds after its last edit (default: {DEFAULT_FLUSH_DELAY}).")
+    serve_parser.add_argument("--max_flush_delay", type=float, default=DEFAULT_MAX_FLUSH_DELAY, help=f"...and at most this many seconds after its first unflushed edit (default: {DEFAULT_MAX_FLUSH_DELAY}).")
+    serve_parser.add_argument("--verbose", action="store_true", help="Log every HTTP request.")
+    send_parser = subparsers.add_parser("send", help="Send an edits file to a running daemon.")
+    send_parser.add_argument("edits_file", help="JSON file with one edit request or a list of them.")
+    send_parser.add_argument("--commit", action="store_true", help="Flush the edited files before returning.")
+    send_parser.add_argument("--dry_run", action="store_true", help="Only report what the edits would do.")
+    subparsers.add_parser("commit", help="Flush every pending edit of a running daemon.")
+    subparsers.add_parser("status", help="Show the status of a running daemon.")
+    subparsers.add_parser("shutdown", help="Flush and stop a running daemon.")
+    args = parser.parse_args()
+
+    connection_options = {"host": args.host, "port": args.port, "unix_socket_path": args.unix_socket}
+    try:
+        if args.command == "serve":
+            if args.npc_profile_file: json_updater.NPC_PROFILE_FILE_PATH = args.npc_profile_file
+            json_updater.populate_initial_config(json_updater.NPC_PROFILE_FILE_PATH)
+            updater = UpdaterDaemon(args.root_path, discovery_registry_path=None if args.no_discovery_cache else args.discovery_registry, backup_mode=args.backup_mode, flush_delay=args.flush_delay, max_flush_delay=args.max_flush_delay)
+            serve(updater, host=args.host, port=args.port, unix_socket_path=args.unix_socket, verbose=args.verbose)
+        elif args.command == "send":
+            with open(args.edits_file, 'r', encoding='utf-8') as f: edit_requests = json.load(f)
+            query = "&".join(name for name, enabled in (("commit=1", args.commit), ("dry_run=1", args.dry_run)) if enabled)
+            response = send_request("POST", "/edits" + (f"?{query}" if query else ""), edit_requests, **connection_options)
+            for result in response["results"]:
+                print(f"[{result['status']}] {result['target_file_key']}" + (f"\n  {result['log']}" if result["log"] else ""))
+            if "flushed" in response: print(f"Flushed: {', '.join(response['flushed']) or 'nothing'}")
+            print(f"{response['pending']} edit(s) waiting to be flushed.")
+        elif args.command == "commit": print(json.dumps(send_request("POST", "/commit", **connection_options), indent=2))
+        elif args.command == "status": print(json.dumps(send_request("GET", "/status", **connection_options), indent=2))
+        else: print(json.dumps(send_request("POST", "/shutdown", **connection_options), indent=2))
+    except (UpdaterDaemonError, OSError, json.JSONDecodeError) as e:
+        print(f"Error: {e}"); exit(1)